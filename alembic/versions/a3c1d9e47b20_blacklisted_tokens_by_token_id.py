@@ -0,0 +1,37 @@
+"""blacklisted tokens keyed by token id
+
+Revision ID: a3c1d9e47b20
+Revises: f7540f600804
+Create Date: 2026-10-17 09:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a3c1d9e47b20'
+down_revision = 'f7540f600804'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Les tokens existants n'ont pas de jti : on conserve leur empreinte SHA-256,
+    # identique à celle calculée par token_revocation_key()
+    op.add_column('blacklisted_tokens', sa.Column('token_id', sa.String(length=64), nullable=True))
+    op.execute("UPDATE blacklisted_tokens SET token_id = encode(sha256(token::bytea), 'hex')")
+    op.alter_column('blacklisted_tokens', 'token_id', nullable=False)
+    op.create_index(op.f('ix_blacklisted_tokens_token_id'), 'blacklisted_tokens', ['token_id'], unique=True)
+    op.create_index(op.f('ix_blacklisted_tokens_blacklisted_on'), 'blacklisted_tokens', ['blacklisted_on'], unique=False)
+    op.drop_index(op.f('ix_blacklisted_tokens_token'), table_name='blacklisted_tokens')
+    op.drop_column('blacklisted_tokens', 'token')
+
+
+def downgrade():
+    # Les tokens complets ne peuvent pas être restaurés : la blacklist est vidée
+    op.execute("DELETE FROM blacklisted_tokens")
+    op.add_column('blacklisted_tokens', sa.Column('token', sa.String(), nullable=False))
+    op.create_index(op.f('ix_blacklisted_tokens_token'), 'blacklisted_tokens', ['token'], unique=True)
+    op.drop_index(op.f('ix_blacklisted_tokens_blacklisted_on'), table_name='blacklisted_tokens')
+    op.drop_index(op.f('ix_blacklisted_tokens_token_id'), table_name='blacklisted_tokens')
+    op.drop_column('blacklisted_tokens', 'token_id')
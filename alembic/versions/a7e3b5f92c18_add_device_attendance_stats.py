@@ -0,0 +1,55 @@
+"""add device attendance stats
+
+Revision ID: a7e3b5f92c18
+Revises: f1c8d4e2b906
+Create Date: 2026-10-17 13:14:52.380647
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7e3b5f92c18'
+down_revision = 'f1c8d4e2b906'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('devices', sa.Column('last_attendance_at', sa.DateTime(timezone=True), nullable=True, comment='Horodatage du dernier pointage enregistré'))
+    op.add_column('devices', sa.Column('attendance_count_day', sa.Date(), nullable=True, comment='Jour (fuseau du site) auquel se rapporte attendance_count'))
+    op.add_column('devices', sa.Column('attendance_count', sa.Integer(), server_default='0', nullable=False, comment='Nombre de pointages du jour attendance_count_day'))
+
+    # Valeurs initiales : dernier pointage et pointages du jour local de chaque terminal
+    # (fuseau du site, sinon de l'organisation, sinon UTC)
+    op.execute("""
+        UPDATE devices SET last_attendance_at = (
+            SELECT max(attendances.timestamp) FROM attendances WHERE attendances.device_id = devices.id
+        )
+    """)
+    op.execute("""
+        WITH device_days AS (
+            SELECT devices.id,
+                   (now() AT TIME ZONE COALESCE(sites.timezone, organizations.timezone, 'UTC'))::date AS day,
+                   COALESCE(sites.timezone, organizations.timezone, 'UTC') AS tz
+            FROM devices
+            JOIN organizations ON organizations.id = devices.organization_id
+            LEFT JOIN sites ON sites.id = devices.site_id
+        )
+        UPDATE devices SET
+            attendance_count_day = device_days.day,
+            attendance_count = (
+                SELECT count(*) FROM attendances
+                WHERE attendances.device_id = devices.id
+                  AND attendances.timestamp >= (device_days.day::timestamp AT TIME ZONE device_days.tz)
+                  AND attendances.timestamp < ((device_days.day + 1)::timestamp AT TIME ZONE device_days.tz)
+            )
+        FROM device_days
+        WHERE devices.id = device_days.id
+    """)
+
+
+def downgrade():
+    op.drop_column('devices', 'attendance_count')
+    op.drop_column('devices', 'attendance_count_day')
+    op.drop_column('devices', 'last_attendance_at')
@@ -0,0 +1,62 @@
+"""add daily presence counts
+
+Revision ID: b6d1e8f3a425
+Revises: a7e3b5f92c18
+Create Date: 2026-10-17 14:02:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b6d1e8f3a425'
+down_revision = 'a7e3b5f92c18'
+branch_labels = None
+depends_on = None
+
+# Jours locaux recalculés à partir des pointages existants
+BACKFILL_DAYS = 31
+
+
+def upgrade():
+    op.create_table(
+        'daily_presence_counts',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('organization_id', sa.String(), nullable=False),
+        sa.Column('site_id', sa.String(), server_default='', nullable=False, comment="Site des employés comptés ('' = sans site)"),
+        sa.Column('day', sa.Date(), nullable=False, comment="Jour dans le fuseau horaire de l'organisation"),
+        sa.Column('present_count', sa.Integer(), server_default='0', nullable=False, comment="Nombre d'employés distincts ayant pointé ce jour"),
+        sa.Column('attendance_count', sa.Integer(), server_default='0', nullable=False, comment='Nombre de pointages ce jour'),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('organization_id', 'day', 'site_id', name='uq_daily_presence_counts_org_day_site'),
+    )
+    op.create_index('ix_daily_presence_counts_day', 'daily_presence_counts', ['day'], unique=False)
+
+    # Valeurs initiales des derniers jours (fuseau de l'organisation, UTC s'il
+    # est absent ou inconnu, comme get_zone). Identifiants sans extension
+    # (gen_random_uuid exige PostgreSQL 13+ ou pgcrypto)
+    op.execute(f"""
+        INSERT INTO daily_presence_counts (id, organization_id, site_id, day, present_count, attendance_count)
+        SELECT md5(random()::text || clock_timestamp()::text)::uuid::text,
+               presences.organization_id, presences.site_id, presences.day,
+               presences.present_count, presences.attendance_count
+        FROM (
+            SELECT employees.organization_id,
+                   COALESCE(employees.site_id, '') AS site_id,
+                   (attendances.timestamp AT TIME ZONE COALESCE(zones.name, 'UTC'))::date AS day,
+                   count(DISTINCT attendances.employee_id) AS present_count,
+                   count(*) AS attendance_count
+            FROM attendances
+            JOIN employees ON employees.id = attendances.employee_id
+            JOIN organizations ON organizations.id = employees.organization_id
+            LEFT JOIN pg_timezone_names AS zones ON zones.name = organizations.timezone
+            WHERE attendances.timestamp >= now() - interval '{BACKFILL_DAYS} days'
+            GROUP BY 1, 2, 3
+        ) AS presences
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_daily_presence_counts_day', table_name='daily_presence_counts')
+    op.drop_table('daily_presence_counts')
@@ -0,0 +1,24 @@
+"""index blacklisted tokens expires_at
+
+Revision ID: b8e2f4a61c37
+Revises: a3c1d9e47b20
+Create Date: 2026-10-17 10:04:52.617390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2f4a61c37'
+down_revision = 'a3c1d9e47b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Purge par lots : WHERE expires_at < now ORDER BY expires_at LIMIT n
+    op.create_index(op.f('ix_blacklisted_tokens_expires_at'), 'blacklisted_tokens', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_blacklisted_tokens_expires_at'), table_name='blacklisted_tokens')
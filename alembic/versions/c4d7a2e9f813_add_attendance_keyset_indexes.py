@@ -0,0 +1,26 @@
+"""add attendance keyset indexes
+
+Revision ID: c4d7a2e9f813
+Revises: b8e2f4a61c37
+Create Date: 2026-10-17 10:41:08.335102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7a2e9f813'
+down_revision = 'b8e2f4a61c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pagination par curseur : WHERE (timestamp, id) < (:ts, :id) ORDER BY timestamp DESC, id DESC
+    op.create_index('ix_attendances_timestamp_id', 'attendances', ['timestamp', 'id'], unique=False)
+    op.create_index('ix_attendances_employee_id_timestamp_id', 'attendances', ['employee_id', 'timestamp', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_attendances_employee_id_timestamp_id', table_name='attendances')
+    op.drop_index('ix_attendances_timestamp_id', table_name='attendances')
@@ -0,0 +1,26 @@
+"""add attendance device timestamp index
+
+Revision ID: d2a6f3b8c514
+Revises: c4d7a2e9f813
+Create Date: 2026-10-17 11:26:44.918210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd2a6f3b8c514'
+down_revision = 'c4d7a2e9f813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # WHERE device_id = :id AND timestamp >= :debut AND timestamp < :fin
+    # (employee_id, timestamp) et timestamp sont déjà couverts par
+    # ix_attendances_employee_id_timestamp_id et ix_attendances_timestamp_id
+    op.create_index('ix_attendances_device_id_timestamp', 'attendances', ['device_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_attendances_device_id_timestamp', table_name='attendances')
@@ -0,0 +1,113 @@
+"""partition attendances by month
+
+Revision ID: e5b9c1d7a342
+Revises: d2a6f3b8c514
+Create Date: 2026-10-17 11:58:02.471936
+
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e5b9c1d7a342'
+down_revision = 'd2a6f3b8c514'
+branch_labels = None
+depends_on = None
+
+# Mois créés à l'avance ; le service attendance_partitions prend ensuite le relais
+MONTHS_AHEAD = 3
+# Les pointages plus anciens (horloge de terminal déréglée) vont dans la partition par défaut
+MAX_BACKFILL_MONTHS = 120
+
+INDEXES = [
+    ('ix_attendances_timestamp_id', ['timestamp', 'id']),
+    ('ix_attendances_employee_id_timestamp_id', ['employee_id', 'timestamp', 'id']),
+    ('ix_attendances_device_id_timestamp', ['device_id', 'timestamp']),
+]
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rename_legacy_table():
+    op.rename_table('attendances', 'attendances_legacy')
+    op.execute('ALTER TABLE attendances_legacy RENAME CONSTRAINT attendances_pkey TO attendances_legacy_pkey')
+    for name, _ in INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_legacy')
+
+
+def _create_indexes():
+    for name, columns in INDEXES:
+        op.create_index(name, 'attendances', columns, unique=False)
+
+
+def upgrade():
+    # Une table existante ne peut pas être partitionnée sur place : les lignes
+    # sont copiées dans une nouvelle table partitionnée par mois.
+    # La clé de partitionnement doit faire partie de la clé primaire.
+    _rename_legacy_table()
+    op.execute("""
+        CREATE TABLE attendances (
+            id VARCHAR NOT NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            type attendancetype NOT NULL,
+            geo VARCHAR,
+            extra_data JSON,
+            employee_id VARCHAR NOT NULL REFERENCES employees (id),
+            device_id VARCHAR REFERENCES devices (id),
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    _create_indexes()
+
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text('SELECT min(timestamp) FROM attendances_legacy')).scalar()
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = oldest.astimezone(timezone.utc).date().replace(day=1) if oldest else current
+    month = max(month, _add_months(current, -MAX_BACKFILL_MONTHS))
+    while month <= _add_months(current, MONTHS_AHEAD):
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE attendances_y{month.year:04d}m{month.month:02d} PARTITION OF attendances "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{next_month.isoformat()} 00:00:00+00')"
+        )
+        month = next_month
+    op.execute('CREATE TABLE attendances_default PARTITION OF attendances DEFAULT')
+
+    op.execute("""
+        INSERT INTO attendances (id, timestamp, type, geo, extra_data, employee_id, device_id)
+        SELECT id, timestamp, type, geo, extra_data, employee_id, device_id FROM attendances_legacy
+    """)
+    op.drop_table('attendances_legacy')
+    op.execute('ANALYZE attendances')
+
+
+def downgrade():
+    # Les partitions détachées par la rétention ne sont pas réintégrées
+    op.rename_table('attendances', 'attendances_partitioned')
+    for name, _ in INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_partitioned')
+    op.create_table('attendances',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('type', postgresql.ENUM('IN', 'OUT', name='attendancetype', create_type=False), nullable=False),
+        sa.Column('geo', sa.String(), nullable=True),
+        sa.Column('extra_data', sa.JSON(), nullable=True),
+        sa.Column('employee_id', sa.String(), nullable=False),
+        sa.Column('device_id', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['device_id'], ['devices.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("""
+        INSERT INTO attendances (id, timestamp, type, geo, extra_data, employee_id, device_id)
+        SELECT id, timestamp, type, geo, extra_data, employee_id, device_id FROM attendances_partitioned
+    """)
+    # Supprime la table partitionnée et toutes ses partitions
+    op.execute('DROP TABLE attendances_partitioned')
+    _create_indexes()
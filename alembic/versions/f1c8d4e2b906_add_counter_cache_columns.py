@@ -0,0 +1,42 @@
+"""add counter cache columns
+
+Revision ID: f1c8d4e2b906
+Revises: e5b9c1d7a342
+Create Date: 2026-10-17 12:37:15.604128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f1c8d4e2b906'
+down_revision = 'e5b9c1d7a342'
+branch_labels = None
+depends_on = None
+
+# (table parente, compteur, table enfant, clé étrangère)
+COUNTERS = [
+    ('organizations', 'sites_count', 'sites', 'organization_id'),
+    ('organizations', 'employees_count', 'employees', 'organization_id'),
+    ('organizations', 'users_count', 'users', 'organization_id'),
+    ('organizations', 'devices_count', 'devices', 'organization_id'),
+    ('sites', 'departments_count', 'departments', 'site_id'),
+    ('sites', 'employees_count', 'employees', 'site_id'),
+    ('sites', 'devices_count', 'devices', 'site_id'),
+    ('departments', 'employees_count', 'employees', 'department_id'),
+]
+
+
+def upgrade():
+    for parent, column, child, foreign_key in COUNTERS:
+        op.add_column(parent, sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+        # Valeurs initiales ; ensuite maintenues par les événements ORM (app/models/counters.py)
+        op.execute(
+            f'UPDATE {parent} SET {column} = '
+            f'(SELECT count(*) FROM {child} WHERE {child}.{foreign_key} = {parent}.id)'
+        )
+
+
+def downgrade():
+    for parent, column, _, _ in reversed(COUNTERS):
+        op.drop_column(parent, column)
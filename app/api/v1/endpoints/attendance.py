@@ -1,12 +1,15 @@
-import json
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app import crud, models, schemas
 from app.dependencies import get_db, PermissionChecker, get_current_active_user
 from app.models.attendance import AttendanceType
-from app.websocket.connection_manager import manager
+from app.websocket.connection_manager import subscription_keys
+from app.websocket.event_bridge import realtime_bridge
+from app.services.device_stats import device_stats
+from app.services.dashboard_snapshots import dashboard_snapshots
+from app.services.daily_presence import daily_presence_tracker
 
 router = APIRouter()
 
@@ -14,7 +17,12 @@ router = APIRouter()
     "/",
     response_model=schemas.PaginatedResponse[schemas.Attendance],
     summary="Lister les pointages",
-    description="Récupère une liste de pointages avec les détails de l'employé, du département, du site et du dispositif. Requiert la permission `attendance:read`.",
+    description="Récupère une liste de pointages avec les détails de l'employé, du département, du site et du dispositif. "
+                "Avec `pagination=cursor`, les pages sont lues par curseur (`next_cursor` dans la réponse), toujours triées par "
+                "horodatage : `sort_by` est ignoré et `sort_order` vaut `desc` (plus récents d'abord) par défaut. Un curseur "
+                "n'est valable que pour le sens de tri qui l'a émis (400 sinon), "
+                "et le total n'est calculé que si `include_total=true`. Le total peut être une estimation "
+                "sur les gros volumes (`total_kind`). Requiert la permission `attendance:read`.",
     dependencies=[Depends(PermissionChecker(["attendance:read"]))],
 )
 def read_attendances(
@@ -24,11 +32,33 @@ def read_attendances(
     limit: int = Query(100, description="Nombre maximum de pointages à retourner"),
     search: str = Query(None, description="Recherche textuelle (type de pointage)"),
     sort_by: str = Query(None, description="Champ de tri (timestamp, type, created_at, updated_at)"),
-    sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    sort_order: str = Query(None, description="Direction du tri (asc ou desc ; par défaut asc, desc en pagination cursor)"),
+    pagination: str = Query("offset", description="Mode de pagination (offset ou cursor)"),
+    cursor: str = Query(None, description="Curseur retourné par la page précédente (pagination=cursor)"),
+    include_total: Optional[bool] = Query(None, description="Calculer le total (par défaut : oui en pagination offset, non par curseur)"),
 ) -> Any:
     """
     Retrieve attendances with enriched data.
     """
+    if pagination == "cursor" or cursor:
+        attendance_data = crud.attendance.get_multi_keyset(
+            db,
+            limit=limit,
+            cursor=cursor,
+            employee_id=employee_id,
+            search=search,
+            sort_order=sort_order or "desc",
+            include_total=bool(include_total),
+        )
+        return {
+            "items": attendance_data["items"],
+            "total": attendance_data["total"],
+            "total_kind": attendance_data["total_kind"],
+            "skip": 0,
+            "limit": limit,
+            "next_cursor": attendance_data["next_cursor"],
+        }
+
     attendance_data = crud.attendance.get_multi_paginated(
         db,
         skip=skip,
@@ -36,7 +66,8 @@ def read_attendances(
         employee_id=employee_id,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order or "asc",
+        include_total=include_total is not False,
     )
 
     # Note: The duration calculation logic will be added later.
@@ -45,6 +76,7 @@ def read_attendances(
     return {
         "items": attendance_data["items"],
         "total": attendance_data["total"],
+        "total_kind": attendance_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
@@ -67,6 +99,9 @@ async def create_attendance(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employé non trouvé")
 
     attendance = crud.attendance.create(db=db, obj_in=attendance_in)
+    device_stats.record(attendance.device_id, attendance.timestamp)
+    daily_presence_tracker.record(employee.organization_id, employee.site_id, employee.id, attendance.timestamp)
+    dashboard_snapshots.invalidate(employee.organization_id)
 
     # Re-fetch the attendance with relationships for the response and broadcast
     db.refresh(attendance)
@@ -82,7 +117,10 @@ async def create_attendance(
           "type": "new_attendance",
           "payload": attendance_data
       }
-      await manager.broadcast(json.dumps(message_to_broadcast, default=str))
+      realtime_bridge.publish(
+          message_to_broadcast,
+          subscription_keys(employee.organization_id, employee.site_id, employee.department_id),
+      )
 
     return enriched_attendance
 
@@ -101,13 +139,14 @@ async def manual_clock(
     """
     Handles a manual clock-in or clock-out for the authenticated user.
     """
-    if not current_user.employee:
+    employee = current_user.employee
+    if not employee:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="L'utilisateur n'est pas associé à un profil employé.",
         )
 
-    employee_id = current_user.employee.id
+    employee_id = employee.id
     last_attendance = crud.attendance.get_last_for_employee(db, employee_id=employee_id)
 
     new_attendance_type = AttendanceType.IN
@@ -122,6 +161,9 @@ async def manual_clock(
     )
 
     attendance = crud.attendance.create(db=db, obj_in=attendance_in)
+    device_stats.record(attendance.device_id, attendance.timestamp)
+    daily_presence_tracker.record(employee.organization_id, employee.site_id, employee_id, attendance.timestamp)
+    dashboard_snapshots.invalidate(employee.organization_id)
     db.refresh(attendance)
 
     enriched_attendance = crud.attendance.get(db, id=attendance.id)
@@ -131,6 +173,9 @@ async def manual_clock(
             "type": "new_attendance",
             "payload": attendance_data
         }
-        await manager.broadcast(json.dumps(message_to_broadcast, default=str))
+        realtime_bridge.publish(
+            message_to_broadcast,
+            subscription_keys(employee.organization_id, employee.site_id, employee.department_id),
+        )
 
     return enriched_attendance
\ No newline at end of file
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.core import security
-from app.dependencies import get_current_active_user, get_db
+from app.dependencies import get_current_active_user, get_current_active_superuser, get_db
+from app.services.password_hasher import password_hasher
+from app.services.token_cleanup import token_cleanup_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -16,9 +19,10 @@ router = APIRouter()
     description="Authentifie un utilisateur et retourne les tokens JWT ainsi que les informations de l'utilisateur, y compris les rôles et permissions.",
     responses={
         401: {"description": "Email ou mot de passe incorrect"},
+        503: {"description": "Service d'authentification saturé (réessayer après Retry-After)"},
     },
 )
-def login_for_access_token(
+async def login_for_access_token(
     db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """
@@ -26,7 +30,7 @@ def login_for_access_token(
     - **username**: L'email de l'utilisateur.
     - **password**: Le mot de passe de l'utilisateur.
     """
-    user = security.authenticate_user(db, email=form_data.username, password=form_data.password)
+    user = await security.authenticate_user_async(db, email=form_data.username, password=form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,13 +42,15 @@ def login_for_access_token(
     access_token = security.create_access_token(data={"sub": user.id})
     refresh_token = security.create_refresh_token(data={"sub": user.id})
 
-    # Préparation de la réponse
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer",
-        "user": user,
-    }
+    # Préparation de la réponse : sérialisée hors de la boucle d'événements,
+    # la réponse ne contient jamais l'objet ORM
+    user_in_login = await run_in_threadpool(schemas.UserInLogin.model_validate, user)
+    return schemas.Token(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+        user=user_in_login,
+    )
 
 @router.post(
     "/refresh",
@@ -146,7 +152,7 @@ def logout(
         401: {"description": "Mot de passe actuel incorrect"},
     },
 )
-def change_password(
+async def change_password(
     *,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
@@ -162,21 +168,45 @@ def change_password(
     car elle vérifie l'ancien mot de passe avant d'autoriser le changement.
     """
     # Vérifier que le mot de passe actuel est correct
-    if not security.verify_password(password_data.current_password, current_user.hashed_password):
+    if not await security.verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Mot de passe actuel incorrect"
         )
 
     # Vérifier que le nouveau mot de passe est différent de l'ancien
-    if security.verify_password(password_data.new_password, current_user.hashed_password):
+    if await security.verify_password_async(password_data.new_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Le nouveau mot de passe doit être différent de l'ancien"
         )
 
     # Mettre à jour le mot de passe
-    hashed_password = security.get_password_hash(password_data.new_password)
-    crud.user.update(db=db, db_obj=current_user, obj_in={"hashed_password": hashed_password})
+    hashed_password = await security.get_password_hash_async(password_data.new_password)
+    await run_in_threadpool(
+        crud.user.update, db=db, db_obj=current_user, obj_in={"hashed_password": hashed_password}
+    )
+
+    return {"message": "Mot de passe modifié avec succès"}
+
 
-    return {"message": "Mot de passe modifié avec succès"}
\ No newline at end of file
+@router.get(
+    "/password-hashing/stats",
+    summary="Statistiques du hachage des mots de passe",
+    description="Calculs bcrypt en cours, refusés (503), recalculés et temps moyens. **Requiert un superutilisateur.**",
+)
+def get_password_hashing_stats(
+    current_user: models.User = Depends(get_current_active_superuser),
+) -> dict:
+    return password_hasher.get_stats()
+
+
+@router.get(
+    "/token-cleanup/status",
+    summary="Progression de la purge des tokens expirés",
+    description="Lots supprimés, tokens purgés et état de la purge en cours. **Requiert un superutilisateur.**",
+)
+def get_token_cleanup_status(
+    current_user: models.User = Depends(get_current_active_superuser),
+) -> dict:
+    return token_cleanup_service.get_status()
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app import crud, schemas
-from app.dependencies import get_db
+from app import crud, models, schemas
+from app.dependencies import get_current_active_superuser, get_read_db
+from app.services.dashboard_snapshots import dashboard_snapshots
 
 router = APIRouter()
 
 @router.get("/admin", response_model=schemas.dashboard.AdminDashboard)
-def get_admin_dashboard_data(db: Session = Depends(get_db)):
+def get_admin_dashboard_data(db: Session = Depends(get_read_db)):
     """
     Retrieve System Administrator dashboard data.
     """
@@ -30,35 +31,16 @@ def get_admin_dashboard_data(db: Session = Depends(get_db)):
 
 
 @router.get("/manager/{organization_id}", response_model=schemas.dashboard.ManagerDashboard)
-def get_manager_dashboard_data(organization_id: str, db: Session = Depends(get_db)):
+def get_manager_dashboard_data(organization_id: str, db: Session = Depends(get_read_db)):
     """
     Retrieve Manager/HR dashboard data for a specific organization.
+    Served from the organization's snapshot (see dashboard_snapshots).
     """
-    present_today, total_employees = crud.dashboard.get_daily_presence_and_total_employees(db=db, organization_id=organization_id)
-    absent_today = total_employees - present_today
-    tardy_today = crud.dashboard.get_daily_tardiness_count(db=db, organization_id=organization_id)
-    attendance_rate = crud.dashboard.get_attendance_rate(db=db, organization_id=organization_id)
-    total_work_hours = crud.dashboard.get_total_work_hours(db=db, organization_id=organization_id)
-    pending_leaves = crud.dashboard.get_pending_leaves_count(db=db, organization_id=organization_id)
-    presence_evolution = crud.dashboard.get_presence_evolution_last_30_days(db=db, organization_id=organization_id)
-    presence_absence_tardiness_distribution = crud.dashboard.get_presence_absence_tardiness_distribution(db=db, organization_id=organization_id)
-    real_time_attendances = crud.dashboard.get_real_time_attendances(db=db, organization_id=organization_id)
-
-    return {
-        "present_today": present_today,
-        "absent_today": absent_today,
-        "tardy_today": tardy_today,
-        "attendance_rate": attendance_rate,
-        "total_work_hours": total_work_hours,
-        "pending_leaves": pending_leaves,
-        "presence_evolution": presence_evolution,
-        "presence_absence_tardiness_distribution": presence_absence_tardiness_distribution,
-        "real_time_attendances": real_time_attendances,
-    }
+    return dashboard_snapshots.get("manager", organization_id, db)
 
 
 @router.get("/employee/{employee_id}", response_model=schemas.dashboard.EmployeeDashboard)
-def get_employee_dashboard_data(employee_id: str, db: Session = Depends(get_db)):
+def get_employee_dashboard_data(employee_id: str, db: Session = Depends(get_read_db)):
     """
     Retrieve Employee dashboard data for a specific employee.
     """
@@ -74,26 +56,29 @@ def get_employee_dashboard_data(employee_id: str, db: Session = Depends(get_db))
 
 
 @router.get("/integrator/{organization_id}", response_model=schemas.dashboard.IntegratorDashboard)
-def get_integrator_dashboard_data(organization_id: str, db: Session = Depends(get_db)):
+def get_integrator_dashboard_data(organization_id: str, db: Session = Depends(get_read_db)):
     """
     Retrieve Integrator/IoT Technician dashboard data for a specific organization.
+    Served from the organization's snapshot (see dashboard_snapshots).
     """
-    device_status_ratio = crud.dashboard.get_device_status_ratio(db=db)
-    attendance_per_device = crud.dashboard.get_attendance_per_device(db=db, organization_id=organization_id)
-
-    return {
-        "device_status_ratio": device_status_ratio,
-        "attendance_per_device": attendance_per_device,
-    }
+    return dashboard_snapshots.get("integrator", organization_id, db)
 
 
 @router.get("/analytics/{organization_id}", response_model=schemas.dashboard.AdvancedAnalytics)
-def get_advanced_analytics_data(organization_id: str, db: Session = Depends(get_db)):
+def get_advanced_analytics_data(organization_id: str, db: Session = Depends(get_read_db)):
     """
     Retrieve Advanced Analytics data for a specific organization.
+    Served from the organization's snapshot (see dashboard_snapshots).
     """
-    tardiness_by_day_of_week = crud.dashboard.get_tardiness_by_day_of_week(db=db, organization_id=organization_id)
+    return dashboard_snapshots.get("analytics", organization_id, db)
 
-    return {
-        "tardiness_by_day_of_week": tardiness_by_day_of_week,
-    }
\ No newline at end of file
+
+@router.get(
+    "/snapshots/stats",
+    summary="Statistiques des instantanés de tableaux de bord",
+    description="Instantanés en cache, hits/misses, invalidations et temps de recalcul. **Requiert un superutilisateur.**",
+)
+def get_dashboard_snapshot_stats(
+    current_user: models.User = Depends(get_current_active_superuser),
+) -> dict:
+    return dashboard_snapshots.get_stats()
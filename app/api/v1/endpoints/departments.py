@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
@@ -6,13 +6,18 @@ from app.dependencies import get_db, PermissionChecker
 
 router = APIRouter()
 
+def enrich_departments_response(db: Session, depts: List[models.Department]) -> List[schemas.Department]:
+    """
+    Convert a page of departments with site and manager details. The employee
+    count is read from the counter-cache column of each row: no extra query.
+    """
+    return [schemas.Department.from_orm(dept) for dept in depts]
+
 def enrich_department_response(db: Session, dept: models.Department) -> schemas.Department:
     """
     Enrich the department object with site, manager details, and employee count.
     """
-    dept_schema = schemas.Department.from_orm(dept)
-    dept_schema.employees_count = crud.employee.count_by_department(db, department_id=dept.id)
-    return dept_schema
+    return enrich_departments_response(db, [dept])[0]
 
 @router.post(
     "/",
@@ -41,6 +46,7 @@ def read_departments(
     search: str = Query(None, description="Recherche textuelle (nom, description)"),
     sort_by: str = Query(None, description="Champ de tri (name, description, created_at, updated_at)"),
     sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
 ) -> Any:
     department_data = crud.department.get_multi_paginated(
         db,
@@ -48,12 +54,14 @@ def read_departments(
         limit=limit,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        include_total=include_total,
     )
-    enriched_items = [enrich_department_response(db, dept) for dept in department_data["items"]]
+    enriched_items = enrich_departments_response(db, department_data["items"])
     return {
         "items": enriched_items,
         "total": department_data["total"],
+        "total_kind": department_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
@@ -4,6 +4,11 @@ from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.dependencies import get_db, get_current_active_user, require_role, PermissionChecker
 from app.services.mqtt_client import mqtt_client
+from app.services.badge_directory import badge_directory
+from app.services.device_telemetry import device_telemetry
+from app.services.device_stats import device_stats
+from app.services.dashboard_snapshots import dashboard_snapshots
+from app.websocket.event_bridge import realtime_bridge
 from app.schemas.device_command import (
     DeviceCommandRequest,
     DeviceCommandResponse,
@@ -15,20 +20,26 @@ from app.schemas.device_command import (
 
 router = APIRouter()
 
+def enrich_devices_response(db: Session, devices: List[models.Device]) -> List[schemas.Device]:
+    """
+    Enrich a page of devices with organization, site, and attendance stats
+    (one lookup in the live stats store, no query per device).
+    """
+    stats = device_stats.lookup(devices)
+    enriched = []
+    for device in devices:
+        device_schema = schemas.Device.from_orm(device)
+        last_attendance_at, daily_count = stats[device.id]
+        device_schema.last_attendance_timestamp = last_attendance_at
+        device_schema.daily_attendance_count = daily_count
+        enriched.append(device_schema)
+    return enriched
+
 def enrich_device_response(db: Session, device: models.Device) -> schemas.Device:
     """
     Enrich the device object with organization, site, and attendance stats.
     """
-    device_schema = schemas.Device.from_orm(device)
-
-    # Get attendance stats
-    last_attendance = crud.attendance.get_last_for_device(db, device_id=device.id)
-    if last_attendance:
-        device_schema.last_attendance_timestamp = last_attendance.timestamp
-
-    device_schema.daily_attendance_count = crud.attendance.count_today_for_device(db, device_id=device.id)
-
-    return device_schema
+    return enrich_devices_response(db, [device])[0]
 
 @router.get(
     "/",
@@ -43,6 +54,7 @@ def read_devices(
     search: str = Query(None, description="Recherche textuelle (numéro de série, nom, type, localisation)"),
     sort_by: str = Query(None, description="Champ de tri (serial_number, name, device_type, location, created_at, updated_at)"),
     sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
     current_user: models.User = Depends(get_current_active_user),
 ) -> Any:
     device_data = crud.device.get_multi_paginated(
@@ -52,14 +64,16 @@ def read_devices(
         limit=limit,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        include_total=include_total,
     )
 
-    enriched_items = [enrich_device_response(db, device) for device in device_data["items"]]
+    enriched_items = enrich_devices_response(db, device_data["items"])
 
     return {
         "items": enriched_items,
         "total": device_data["total"],
+        "total_kind": device_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
@@ -83,6 +97,8 @@ def create_device(
             detail="Impossible de créer un terminal pour une autre organisation.",
         )
     device = crud.device.create(db=db, obj_in=device_in)
+    # La répartition des statuts des terminaux porte sur tous les terminaux
+    dashboard_snapshots.invalidate_kind("integrator")
     db.refresh(device, ["organization", "site"])
     return enrich_device_response(db, device)
 
@@ -128,6 +144,7 @@ def update_device(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permissions insuffisantes")
 
     device = crud.device.update(db=db, db_obj=device, obj_in=device_in)
+    dashboard_snapshots.invalidate_kind("integrator")
     db.refresh(device, ["organization", "site"])
     return enrich_device_response(db, device)
 
@@ -152,6 +169,7 @@ def delete_device(
 
     enriched_device = enrich_device_response(db, device)
     crud.device.remove(db=db, id=device_id)
+    dashboard_snapshots.invalidate_kind("integrator")
     return enriched_device
 
 
@@ -415,4 +433,8 @@ def get_mqtt_status(
         "connected": mqtt_client.is_connected(),
         "broker_host": mqtt_client.client._host if hasattr(mqtt_client.client, '_host') else None,
         "broker_port": mqtt_client.client._port if hasattr(mqtt_client.client, '_port') else None,
+        "ingest": mqtt_client.ingest_queue.get_stats(),
+        "badge_directory": badge_directory.get_stats(),
+        "telemetry": device_telemetry.get_status(),
+        "realtime_bridge": realtime_bridge.get_stats(),
     }
\ No newline at end of file
@@ -21,6 +21,7 @@ def read_employees(
     search: str = Query(None, description="Recherche textuelle (nom, prénom, email, badge, téléphone, poste)"),
     sort_by: str = Query(None, description="Champ de tri (first_name, last_name, email, badge_id, position, created_at, updated_at)"),
     sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
 ) -> Any:
     """
     Retrieve employees with enriched data.
@@ -32,12 +33,14 @@ def read_employees(
         organization_id=organization_id,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        include_total=include_total,
     )
 
     return {
         "items": employee_data["items"],
         "total": employee_data["total"],
+        "total_kind": employee_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Any
 from app import crud, models, schemas
 from app.dependencies import get_db, PermissionChecker, get_current_active_user
+from app.services.dashboard_snapshots import dashboard_snapshots
 
 router = APIRouter()
 
@@ -26,6 +27,7 @@ def create_leave(
         raise HTTPException(status_code=403, detail="Not authorized to create leave for this employee")
 
     leave = crud.leave.create(db=db, obj_in=leave_in)
+    dashboard_snapshots.invalidate(employee.organization_id, kinds=("manager",))
     db.refresh(leave, ["employee.department", "approver"])
     return leave
 
@@ -41,6 +43,7 @@ def read_leaves(
     search: str = Query(None, description="Recherche textuelle (type de congé, statut, raison)"),
     sort_by: str = Query(None, description="Champ de tri (leave_type, status, start_date, end_date, created_at, updated_at)"),
     sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
 ) -> Any:
     leave_data = crud.leave.get_multi_paginated(
         db,
@@ -48,11 +51,13 @@ def read_leaves(
         limit=limit,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        include_total=include_total,
     )
     return {
         "items": leave_data["items"],
         "total": leave_data["total"],
+        "total_kind": leave_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
@@ -96,6 +101,7 @@ def update_leave(
 
     leave = crud.leave.update(db=db, db_obj=leave, obj_in=updated_leave_data)
     db.refresh(leave, ["employee.department", "approver"])
+    dashboard_snapshots.invalidate(leave.employee.organization_id, kinds=("manager",))
     return leave
 
 @router.delete(
@@ -115,5 +121,7 @@ def delete_leave(
     # Build response data while session is still active
     db.refresh(leave, ["employee.department", "approver"])
     response_data = schemas.Leave.model_validate(leave)
+    organization_id = leave.employee.organization_id
     crud.leave.remove(db=db, id=leave_id)
+    dashboard_snapshots.invalidate(organization_id, kinds=("manager",))
     return response_data
\ No newline at end of file
@@ -6,19 +6,18 @@ from app.dependencies import get_db, get_current_active_user, require_role
 
 router = APIRouter()
 
+def enrich_organizations_response(db: Session, orgs: List[models.Organization]) -> List[schemas.Organization]:
+    """
+    Convert a page of organizations. The counts are read from the
+    counter-cache columns of each row: no extra query.
+    """
+    return [schemas.Organization.from_orm(org) for org in orgs]
+
 def enrich_organization_response(db: Session, org: models.Organization) -> schemas.Organization:
     """
     Enrich the organization object with calculated counts.
     """
-    # Convert SQLAlchemy model to Pydantic model
-    org_schema = schemas.Organization.from_orm(org)
-
-    # Calculate counts
-    org_schema.sites_count = crud.site.count_by_organization(db, organization_id=org.id)
-    org_schema.employees_count = crud.employee.count_by_organization(db, organization_id=org.id)
-    org_schema.users_count = crud.user.count_by_organization(db, organization_id=org.id)
-
-    return org_schema
+    return enrich_organizations_response(db, [org])[0]
 
 @router.get(
     "/",
@@ -33,6 +32,7 @@ def read_organizations(
     search: str = Query(None, description="Recherche textuelle (nom, adresse, email, téléphone)"),
     sort_by: str = Query(None, description="Champ de tri (name, address, contact_email, contact_phone, created_at, updated_at)"),
     sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
     current_user: models.User = Depends(require_role("admin")),
 ) -> Any:
     organization_data = crud.organization.get_multi_paginated(
@@ -41,14 +41,16 @@ def read_organizations(
         limit=limit,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        include_total=include_total,
     )
 
-    enriched_items = [enrich_organization_response(db, org) for org in organization_data["items"]]
+    enriched_items = enrich_organizations_response(db, organization_data["items"])
 
     return {
         "items": enriched_items,
         "total": organization_data["total"],
+        "total_kind": organization_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
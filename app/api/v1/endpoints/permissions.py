@@ -34,14 +34,16 @@ def read_permissions(
     db: Session = Depends(get_db),
     skip: int = Query(0, description="Nombre de permissions à sauter"),
     limit: int = Query(100, description="Nombre maximum de permissions à retourner"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
 ) -> Any:
     """
     Retrieve permissions. Requires permission: `permission:read`.
     """
-    permission_data = crud.permission.get_multi(db, skip=skip, limit=limit)
+    permission_data = crud.permission.get_multi(db, skip=skip, limit=limit, include_total=include_total)
     return {
         "items": permission_data["items"],
         "total": permission_data["total"],
+        "total_kind": permission_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app import models, schemas, crud
 from app.dependencies import (
-    get_db,
+    get_read_db,
     get_current_active_user,
     get_current_active_employee,
     get_current_active_manager,
@@ -29,11 +29,11 @@ def _get_r17_data(db: Session, report_in: schemas.EmployeePresenceReportRequest,
     return {"employee_name": current_employee.user.full_name, "employee_badge_id": current_employee.badge_id, "department_name": current_employee.department.name if current_employee.department else None, "start_date": report_in.start_date, "end_date": report_in.end_date, "data": report_data, "summary": summary}
 
 @router.post("/employee/presence/preview", response_model=schemas.EmployeePresenceReportResponse, summary="R17 - Preview My Presence Report", tags=["Reports - Employee"])
-def preview_employee_presence_report(*, db: Session = Depends(get_db), report_in: schemas.EmployeePresenceReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
+def preview_employee_presence_report(*, db: Session = Depends(get_read_db), report_in: schemas.EmployeePresenceReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
     return _get_r17_data(db, report_in, current_employee)
 
 @router.post("/employee/presence/download", summary="R17 - Download My Presence Report", tags=["Reports - Employee"])
-async def download_employee_presence_report(*, db: Session = Depends(get_db), report_in: schemas.EmployeePresenceReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
+async def download_employee_presence_report(*, db: Session = Depends(get_read_db), report_in: schemas.EmployeePresenceReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
     response_data = _get_r17_data(db, report_in, current_employee)
     filename = f"R17_Presence_{current_employee.id}_{report_in.start_date}_to_{report_in.end_date}.{report_in.format.value}"
     context = {"report_title": "Mon Relevé de Présence", "period": f"Du {report_in.start_date.strftime('%d/%m/%Y')} au {report_in.end_date.strftime('%d/%m/%Y')}", **response_data}
@@ -48,11 +48,11 @@ def _get_r18_data(db: Session, report_in: schemas.EmployeeMonthlySummaryRequest,
     return {"employee_name": current_employee.user.full_name, "employee_badge_id": current_employee.badge_id, "department_name": current_employee.department.name if current_employee.department else None, **report_data}
 
 @router.post("/employee/monthly-summary/preview", response_model=schemas.EmployeeMonthlySummaryResponse, summary="R18 - Preview My Monthly Summary", tags=["Reports - Employee"])
-def preview_employee_monthly_summary(*, db: Session = Depends(get_db), report_in: schemas.EmployeeMonthlySummaryRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
+def preview_employee_monthly_summary(*, db: Session = Depends(get_read_db), report_in: schemas.EmployeeMonthlySummaryRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
     return _get_r18_data(db, report_in, current_employee)
 
 @router.post("/employee/monthly-summary/download", summary="R18 - Download My Monthly Summary", tags=["Reports - Employee"])
-async def download_employee_monthly_summary(*, db: Session = Depends(get_db), report_in: schemas.EmployeeMonthlySummaryRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
+async def download_employee_monthly_summary(*, db: Session = Depends(get_read_db), report_in: schemas.EmployeeMonthlySummaryRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
     response_data = _get_r18_data(db, report_in, current_employee)
     filename = f"R18_MonthlySummary_{current_employee.id}_{report_in.year}-{report_in.month}.pdf"
     context = {"report_title": "Mon Récapitulatif Mensuel", "daily_data_json": [d["hours"] for d in response_data["daily_data"]], **response_data}
@@ -72,11 +72,11 @@ def _get_r19_data(db: Session, report_in: schemas.EmployeeLeavesReportRequest, c
     return {"employee_name": current_employee.user.full_name, "year": report_in.year, "data": report_data, "summary": summary}
 
 @router.post("/employee/leaves/preview", response_model=schemas.EmployeeLeavesReportResponse, summary="R19 - Preview My Leaves Report", tags=["Reports - Employee"])
-def preview_employee_leaves_report(*, db: Session = Depends(get_db), report_in: schemas.EmployeeLeavesReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
+def preview_employee_leaves_report(*, db: Session = Depends(get_read_db), report_in: schemas.EmployeeLeavesReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
     return _get_r19_data(db, report_in, current_employee)
 
 @router.post("/employee/leaves/download", summary="R19 - Download My Leaves Report", tags=["Reports - Employee"])
-async def download_employee_leaves_report(*, db: Session = Depends(get_db), report_in: schemas.EmployeeLeavesReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
+async def download_employee_leaves_report(*, db: Session = Depends(get_read_db), report_in: schemas.EmployeeLeavesReportRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
     response_data = _get_r19_data(db, report_in, current_employee)
     report_data_dict = [row.model_dump() for row in response_data["data"]]
     if not report_data_dict: raise HTTPException(status_code=404, detail="No leave data found for the selected criteria.")
@@ -88,7 +88,7 @@ async def download_employee_leaves_report(*, db: Session = Depends(get_db), repo
 
 # R20
 @router.post("/employee/presence-certificate/download", summary="R20 - Download My Presence Certificate", tags=["Reports - Employee"])
-async def download_presence_certificate(*, db: Session = Depends(get_db), report_in: schemas.PresenceCertificateRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
+async def download_presence_certificate(*, db: Session = Depends(get_read_db), report_in: schemas.PresenceCertificateRequest, current_employee: models.Employee = Depends(get_current_active_employee)):
     report_data = crud.report.get_employee_presence_data(db, employee_id=current_employee.id, start_date=report_in.start_date, end_date=report_in.end_date)
     if not report_data: raise HTTPException(status_code=404, detail="No attendance data found for the selected period.")
     present_days = sum(1 for row in report_data if row["status"] == "Present")
@@ -109,11 +109,11 @@ def _get_r12_data(db: Session, report_in: schemas.DepartmentPresenceRequest, cur
     return {"department_name": current_manager.department.name, "period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": report_data, "summary": summary}
 
 @router.post("/manager/department-presence/preview", response_model=schemas.DepartmentPresenceResponse, summary="R12 - Preview Department Presence Report", tags=["Reports - Manager"])
-def preview_department_presence_report(*, db: Session = Depends(get_db), report_in: schemas.DepartmentPresenceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+def preview_department_presence_report(*, db: Session = Depends(get_read_db), report_in: schemas.DepartmentPresenceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     return _get_r12_data(db, report_in, current_manager)
 
 @router.post("/manager/department-presence/download", summary="R12 - Download Department Presence Report", tags=["Reports - Manager"])
-async def download_department_presence_report(*, db: Session = Depends(get_db), report_in: schemas.DepartmentPresenceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+async def download_department_presence_report(*, db: Session = Depends(get_read_db), report_in: schemas.DepartmentPresenceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     response_data = _get_r12_data(db, report_in, current_manager)
     filename = f"R12_DeptPresence_{current_manager.department.name}_{report_in.start_date}_to_{report_in.end_date}.{report_in.format.value}"
     context = {"report_title": f"Rapport de Présence - Département {current_manager.department.name}", "total_employees": len(response_data["data"]), **response_data}
@@ -132,11 +132,11 @@ def _get_r13_data(db: Session, report_in: schemas.TeamWeeklyReportRequest, curre
     return {"department_name": current_manager.department.name, "period": f"Semaine {report_in.week_number}, {report_in.year}", "start_of_week": start_of_week, "end_of_week": end_of_week, "data": report_data, "summary": summary}
 
 @router.post("/manager/team-weekly/preview", response_model=schemas.DepartmentPresenceResponse, summary="R13 - Preview Team Weekly Report", tags=["Reports - Manager"])
-def preview_team_weekly_report(*, db: Session = Depends(get_db), report_in: schemas.TeamWeeklyReportRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+def preview_team_weekly_report(*, db: Session = Depends(get_read_db), report_in: schemas.TeamWeeklyReportRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     return _get_r13_data(db, report_in, current_manager)
 
 @router.post("/manager/team-weekly/download", summary="R13 - Download Team Weekly Report", tags=["Reports - Manager"])
-async def download_team_weekly_report(*, db: Session = Depends(get_db), report_in: schemas.TeamWeeklyReportRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+async def download_team_weekly_report(*, db: Session = Depends(get_read_db), report_in: schemas.TeamWeeklyReportRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     response_data = _get_r13_data(db, report_in, current_manager)
     filename = f"R13_Weekly_{current_manager.department.name}_Y{report_in.year}W{report_in.week_number}.{report_in.format.value}"
     context = {"report_title": f"Rapport Hebdomadaire - Département {current_manager.department.name}", "period": f"Semaine {report_in.week_number} ({response_data['start_of_week'].strftime('%d/%m/%Y')} - {response_data['end_of_week'].strftime('%d/%m/%Y')})", "total_employees": len(response_data["data"]), **response_data}
@@ -166,11 +166,11 @@ def _get_r14_data(db: Session, report_in: schemas.HoursValidationRequest, curren
     }
 
 @router.post("/manager/hours-validation/preview", response_model=schemas.HoursValidationResponse, summary="R14 - Preview Hours Validation Report", tags=["Reports - Manager"])
-def preview_hours_validation_report(*, db: Session = Depends(get_db), report_in: schemas.HoursValidationRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+def preview_hours_validation_report(*, db: Session = Depends(get_read_db), report_in: schemas.HoursValidationRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     return _get_r14_data(db, report_in, current_manager)
 
 @router.post("/manager/hours-validation/download", summary="R14 - Download Hours Validation Report", tags=["Reports - Manager"])
-async def download_hours_validation_report(*, db: Session = Depends(get_db), report_in: schemas.HoursValidationRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+async def download_hours_validation_report(*, db: Session = Depends(get_read_db), report_in: schemas.HoursValidationRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     response_data = _get_r14_data(db, report_in, current_manager)
     filename = f"R14_HoursValidation_{current_manager.department.name}_{response_data['period']}.{report_in.format.value}"
     context = {"report_title": "Validation des Heures", **response_data}
@@ -203,13 +203,13 @@ def _get_r8_data(db: Session, report_in: schemas.AnomaliesReportRequest, current
     }
 
 @router.post("/organization/anomalies/preview", response_model=schemas.AnomaliesReportResponse, summary="R8 - Preview Anomalies Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-def preview_anomalies_report(*, db: Session = Depends(get_db), report_in: schemas.AnomaliesReportRequest, current_user: models.User = Depends(get_current_active_user)):
+def preview_anomalies_report(*, db: Session = Depends(get_read_db), report_in: schemas.AnomaliesReportRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id:
         raise HTTPException(status_code=403, detail="User not associated with an organization.")
     return _get_r8_data(db, report_in, current_user)
 
 @router.post("/organization/anomalies/download", summary="R8 - Download Anomalies Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-async def download_anomalies_report(*, db: Session = Depends(get_db), report_in: schemas.AnomaliesReportRequest, current_user: models.User = Depends(get_current_active_user)):
+async def download_anomalies_report(*, db: Session = Depends(get_read_db), report_in: schemas.AnomaliesReportRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id:
         raise HTTPException(status_code=403, detail="User not associated with an organization.")
     response_data = _get_r8_data(db, report_in, current_user)
@@ -224,7 +224,7 @@ async def download_anomalies_report(*, db: Session = Depends(get_db), report_in:
 
 # R11
 @router.post("/organization/payroll-export/download", summary="R11 - Download Payroll Export", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-async def download_payroll_export(*, db: Session = Depends(get_db), report_in: schemas.PayrollExportRequest, current_user: models.User = Depends(get_current_active_user)):
+async def download_payroll_export(*, db: Session = Depends(get_read_db), report_in: schemas.PayrollExportRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id:
         raise HTTPException(status_code=403, detail="User not associated with an organization.")
 
@@ -263,11 +263,11 @@ def _get_r15_data(db: Session, report_in: schemas.DepartmentLeavesRequest, curre
     return {"department_name": current_manager.department.name, "period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": report_data}
 
 @router.post("/manager/department-leaves/preview", response_model=schemas.DepartmentLeavesResponse, summary="R15 - Preview Department Leave Requests", tags=["Reports - Manager"])
-def preview_department_leaves_report(*, db: Session = Depends(get_db), report_in: schemas.DepartmentLeavesRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+def preview_department_leaves_report(*, db: Session = Depends(get_read_db), report_in: schemas.DepartmentLeavesRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     return _get_r15_data(db, report_in, current_manager)
 
 @router.post("/manager/department-leaves/download", summary="R15 - Download Department Leave Requests", tags=["Reports - Manager"])
-async def download_department_leaves_report(*, db: Session = Depends(get_db), report_in: schemas.DepartmentLeavesRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+async def download_department_leaves_report(*, db: Session = Depends(get_read_db), report_in: schemas.DepartmentLeavesRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     response_data = _get_r15_data(db, report_in, current_manager)
     if not response_data["data"]: raise HTTPException(status_code=404, detail="No leave data found for the selected criteria.")
     filename = f"R15_DeptLeaves_{current_manager.department.name}_{report_in.start_date}_to_{report_in.end_date}.{report_in.format.value}"
@@ -299,11 +299,11 @@ def _get_r16_data(db: Session, report_in: schemas.TeamPerformanceRequest, curren
     return {"department_name": current_manager.department.name, "period": period_str, "data": report_data}
 
 @router.post("/manager/team-performance/preview", response_model=schemas.TeamPerformanceResponse, summary="R16 - Preview Team Performance Report", tags=["Reports - Manager"])
-def preview_team_performance_report(*, db: Session = Depends(get_db), report_in: schemas.TeamPerformanceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+def preview_team_performance_report(*, db: Session = Depends(get_read_db), report_in: schemas.TeamPerformanceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     return _get_r16_data(db, report_in, current_manager)
 
 @router.post("/manager/team-performance/download", summary="R16 - Download Team Performance Report", tags=["Reports - Manager"])
-async def download_team_performance_report(*, db: Session = Depends(get_db), report_in: schemas.TeamPerformanceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
+async def download_team_performance_report(*, db: Session = Depends(get_read_db), report_in: schemas.TeamPerformanceRequest, current_manager: models.Employee = Depends(get_current_active_manager)):
     response_data = _get_r16_data(db, report_in, current_manager)
     filename = f"R16_TeamPerf_{current_manager.department.name}_{response_data['period']}.{report_in.format.value}"
     context = {"report_title": f"Rapport de Performance - {current_manager.department.name}", **response_data}
@@ -323,12 +323,12 @@ def _get_r5_data(db: Session, report_in: schemas.OrganizationPresenceRequest, cu
     return {"organization_name": current_user.organization.name, "period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": report_data, "summary": summary}
 
 @router.post("/organization/presence/preview", response_model=schemas.OrganizationPresenceResponse, summary="R5 - Preview Organization Presence Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-def preview_organization_presence_report(*, db: Session = Depends(get_db), report_in: schemas.OrganizationPresenceRequest, current_user: models.User = Depends(get_current_active_user)):
+def preview_organization_presence_report(*, db: Session = Depends(get_read_db), report_in: schemas.OrganizationPresenceRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     return _get_r5_data(db, report_in, current_user)
 
 @router.post("/organization/presence/download", summary="R5 - Download Organization Presence Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-async def download_organization_presence_report(*, db: Session = Depends(get_db), report_in: schemas.OrganizationPresenceRequest, current_user: models.User = Depends(get_current_active_user)):
+async def download_organization_presence_report(*, db: Session = Depends(get_read_db), report_in: schemas.OrganizationPresenceRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     response_data = _get_r5_data(db, report_in, current_user)
     filename = f"R05_OrgPresence_{current_user.organization.name}_{report_in.start_date}_to_{report_in.end_date}.{report_in.format.value}"
@@ -348,12 +348,12 @@ def _get_r6_data(db: Session, report_in: schemas.MonthlySyntheticReportRequest,
     return {"organization_name": current_user.organization.name, "period": start_date.strftime("%B %Y"), "data": report_data, "summary": summary}
 
 @router.post("/organization/monthly-synthetic/preview", response_model=schemas.OrganizationPresenceResponse, summary="R6 - Preview Monthly Synthetic Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-def preview_monthly_synthetic_report(*, db: Session = Depends(get_db), report_in: schemas.MonthlySyntheticReportRequest, current_user: models.User = Depends(get_current_active_user)):
+def preview_monthly_synthetic_report(*, db: Session = Depends(get_read_db), report_in: schemas.MonthlySyntheticReportRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     return _get_r6_data(db, report_in, current_user)
 
 @router.post("/organization/monthly-synthetic/download", summary="R6 - Download Monthly Synthetic Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-async def download_monthly_synthetic_report(*, db: Session = Depends(get_db), report_in: schemas.MonthlySyntheticReportRequest, current_user: models.User = Depends(get_current_active_user)):
+async def download_monthly_synthetic_report(*, db: Session = Depends(get_read_db), report_in: schemas.MonthlySyntheticReportRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     response_data = _get_r6_data(db, report_in, current_user)
     filename = f"R06_MonthlySynthetic_{current_user.organization.name}_{response_data['period']}.{report_in.format.value}"
@@ -369,12 +369,12 @@ def _get_r7_data(db: Session, report_in: schemas.OrganizationLeavesRequest, curr
     return {"organization_name": current_user.organization.name, "period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": report_data}
 
 @router.post("/organization/leaves/preview", response_model=schemas.DepartmentLeavesResponse, summary="R7 - Preview Organization Leaves Analysis", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-def preview_organization_leaves_report(*, db: Session = Depends(get_db), report_in: schemas.OrganizationLeavesRequest, current_user: models.User = Depends(get_current_active_user)):
+def preview_organization_leaves_report(*, db: Session = Depends(get_read_db), report_in: schemas.OrganizationLeavesRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     return _get_r7_data(db, report_in, current_user)
 
 @router.post("/organization/leaves/download", summary="R7 - Download Organization Leaves Analysis", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-async def download_organization_leaves_report(*, db: Session = Depends(get_db), report_in: schemas.OrganizationLeavesRequest, current_user: models.User = Depends(get_current_active_user)):
+async def download_organization_leaves_report(*, db: Session = Depends(get_read_db), report_in: schemas.OrganizationLeavesRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     response_data = _get_r7_data(db, report_in, current_user)
     if not response_data["data"]: raise HTTPException(status_code=404, detail="No leave data found for the selected criteria.")
@@ -402,11 +402,11 @@ def _get_r2_data(db: Session, report_in: schemas.ComparativeAnalysisRequest) ->
     return {"period": period_str, "data": report_data}
 
 @router.post("/superuser/comparative-analysis/preview", response_model=schemas.ComparativeAnalysisResponse, summary="R2 - Preview Comparative Analysis Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-def preview_comparative_analysis_report(*, db: Session = Depends(get_db), report_in: schemas.ComparativeAnalysisRequest):
+def preview_comparative_analysis_report(*, db: Session = Depends(get_read_db), report_in: schemas.ComparativeAnalysisRequest):
     return _get_r2_data(db, report_in)
 
 @router.post("/superuser/comparative-analysis/download", summary="R2 - Download Comparative Analysis Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-async def download_comparative_analysis_report(*, db: Session = Depends(get_db), report_in: schemas.ComparativeAnalysisRequest):
+async def download_comparative_analysis_report(*, db: Session = Depends(get_read_db), report_in: schemas.ComparativeAnalysisRequest):
     response_data = _get_r2_data(db, report_in)
     filename = f"R02_ComparativeAnalysis_{response_data['period']}.{report_in.format.value}"
     context = {"report_title": "Analyse Comparative Inter-Organisations", **response_data}
@@ -425,11 +425,11 @@ def _get_r3_data(db: Session, report_in: schemas.DeviceUsageRequest) -> Dict[str
     return {"period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": report_data}
 
 @router.post("/superuser/device-usage/preview", response_model=schemas.DeviceUsageResponse, summary="R3 - Preview Device Usage Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-def preview_device_usage_report(*, db: Session = Depends(get_db), report_in: schemas.DeviceUsageRequest):
+def preview_device_usage_report(*, db: Session = Depends(get_read_db), report_in: schemas.DeviceUsageRequest):
     return _get_r3_data(db, report_in)
 
 @router.post("/superuser/device-usage/download", summary="R3 - Download Device Usage Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-async def download_device_usage_report(*, db: Session = Depends(get_db), report_in: schemas.DeviceUsageRequest):
+async def download_device_usage_report(*, db: Session = Depends(get_read_db), report_in: schemas.DeviceUsageRequest):
     response_data = _get_r3_data(db, report_in)
     filename = f"R03_DeviceUsage_{report_in.start_date}_to_{report_in.end_date}.{report_in.format.value}"
     context = {"report_title": "Rapport d'Utilisation des Appareils", **response_data}
@@ -453,11 +453,11 @@ def _get_r4_data(db: Session, report_in: schemas.UserAuditRequest) -> Dict[str,
     return {"filters": filters, "user_count": len(report_data), "data": report_data}
 
 @router.post("/superuser/user-audit/preview", response_model=schemas.UserAuditResponse, summary="R4 - Preview User and Role Audit Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-def preview_user_audit_report(*, db: Session = Depends(get_db), report_in: schemas.UserAuditRequest):
+def preview_user_audit_report(*, db: Session = Depends(get_read_db), report_in: schemas.UserAuditRequest):
     return _get_r4_data(db, report_in)
 
 @router.post("/superuser/user-audit/download", summary="R4 - Download User and Role Audit Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-async def download_user_audit_report(*, db: Session = Depends(get_db), report_in: schemas.UserAuditRequest):
+async def download_user_audit_report(*, db: Session = Depends(get_read_db), report_in: schemas.UserAuditRequest):
     response_data = _get_r4_data(db, report_in)
     filename = f"R04_UserAudit.{report_in.format.value}"
     context = {"report_title": "Audit des Utilisateurs et Rôles", **response_data}
@@ -475,12 +475,12 @@ def _get_r9_data(db: Session, report_in: schemas.WorkedHoursRequest, current_use
     return {"organization_name": current_user.organization.name, "period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": detailed_data}
 
 @router.post("/organization/worked-hours/preview", response_model=schemas.WorkedHoursResponse, summary="R9 - Preview Worked Hours per Employee", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-def preview_worked_hours_report(*, db: Session = Depends(get_db), report_in: schemas.WorkedHoursRequest, current_user: models.User = Depends(get_current_active_user)):
+def preview_worked_hours_report(*, db: Session = Depends(get_read_db), report_in: schemas.WorkedHoursRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     return _get_r9_data(db, report_in, current_user)
 
 @router.post("/organization/worked-hours/download", summary="R9 - Download Worked Hours per Employee", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-async def download_worked_hours_report(*, db: Session = Depends(get_db), report_in: schemas.WorkedHoursRequest, current_user: models.User = Depends(get_current_active_user)):
+async def download_worked_hours_report(*, db: Session = Depends(get_read_db), report_in: schemas.WorkedHoursRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     response_data = _get_r9_data(db, report_in, current_user)
     filename = f"R09_WorkedHours_{current_user.organization.name}_{report_in.start_date}_to_{report_in.end_date}.{report_in.format.value}"
@@ -498,12 +498,12 @@ def _get_r10_data(db: Session, report_in: schemas.SiteActivityRequest, current_u
     return {"organization_name": current_user.organization.name, "period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": report_data}
 
 @router.post("/organization/site-activity/preview", response_model=schemas.SiteActivityResponse, summary="R10 - Preview Site Activity Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-def preview_site_activity_report(*, db: Session = Depends(get_db), report_in: schemas.SiteActivityRequest, current_user: models.User = Depends(get_current_active_user)):
+def preview_site_activity_report(*, db: Session = Depends(get_read_db), report_in: schemas.SiteActivityRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     return _get_r10_data(db, report_in, current_user)
 
 @router.post("/organization/site-activity/download", summary="R10 - Download Site Activity Report", tags=["Reports - Organization"], dependencies=[Depends(require_role("admin"))])
-async def download_site_activity_report(*, db: Session = Depends(get_db), report_in: schemas.SiteActivityRequest, current_user: models.User = Depends(get_current_active_user)):
+async def download_site_activity_report(*, db: Session = Depends(get_read_db), report_in: schemas.SiteActivityRequest, current_user: models.User = Depends(get_current_active_user)):
     if not current_user.organization_id: raise HTTPException(status_code=403, detail="User not associated with an organization.")
     response_data = _get_r10_data(db, report_in, current_user)
     filename = f"R10_SiteActivity_{current_user.organization.name}_{report_in.start_date}_to_{report_in.end_date}.{report_in.format.value}"
@@ -524,11 +524,11 @@ def _get_r1_data(db: Session, report_in: schemas.MultiOrgConsolidatedRequest) ->
     return {"period": f"{report_in.start_date.strftime('%d/%m/%Y')} - {report_in.end_date.strftime('%d/%m/%Y')}", "data": report_data}
 
 @router.post("/superuser/multi-org-consolidated/preview", response_model=schemas.MultiOrgConsolidatedResponse, summary="R1 - Preview Multi-Org Consolidated Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-def preview_multi_org_consolidated_report(*, db: Session = Depends(get_db), report_in: schemas.MultiOrgConsolidatedRequest):
+def preview_multi_org_consolidated_report(*, db: Session = Depends(get_read_db), report_in: schemas.MultiOrgConsolidatedRequest):
     return _get_r1_data(db, report_in)
 
 @router.post("/superuser/multi-org-consolidated/download", summary="R1 - Download Multi-Org Consolidated Report", tags=["Reports - Super Admin"], dependencies=[Depends(get_current_active_superuser)])
-async def download_multi_org_consolidated_report(*, db: Session = Depends(get_db), report_in: schemas.MultiOrgConsolidatedRequest):
+async def download_multi_org_consolidated_report(*, db: Session = Depends(get_read_db), report_in: schemas.MultiOrgConsolidatedRequest):
     response_data = _get_r1_data(db, report_in)
     period_str = f"{report_in.start_date.strftime('%Y%m%d')}-{report_in.end_date.strftime('%Y%m%d')}"
     filename = f"R01_MultiOrg_{report_in.metric_type}_{period_str}.{report_in.format.value}"
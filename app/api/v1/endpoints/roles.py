@@ -34,14 +34,16 @@ def read_roles(
     db: Session = Depends(get_db),
     skip: int = Query(0, description="Nombre de rôles à sauter"),
     limit: int = Query(100, description="Nombre maximum de rôles à retourner"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
 ) -> Any:
     """
     Retrieve roles. Requires permission: `role:read`.
     """
-    role_data = crud.role.get_multi(db, skip=skip, limit=limit)
+    role_data = crud.role.get_multi(db, skip=skip, limit=limit, include_total=include_total)
     return {
         "items": role_data["items"],
         "total": role_data["total"],
+        "total_kind": role_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
@@ -1,23 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import Any
+from typing import Any, List
 from app import crud, models, schemas
 from app.dependencies import get_db, PermissionChecker
 
 router = APIRouter()
 
+def enrich_sites_response(db: Session, sites: List[models.Site]) -> List[schemas.Site]:
+    """
+    Convert a page of sites with organization details. The counts are read
+    from the counter-cache columns of each row: no extra query.
+    """
+    return [schemas.Site.from_orm(site) for site in sites]
+
 def enrich_site_response(db: Session, site: models.Site) -> schemas.Site:
     """
     Enrich the site object with organization details and calculated counts.
     """
-    site_schema = schemas.Site.from_orm(site)
-
-    # Get counts
-    site_schema.departments_count = crud.department.count_by_site(db, site_id=site.id)
-    site_schema.employees_count = crud.employee.count_by_site(db, site_id=site.id)
-    site_schema.devices_count = crud.device.count_by_site(db, site_id=site.id)
-
-    return site_schema
+    return enrich_sites_response(db, [site])[0]
 
 @router.post(
     "/",
@@ -45,6 +45,7 @@ def read_sites(
     search: str = Query(None, description="Recherche textuelle (nom, adresse, ville, pays)"),
     sort_by: str = Query(None, description="Champ de tri (name, address, city, country, created_at, updated_at)"),
     sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
 ) -> Any:
     site_data = crud.site.get_multi_paginated(
         db,
@@ -52,14 +53,16 @@ def read_sites(
         limit=limit,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        include_total=include_total,
     )
 
-    enriched_items = [enrich_site_response(db, site) for site in site_data["items"]]
+    enriched_items = enrich_sites_response(db, site_data["items"])
 
     return {
         "items": enriched_items,
         "total": site_data["total"],
+        "total_kind": site_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
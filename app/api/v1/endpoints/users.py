@@ -28,6 +28,7 @@ def read_users(
     search: str = Query(None, description="Recherche textuelle (email, nom complet)"),
     sort_by: str = Query(None, description="Champ de tri (email, full_name, created_at, updated_at)"),
     sort_order: str = Query("asc", description="Direction du tri (asc ou desc)"),
+    include_total: bool = Query(True, description="Calculer le total (false pour l'omettre)"),
 ) -> Any:
     """
     Retrieve users.
@@ -38,11 +39,13 @@ def read_users(
         limit=limit,
         search=search,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        include_total=include_total,
     )
     return {
         "items": user_data["items"],
         "total": user_data["total"],
+        "total_kind": user_data["total_kind"],
         "skip": skip,
         "limit": limit,
     }
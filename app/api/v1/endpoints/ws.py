@@ -1,16 +1,211 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from app.websocket.connection_manager import manager
+import json
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from jose import JWTError
+from pydantic import ValidationError
+
+from app import models
+from app.db.session import SessionLocal
+from app.dependencies import get_current_active_superuser
+from app.models.department import Department
+from app.models.site import Site
+from app.schemas.token import TokenPayload
+from app.crud.user import user as crud_user
+from app.websocket.connection_manager import manager, subscription_key, SUBSCRIPTION_SCOPES
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RealtimePrincipal:
+    """Utilisateur authentifié d'une connexion temps réel (sans session SQLAlchemy)."""
+    user_id: str
+    is_superuser: bool
+    organization_id: Optional[str]
+
+
+def _get_token(websocket: WebSocket) -> Optional[str]:
+    """Token JWT passé en paramètre `token` ou dans l'en-tête Authorization."""
+    token = websocket.query_params.get("token")
+    if token:
+        return token
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    return None
+
+
+def _authenticate(token: str) -> Optional[RealtimePrincipal]:
+    """Utilisateur actif du token d'accès (requêtes synchrones : à exécuter hors de la boucle)."""
+    from app.core.security import decode_token
+
+    # Session courte : la connexion WebSocket peut rester ouverte des heures
+    with SessionLocal() as db:
+        try:
+            payload = decode_token(token, db)
+            token_data = TokenPayload(**payload)
+        except (JWTError, ValidationError):
+            return None
+        if payload.get("type") != "access":
+            return None
+        user = crud_user.get(db, id=token_data.sub)
+        if not user or not user.is_active:
+            return None
+        return RealtimePrincipal(
+            user_id=user.id,
+            is_superuser=user.is_superuser,
+            organization_id=user.organization_id,
+        )
+
+
+def _authorize(principal: RealtimePrincipal, scope: str, scope_id: Optional[str]) -> bool:
+    """
+    Vérifie qu'un utilisateur peut s'abonner à une portée.
+    Un superutilisateur peut tout suivre ; les autres uniquement leur organisation.
+    Requêtes synchrones : à exécuter hors de la boucle d'événements.
+    """
+    if scope not in SUBSCRIPTION_SCOPES:
+        return False
+    if principal.is_superuser:
+        return scope == "all" or bool(scope_id)
+    if scope == "all" or not scope_id or not principal.organization_id:
+        return False
+    if scope == "organization":
+        return scope_id == principal.organization_id
+
+    with SessionLocal() as db:
+        if scope == "site":
+            organization_id = db.query(Site.organization_id).filter(Site.id == scope_id).scalar()
+        else:
+            organization_id = (
+                db.query(Site.organization_id)
+                .join(Department, Department.site_id == Site.id)
+                .filter(Department.id == scope_id)
+                .scalar()
+            )
+    return organization_id == principal.organization_id
+
+
+def _initial_scopes(websocket: WebSocket, principal: RealtimePrincipal) -> list:
+    """Portées demandées à la connexion, par défaut l'organisation de l'utilisateur."""
+    scopes = [
+        (scope, websocket.query_params.get(f"{scope}_id"))
+        for scope in ("organization", "site", "department")
+        if websocket.query_params.get(f"{scope}_id")
+    ]
+    if scopes:
+        return scopes
+    if principal.organization_id:
+        return [("organization", principal.organization_id)]
+    if principal.is_superuser:
+        return [("all", None)]
+    return []
+
+
+async def _reply(websocket: WebSocket, message: dict):
+    await manager.send_personal_message(json.dumps(message), websocket)
+
+
+async def _handle_client_message(websocket: WebSocket, principal: RealtimePrincipal, text: str):
+    """
+    Messages client : {"action": "subscribe" | "unsubscribe", "scope": "organization" | "site" | "department" | "all", "id": "..."}
+    """
+    try:
+        message = json.loads(text)
+        action = message["action"]
+        scope = message["scope"]
+        scope_id = message.get("id")
+    except (ValueError, KeyError, TypeError):
+        await _reply(websocket, {"type": "error", "detail": "Message invalide"})
+        return
+
+    if action == "unsubscribe":
+        manager.unsubscribe(websocket, subscription_key(scope, scope_id))
+        await _reply(websocket, {"type": "unsubscribed", "scope": scope, "id": scope_id})
+    elif action == "subscribe":
+        if not await run_in_threadpool(_authorize, principal, scope, scope_id):
+            await _reply(websocket, {"type": "error", "detail": "Abonnement non autorisé", "scope": scope, "id": scope_id})
+            return
+        manager.subscribe(websocket, subscription_key(scope, scope_id))
+        await _reply(websocket, {"type": "subscribed", "scope": scope, "id": scope_id})
+    else:
+        await _reply(websocket, {"type": "error", "detail": f"Action inconnue: {action}"})
+
 
 @router.websocket("/attendance/realtime")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    """
+    Flux temps réel des pointages.
+
+    Authentification par token JWT (`?token=...` ou en-tête Authorization).
+    Abonnement initial via `organization_id`, `site_id`, `department_id` en
+    paramètres (par défaut : l'organisation de l'utilisateur), puis par
+    messages subscribe/unsubscribe.
+
+    Avec `?coalesce=true`, les événements sont regroupés en trames
+    {"type": "batch", "version": 2, "events": [...]} (une trame au plus
+    toutes les WS_COALESCE_INTERVAL_MS millisecondes).
+
+    Chaque événement porte un numéro `seq` croissant par organisation. Après
+    une coupure, le client se reconnecte avec `?last_seq=<n>` et reçoit les
+    événements manqués, ou {"type": "resync_required"} s'ils ne sont plus
+    disponibles (il doit alors recharger les données par l'API).
+    """
+    token = _get_token(websocket)
+    principal = await run_in_threadpool(_authenticate, token) if token else None
+    if principal is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    scopes = _initial_scopes(websocket, principal)
+    authorized = await run_in_threadpool(
+        lambda: all(_authorize(principal, scope, scope_id) for scope, scope_id in scopes)
+    )
+    if not authorized:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    coalesce = websocket.query_params.get("coalesce", "").lower() in ("1", "true", "yes")
+    await manager.connect(websocket, coalesce=coalesce)
+
+    keys = [subscription_key(scope, scope_id) for scope, scope_id in scopes]
+    last_seq = websocket.query_params.get("last_seq")
+    if last_seq is not None:
+        organization_id = websocket.query_params.get("organization_id") or principal.organization_id
+        try:
+            last_seq = int(last_seq)
+        except ValueError:
+            last_seq = -1
+        if organization_id:
+            # Rejeu puis abonnement sans attente intermédiaire : aucun événement perdu
+            manager.replay(websocket, organization_id, last_seq, keys)
+    for key in keys:
+        manager.subscribe(websocket, key)
+
     try:
         while True:
-            # On maintient la connexion ouverte.
-            # On pourrait recevoir des messages du client ici si nécessaire.
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            await _handle_client_message(websocket, principal, text)
     except WebSocketDisconnect:
+        logger.info("Client disconnected from WebSocket.")
+    except RuntimeError:
+        # Connexion déjà fermée par le serveur (client trop lent)
+        pass
+    finally:
         manager.disconnect(websocket)
-        print("Client disconnected from WebSocket.")
+
+
+@router.get(
+    "/stats",
+    summary="Statistiques des connexions temps réel",
+    description="Nombre de connexions, profondeur des files d'envoi et messages abandonnés. **Requiert un superutilisateur.**",
+)
+def get_websocket_stats(
+    current_user: models.User = Depends(get_current_active_superuser),
+) -> dict:
+    return manager.get_stats()
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import AnyHttpUrl
 
 
@@ -15,12 +15,27 @@ class Settings(BaseSettings):
     
     # Base de données
     DATABASE_URL: str = "postgresql://postgres:@127.0.0.1:5432/kuilinga_db"
+    # Réplique en lecture (rapports, tableaux de bord) ; vide = tout sur la base primaire
+    READ_REPLICA_URL: Optional[str] = None
+    READ_REPLICA_POOL_SIZE: int = 10
+    READ_REPLICA_MAX_OVERFLOW: int = 20
+    READ_REPLICA_MAX_LAG_SECONDS: float = 30.0  # Au-delà, les lectures repassent sur la primaire
+    READ_REPLICA_LAG_CHECK_SECONDS: float = 5.0  # Fréquence de mesure du retard
     
     # Sécurité JWT
     SECRET_KEY: str = "votre-cle-secrete-super-longue-et-aleatoire-changez-moi"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 5  # Propagation des révocations entre workers
+    TOKEN_CLEANUP_BATCH_SIZE: int = 1000  # Tokens expirés supprimés par transaction
+    TOKEN_CLEANUP_PAUSE_SECONDS: float = 0.5  # Pause entre deux lots de purge
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # Cache utilisateur + permissions des requêtes authentifiées
+
+    # Hachage des mots de passe (bcrypt)
+    BCRYPT_ROUNDS: int = 12  # Coût des nouveaux hashs (les anciens sont recalculés au login)
+    PASSWORD_HASH_WORKERS: int = 4  # Calculs bcrypt simultanés
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Au-delà : réponse 503 immédiate
     
     # Redis (cache)
     REDIS_URL: str = "redis://127.0.0.1:6379/0"
@@ -50,9 +65,28 @@ class Settings(BaseSettings):
     # Pagination
     DEFAULT_PAGE_SIZE: int = 50
     MAX_PAGE_SIZE: int = 1000
+    # Total des listes paginées par ressource : "exact", "cached" (TTL) ou "estimate" (planificateur)
+    COUNT_STRATEGIES: Dict[str, str] = {
+        "attendances": "estimate",
+        "employees": "cached",
+        "users": "cached",
+        "leaves": "cached",
+        "devices": "cached",
+    }
+    COUNT_CACHE_TTL_SECONDS: int = 30
+    COUNT_ESTIMATE_THRESHOLD: int = 100000  # En dessous, le total exact est calculé
     
+    # Partitionnement mensuel des pointages (PostgreSQL)
+    ATTENDANCE_PARTITIONS_AHEAD_MONTHS: int = 3  # Mois créés à l'avance
+    ATTENDANCE_RETENTION_MONTHS: int = 0  # 0 = conservation illimitée
+    ATTENDANCE_RETENTION_ACTION: str = "detach"  # "detach" (archivage) ou "drop"
+
     # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10  # POST /auth/login (par IP)
+    RATE_LIMIT_REPORT_DOWNLOAD_PER_MINUTE: int = 10  # Téléchargements de rapports
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (par worker) ou "redis" (partagé, REDIS_URL)
     
     # MQTT Broker Settings
     MQTT_BROKER_HOST: str
@@ -67,9 +101,39 @@ class Settings(BaseSettings):
     MQTT_CLIENT_KEY: str | None = None  # Chemin vers la clé privée client
     MQTT_TLS_INSECURE: bool = False  # Désactiver vérification hostname (dev only)
 
+    # MQTT groupe de consommateurs (abonnements partagés MQTT v5, $share/<groupe>/...)
+    # Laisser vide pour un seul worker; définir pour répartir les messages entre workers/hôtes
+    MQTT_SHARED_SUBSCRIPTION_GROUP: str | None = None
+
+    # MQTT Ingest (écriture des pointages par lots)
+    MQTT_INGEST_QUEUE_SIZE: int = 10000  # Nombre max de pointages en attente
+    MQTT_INGEST_BATCH_SIZE: int = 200  # Nombre max de pointages par lot
+    MQTT_INGEST_MAX_LINGER_MS: int = 50  # Attente max avant d'écrire un lot incomplet
+    BADGE_DIRECTORY_TTL_SECONDS: int = 300  # Durée de vie du cache badges/terminaux
+
+    # Temps réel (WebSocket)
+    REALTIME_BRIDGE_MAX_SIZE: int = 1000  # Événements en attente avant abandon des plus anciens
+    WS_SEND_QUEUE_SIZE: int = 100  # File d'envoi par connexion WebSocket
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0  # Délai max d'un envoi avant déconnexion
+    WS_SLOW_CONSUMER_MAX_DROPS: int = 50  # Messages abandonnés d'affilée avant déconnexion
+    WS_COALESCE_INTERVAL_MS: int = 150  # Regroupement des événements (clients ?coalesce=true)
+    WS_COALESCE_MAX_EVENTS: int = 5000  # Événements max accumulés entre deux trames regroupées
+    WS_REPLAY_BUFFER_SIZE: int = 500  # Événements conservés par organisation pour la reprise (last_seq)
+    # Diffusion entre workers : "memory" (un seul processus) ou "redis" (REDIS_URL)
+    REALTIME_BACKPLANE: str = "memory"
+    REALTIME_BACKPLANE_CHANNEL: str = "kuilinga:realtime"
+
     # Device Status Monitoring (heartbeat detection)
     DEVICE_STATUS_CHECK_INTERVAL_SECONDS: int = 60  # Intervalle de vérification
     DEVICE_OFFLINE_TIMEOUT_MINUTES: int = 5  # Délai avant de marquer offline
+    DEVICE_TELEMETRY_FLUSH_INTERVAL_SECONDS: int = 10  # Écriture différée de last_seen/heartbeat
+    DEVICE_STATS_FLUSH_INTERVAL_SECONDS: int = 10  # Écriture différée des statistiques de pointage
+    DAILY_PRESENCE_FLUSH_INTERVAL_SECONDS: int = 10  # Écriture différée des présences du jour
+
+    # Instantanés des tableaux de bord (manager, intégrateur, analyses)
+    DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS: int = 60  # Âge max d'un instantané servi
+    DASHBOARD_SNAPSHOT_DEBOUNCE_SECONDS: float = 2.0  # Regroupement des événements avant recalcul
+    DASHBOARD_SNAPSHOT_IDLE_SECONDS: int = 600  # Instantanés non consultés oubliés
 
     class Config:
         env_file = ".env"
@@ -1,26 +1,45 @@
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from fastapi.concurrency import run_in_threadpool
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app import crud, models
 from app.config import settings
 from app.crud.blacklisted_token import blacklisted_token
+from app.services.password_hasher import password_hasher
+from app.services.token_revocation import token_revocation, token_revocation_key
 
-# Configuration du hashing de mots de passe
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuration du hashing de mots de passe (pool bcrypt borné)
+pwd_context = password_hasher.context
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Vérifie si le mot de passe correspond au hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """
+    Vérifie si le mot de passe correspond au hash.
+    Lève PasswordHasherBusy si le pool de hachage est saturé.
+    """
+    return password_hasher.verify(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Variante asynchrone de `verify_password` (n'occupe aucun thread partagé)."""
+    return await password_hasher.verify_async(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash un mot de passe"""
-    return pwd_context.hash(password)
+    """
+    Hash un mot de passe.
+    Lève PasswordHasherBusy si le pool de hachage est saturé.
+    """
+    return password_hasher.hash(password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Variante asynchrone de `get_password_hash` (n'occupe aucun thread partagé)."""
+    return await password_hasher.hash_async(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -41,7 +60,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -58,7 +77,7 @@ def create_refresh_token(data: dict) -> str:
     """
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -69,7 +88,8 @@ def decode_token(token: str, db: Optional[Session] = None) -> dict:
 
     Args:
         token: Token JWT à décoder
-        db: Session de la base de données (optionnel, pour vérifier la blacklist)
+        db: Session de la base de données (optionnel, utilisée pour vérifier la
+            blacklist tant que la liste de révocation en mémoire n'est pas chargée)
 
     Returns:
         Payload du token décodé
@@ -78,11 +98,12 @@ def decode_token(token: str, db: Optional[Session] = None) -> dict:
         JWTError: Si le token est invalide ou blacklisté
     """
     try:
-        # Vérifier si le token est blacklisté (si db session est fournie)
-        if db and blacklisted_token.is_blacklisted(db, token):
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+        # Vérifier si le token est révoqué (en mémoire, sans requête SQL)
+        if token_revocation.is_revoked(token_revocation_key(token, payload), db):
             raise JWTError("Token has been revoked")
 
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         raise JWTError("Token invalide ou expiré")
@@ -103,11 +124,40 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[models
     user = crud.user.get_by_email(db, email=email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        # Le coût bcrypt configuré a changé : on enregistre le nouveau hash
+        user = crud.user.update(db, db_obj=user, obj_in={"hashed_password": new_hash})
     return user
 
 
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[models.User]:
+    """
+    Variante asynchrone de `authenticate_user` : les requêtes passent par le
+    pool de threads le temps de leur exécution, le calcul bcrypt par le pool
+    de hachage, sans bloquer de thread partagé pendant son attente.
+
+    L'utilisateur retourné est chargé avec ses rôles et leurs permissions :
+    le lire depuis la boucle d'événements n'émet aucune requête.
+    """
+    user = await run_in_threadpool(crud.user.get_by_email, db, email=email)
+    if not user:
+        return None
+    user_id = user.id
+    valid, new_hash = await password_hasher.verify_and_update_async(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        # Le coût bcrypt configuré a changé : on enregistre le nouveau hash
+        await run_in_threadpool(
+            crud.user.update, db, db_obj=user, obj_in={"hashed_password": new_hash}
+        )
+    # Rechargement hors de la boucle (le commit du nouveau hash expire l'instance)
+    return await run_in_threadpool(crud.user.get_with_permissions, db, id=user_id)
+
+
 def get_user_from_refresh_token(db: Session, token: str) -> Optional[models.User]:
     """
     Récupère un utilisateur à partir d'un refresh token.
@@ -159,13 +209,16 @@ def blacklist_token(db: Session, token: str, user_id: Optional[str] = None) -> b
         # Convertir le timestamp en datetime
         expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
 
-        # Ajouter à la blacklist
+        # Ajouter à la blacklist (base puis liste en mémoire de ce worker ;
+        # les autres workers la récupèrent à leur prochaine synchronisation)
+        token_id = token_revocation_key(token, payload)
         blacklisted_token.create(
             db,
-            token=token,
+            token_id=token_id,
             expires_at=expires_at,
             user_id=user_id
         )
+        token_revocation.revoke(token_id, expires_at)
         return True
     except (JWTError, Exception):
         return False
\ No newline at end of file
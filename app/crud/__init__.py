@@ -8,5 +8,6 @@ from .organization import organization
 from .user import user
 from .crud_site import site
 from .crud_leave import leave
+from .crud_daily_presence import daily_presence
 from .crud_dashboard import dashboard
 from .crud_report import report
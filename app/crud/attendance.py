@@ -1,16 +1,38 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_, asc, desc
-from datetime import datetime, date
+from sqlalchemy import func, or_, asc, desc, insert, tuple_
+from datetime import datetime
 from app.crud.base import CRUDBase
 from app.models.attendance import Attendance
+from app.models.base import generate_uuid
 from app.models.employee import Employee
 from app.models.department import Department
 from app.models.site import Site
 from app.models.device import Device
 from app.schemas.attendance import AttendanceCreate, AttendanceUpdate
+from app.utils.helpers import day_bounds, utc_today
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.services.list_counts import list_counter
 
 class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
+    def create_many(
+        self, db: Session, *, objs_in: List[AttendanceCreate]
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert a batch of attendances with a single multi-row INSERT.
+        Does not commit: the caller groups its writes in one transaction.
+        Returns the inserted rows (with their generated ids).
+        """
+        rows = []
+        for obj_in in objs_in:
+            row = obj_in.model_dump()
+            row["id"] = generate_uuid()
+            rows.append(row)
+
+        if rows:
+            db.execute(insert(Attendance).values(rows))
+        return rows
+
     def get_multi_paginated(
         self,
         db: Session,
@@ -20,7 +42,8 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         employee_id: str = None,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
 
         query = (
@@ -44,7 +67,9 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
                 Attendance.type.ilike(search_filter)
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="attendances", filters=(employee_id, search), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -62,7 +87,70 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
 
         items = query.offset(skip).limit(limit).all()
 
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
+
+    def get_multi_keyset(
+        self,
+        db: Session,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        employee_id: Optional[str] = None,
+        search: Optional[str] = None,
+        sort_order: Optional[str] = "desc",
+        include_total: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Keyset pagination ordered by (timestamp, id), backed by the
+        (timestamp, id) and (employee_id, timestamp, id) indexes: every page
+        costs the same as the first, and rows inserted meanwhile never shift
+        the following pages. The total is only counted on demand, with the
+        attendances count strategy.
+        """
+        query = (
+            db.query(self.model)
+            .options(
+                joinedload(Attendance.employee).options(
+                    joinedload(Employee.department),
+                    joinedload(Employee.site)
+                ),
+                joinedload(Attendance.device)
+            )
+        )
+
+        if employee_id:
+            query = query.filter(Attendance.employee_id == employee_id)
+
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                Attendance.type.ilike(search_filter)
+            )
+
+        total, total_kind = list_counter.count(
+            db, query, resource="attendances", filters=(employee_id, search), include_total=include_total
+        )
+
+        descending = (sort_order or "desc").lower() != "asc"
+        key = tuple_(Attendance.timestamp, Attendance.id)
+        if cursor:
+            position = tuple_(*decode_cursor(cursor, descending))
+            query = query.filter(key < position if descending else key > position)
+
+        if descending:
+            query = query.order_by(Attendance.timestamp.desc(), Attendance.id.desc())
+        else:
+            query = query.order_by(Attendance.timestamp.asc(), Attendance.id.asc())
+
+        # One extra row tells whether a next page exists
+        rows = query.limit(limit + 1).all()
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(last.timestamp, last.id, descending)
+
+        return {"items": items, "total": total, "total_kind": total_kind, "next_cursor": next_cursor}
 
     def get_multi_by_employee(
         self, db: Session, *, employee_id: str, skip: int = 0, limit: int = 100
@@ -86,11 +174,11 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         )
 
     def count_today_for_device(self, db: Session, *, device_id: str) -> int:
-        today = date.today()
+        day_start, day_end = day_bounds(utc_today())
         return (
             db.query(self.model)
             .filter(Attendance.device_id == device_id)
-            .filter(func.date(Attendance.timestamp) == today)
+            .filter(Attendance.timestamp >= day_start, Attendance.timestamp < day_end)
             .count()
         )
 
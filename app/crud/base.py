@@ -3,6 +3,7 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.db.base import Base
+from app.services.list_counts import list_counter
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -16,12 +17,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db.query(self.model).filter(self.model.id == id).first()
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, include_total: bool = True
     ) -> Dict[str, Any]:
         query = db.query(self.model)
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource=self.model.__tablename__, include_total=include_total
+        )
         items = query.order_by(self.model.id).offset(skip).limit(limit).all()
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timezone
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from app.models.blacklisted_token import BlacklistedToken
 
@@ -11,7 +12,7 @@ class CRUDBlacklistedToken:
         self,
         db: Session,
         *,
-        token: str,
+        token_id: str,
         expires_at: datetime,
         user_id: Optional[str] = None
     ) -> BlacklistedToken:
@@ -20,7 +21,7 @@ class CRUDBlacklistedToken:
 
         Args:
             db: Session de la base de données
-            token: Le token JWT à blacklister
+            token_id: Identifiant du token (jti ou empreinte SHA-256)
             expires_at: Date d'expiration du token
             user_id: ID de l'utilisateur (optionnel)
 
@@ -28,7 +29,7 @@ class CRUDBlacklistedToken:
             L'objet BlacklistedToken créé
         """
         db_obj = BlacklistedToken(
-            token=token,
+            token_id=token_id,
             expires_at=expires_at,
             user_id=user_id,
             blacklisted_on=datetime.now(timezone.utc)
@@ -38,39 +39,86 @@ class CRUDBlacklistedToken:
         db.refresh(db_obj)
         return db_obj
 
-    def is_blacklisted(self, db: Session, token: str) -> bool:
+    def is_blacklisted(self, db: Session, token_id: str) -> bool:
         """
         Vérifie si un token est blacklisté.
 
         Args:
             db: Session de la base de données
-            token: Le token JWT à vérifier
+            token_id: Identifiant du token (jti ou empreinte SHA-256)
 
         Returns:
             True si le token est blacklisté, False sinon
         """
-        blacklisted = db.query(BlacklistedToken).filter(
-            BlacklistedToken.token == token
+        blacklisted = db.query(BlacklistedToken.id).filter(
+            BlacklistedToken.token_id == token_id
         ).first()
         return blacklisted is not None
 
-    def remove_expired(self, db: Session) -> int:
+    def get_active(self, db: Session, since: Optional[datetime] = None) -> List[BlacklistedToken]:
         """
-        Supprime tous les tokens expirés de la blacklist.
+        Retourne les tokens blacklistés non expirés.
+
+        Args:
+            db: Session de la base de données
+            since: Ne retourner que les tokens blacklistés depuis cette date (optionnel)
+
+        Returns:
+            La liste des tokens blacklistés
+        """
+        query = db.query(BlacklistedToken).filter(
+            BlacklistedToken.expires_at > datetime.now(timezone.utc)
+        )
+        if since is not None:
+            query = query.filter(BlacklistedToken.blacklisted_on >= since)
+        return query.all()
+
+    def remove_expired_batch(
+        self, db: Session, *, before: datetime, batch_size: int = 1000
+    ) -> int:
+        """
+        Supprime au plus `batch_size` tokens expirés (les plus anciens d'abord),
+        dans une transaction courte : les verrous et le volume de WAL restent
+        bornés quel que soit le nombre de tokens à purger.
+
+        Args:
+            db: Session de la base de données
+            before: Date limite d'expiration
+            batch_size: Nombre max de tokens supprimés
+
+        Returns:
+            Le nombre de tokens supprimés
+        """
+        ids = (
+            select(BlacklistedToken.id)
+            .where(BlacklistedToken.expires_at < before)
+            .order_by(BlacklistedToken.expires_at)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = db.execute(delete(BlacklistedToken).where(BlacklistedToken.id.in_(ids)))
+        db.commit()
+        return result.rowcount
+
+    def remove_expired(self, db: Session, batch_size: int = 1000) -> int:
+        """
+        Supprime tous les tokens expirés de la blacklist, par lots.
         Cette opération devrait être exécutée périodiquement pour nettoyer la base.
 
         Args:
             db: Session de la base de données
+            batch_size: Nombre max de tokens supprimés par transaction
 
         Returns:
             Le nombre de tokens supprimés
         """
         now = datetime.now(timezone.utc)
-        deleted_count = db.query(BlacklistedToken).filter(
-            BlacklistedToken.expires_at < now
-        ).delete()
-        db.commit()
-        return deleted_count
+        deleted_count = 0
+        while True:
+            deleted = self.remove_expired_batch(db, before=now, batch_size=batch_size)
+            deleted_count += deleted
+            if deleted < batch_size:
+                return deleted_count
 
     def get_blacklist_count(self, db: Session) -> int:
         """
@@ -0,0 +1,141 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import and_, case, cast, column, func, select, table, update, values, Date, DateTime, String
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Attendance, Employee, Organization
+from app.models.daily_presence import DailyPresenceCount, NO_SITE
+from app.utils.helpers import utc_today
+
+# Fuseaux horaires connus de PostgreSQL
+pg_timezone_names = table("pg_timezone_names", column("name", String))
+
+
+class CRUDDailyPresence:
+    def get_organization_timezones(self, db: Session, *, organization_ids: Iterable[str]) -> Dict[str, str]:
+        """Fuseau horaire de chaque organisation (UTC par défaut)."""
+        organization_ids = list(set(organization_ids))
+        if not organization_ids:
+            return {}
+        rows = (
+            db.query(Organization.id, func.coalesce(Organization.timezone, "UTC"))
+            .filter(Organization.id.in_(organization_ids))
+            .all()
+        )
+        return dict(rows)
+
+    def add_attendances_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """
+        Ajoute des pointages aux compteurs du jour, en créant les lignes
+        manquantes (INSERT ... ON CONFLICT DO UPDATE).
+
+        Chaque ligne contient: organization_id, site_id, day et count
+        (pointages à ajouter).
+        """
+        if not rows:
+            return
+
+        stmt = insert(DailyPresenceCount)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_daily_presence_counts_org_day_site",
+            set_={"attendance_count": DailyPresenceCount.attendance_count + stmt.excluded.attendance_count},
+        )
+        db.execute(stmt, [
+            {
+                "organization_id": row["organization_id"],
+                "site_id": row["site_id"] or NO_SITE,
+                "day": row["day"],
+                "attendance_count": row["count"],
+            }
+            for row in rows
+        ])
+
+    def recount_presence_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> int:
+        """
+        Recalcule le nombre d'employés présents de plusieurs lignes en un seul
+        UPDATE ... FROM (VALUES ...), à partir des pointages du jour du site.
+        Le compteur ne décroît pas (un recalcul concurrent plus ancien ne
+        l'écrase pas).
+
+        Chaque ligne contient: organization_id, site_id, day et les bornes
+        `start`/`end` du jour local.
+        Retourne le nombre de lignes mises à jour.
+        """
+        if not rows:
+            return 0
+
+        keys = values(
+            column("organization_id", String),
+            column("site_id", String),
+            column("day", Date),
+            column("start", DateTime(timezone=True)),
+            column("end", DateTime(timezone=True)),
+            name="presence_keys",
+        ).data([
+            (row["organization_id"], row["site_id"] or NO_SITE, row["day"], row["start"], row["end"])
+            for row in rows
+        ])
+
+        present = (
+            select(func.count(func.distinct(Attendance.employee_id)))
+            .join(Employee, Employee.id == Attendance.employee_id)
+            .where(
+                Employee.organization_id == keys.c.organization_id,
+                func.coalesce(Employee.site_id, NO_SITE) == keys.c.site_id,
+                Attendance.timestamp >= cast(keys.c.start, DateTime(timezone=True)),
+                Attendance.timestamp < cast(keys.c.end, DateTime(timezone=True)),
+            )
+            .scalar_subquery()
+        )
+
+        result = db.execute(
+            update(DailyPresenceCount)
+            .where(and_(
+                DailyPresenceCount.organization_id == keys.c.organization_id,
+                DailyPresenceCount.site_id == keys.c.site_id,
+                DailyPresenceCount.day == cast(keys.c.day, Date),
+            ))
+            .values(present_count=func.greatest(DailyPresenceCount.present_count, present))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def get_organization_day(self, db: Session, *, organization_id: str, day: date) -> Tuple[int, int]:
+        """Retourne (employés présents, pointages) d'une organisation pour un jour local."""
+        present, attendances = (
+            db.query(
+                func.coalesce(func.sum(DailyPresenceCount.present_count), 0),
+                func.coalesce(func.sum(DailyPresenceCount.attendance_count), 0),
+            )
+            .filter(
+                DailyPresenceCount.organization_id == organization_id,
+                DailyPresenceCount.day == day,
+            )
+            .one()
+        )
+        return int(present), int(attendances)
+
+    def get_today_attendance_count(self, db: Session) -> int:
+        """Pointages du jour de toutes les organisations, chacune dans son fuseau horaire."""
+        today = utc_today()
+        # Fuseau inconnu : UTC, comme get_zone (timezone() échouerait sinon)
+        zone = case(
+            (Organization.timezone.in_(select(pg_timezone_names.c.name)), Organization.timezone),
+            else_="UTC",
+        )
+        local_today = cast(func.timezone(zone, func.now()), Date)
+        return int(
+            db.query(func.coalesce(func.sum(DailyPresenceCount.attendance_count), 0))
+            .join(Organization, Organization.id == DailyPresenceCount.organization_id)
+            .filter(
+                # Tous les fuseaux sont à moins d'un jour de UTC (index sur day)
+                DailyPresenceCount.day.between(today - timedelta(days=1), today + timedelta(days=1)),
+                DailyPresenceCount.day == local_today,
+            )
+            .scalar()
+        )
+
+
+daily_presence = CRUDDailyPresence()
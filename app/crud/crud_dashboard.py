@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models import Organization, User, Site, Device
 from app.models.device import DeviceStatus
+from app.crud.crud_daily_presence import daily_presence
+from app.utils.helpers import day_bounds, local_today, utc_today
 
 # I will add dashboard-specific CRUD functions here.
 class CRUDDashboard:
@@ -32,21 +34,23 @@ class CRUDDashboard:
         )
 
     def get_daily_attendance_count(self, db: Session) -> int:
-        from app.models import Attendance
-        # Assuming timestamp is stored in UTC and we compare against UTC now
-        return db.query(func.count(Attendance.id)).filter(func.date(Attendance.timestamp) == func.current_date()).scalar()
+        # Maintained at ingest in daily_presence_counts (see app/services/daily_presence.py),
+        # each organization's day being taken in its own timezone
+        return daily_presence.get_today_attendance_count(db)
 
     def get_daily_presence_and_total_employees(self, db: Session, organization_id: str) -> tuple[int, int]:
-        from app.models import Employee, Attendance
-        total_employees = db.query(func.count(Employee.id)).filter(Employee.organization_id == organization_id).scalar()
-        present_employees = (
-            db.query(func.count(func.distinct(Attendance.employee_id)))
-            .join(Employee)
-            .filter(Employee.organization_id == organization_id)
-            .filter(func.date(Attendance.timestamp) == func.current_date())
-            .scalar()
+        # Counter cache column and daily_presence_counts rows, no scan of attendances
+        organization = (
+            db.query(Organization.employees_count, Organization.timezone)
+            .filter(Organization.id == organization_id)
+            .first()
+        )
+        if organization is None:
+            return 0, 0
+        present_employees, _ = daily_presence.get_organization_day(
+            db, organization_id=organization_id, day=local_today(organization.timezone)
         )
-        return present_employees, total_employees
+        return present_employees, organization.employees_count
 
     def get_daily_tardiness_count(self, db: Session, organization_id: str) -> int:
         # This function is a placeholder. A full implementation requires a 'Shift' model
@@ -62,11 +66,11 @@ class CRUDDashboard:
         )
 
     def get_presence_evolution_last_30_days(self, db: Session, organization_id: str) -> list[dict]:
-        from datetime import date, timedelta
+        from datetime import timedelta
         from app.models import Attendance, Employee
 
-        today = date.today()
-        thirty_days_ago = today - timedelta(days=30)
+        thirty_days_ago = utc_today() - timedelta(days=30)
+        range_start = day_bounds(thirty_days_ago)[0]
 
         return (
             db.query(
@@ -75,7 +79,7 @@ class CRUDDashboard:
             )
             .join(Employee)
             .filter(Employee.organization_id == organization_id)
-            .filter(func.date(Attendance.timestamp) >= thirty_days_ago)
+            .filter(Attendance.timestamp >= range_start)
             .group_by(func.date(Attendance.timestamp))
             .order_by(func.date(Attendance.timestamp))
             .all()
@@ -135,10 +139,11 @@ class CRUDDashboard:
 
     def get_employee_today_attendances(self, db: Session, employee_id: str) -> list:
         from app.models import Attendance
+        day_start, day_end = day_bounds(utc_today())
         return (
             db.query(Attendance)
             .filter(Attendance.employee_id == employee_id)
-            .filter(func.date(Attendance.timestamp) == func.current_date())
+            .filter(Attendance.timestamp >= day_start, Attendance.timestamp < day_end)
             .all()
         )
 
@@ -146,9 +151,8 @@ class CRUDDashboard:
         # Simplified: assumes 22 working days in a month.
         from app.models import Attendance
         from sqlalchemy import text
-        from datetime import datetime
 
-        start_of_month = datetime.today().replace(day=1)
+        start_of_month = day_bounds(utc_today().replace(day=1))[0]
 
         days_present = (
             db.query(func.count(func.distinct(func.date(Attendance.timestamp))))
@@ -4,6 +4,7 @@ from sqlalchemy import or_, asc, desc
 from app.crud.base import CRUDBase
 from app.models.department import Department
 from app.schemas.department import DepartmentCreate, DepartmentUpdate
+from app.services.list_counts import list_counter
 
 class CRUDDepartment(CRUDBase[Department, DepartmentCreate, DepartmentUpdate]):
     def get_multi_paginated(
@@ -14,7 +15,8 @@ class CRUDDepartment(CRUDBase[Department, DepartmentCreate, DepartmentUpdate]):
         limit: int = 100,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         query = db.query(self.model).options(
             joinedload(Department.site),
@@ -31,7 +33,9 @@ class CRUDDepartment(CRUDBase[Department, DepartmentCreate, DepartmentUpdate]):
                 )
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="departments", filters=(search,), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -48,7 +52,7 @@ class CRUDDepartment(CRUDBase[Department, DepartmentCreate, DepartmentUpdate]):
             query = query.order_by(Department.name)
 
         items = query.offset(skip).limit(limit).all()
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
     def count_by_site(self, db: Session, *, site_id: str) -> int:
         return db.query(self.model).filter(Department.site_id == site_id).count()
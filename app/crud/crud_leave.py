@@ -5,6 +5,7 @@ from app.crud.base import CRUDBase
 from app.models.leave import Leave
 from app.models.employee import Employee
 from app.schemas.leave import LeaveCreate, LeaveUpdate
+from app.services.list_counts import list_counter
 
 class CRUDLeave(CRUDBase[Leave, LeaveCreate, LeaveUpdate]):
     def get_multi_paginated(
@@ -15,7 +16,8 @@ class CRUDLeave(CRUDBase[Leave, LeaveCreate, LeaveUpdate]):
         limit: int = 100,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         query = db.query(self.model).options(
             joinedload(Leave.employee).options(
@@ -35,7 +37,9 @@ class CRUDLeave(CRUDBase[Leave, LeaveCreate, LeaveUpdate]):
                 )
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="leaves", filters=(search,), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -52,6 +56,6 @@ class CRUDLeave(CRUDBase[Leave, LeaveCreate, LeaveUpdate]):
             query = query.order_by(Leave.start_date.desc())
 
         items = query.offset(skip).limit(limit).all()
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
 leave = CRUDLeave(Leave)
\ No newline at end of file
@@ -1,10 +1,24 @@
+from typing import Any, Dict, Optional, Union
 from app.crud.base import CRUDBase
 from app.models.role import Permission
 from app.schemas.role import PermissionCreate, PermissionUpdate
+from app.services.principal_cache import principal_cache
 from sqlalchemy.orm import Session
 
 class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
     def get_by_name(self, db: Session, *, name: str) -> Permission | None:
         return db.query(Permission).filter(Permission.name == name).first()
 
+    def update(
+        self, db: Session, *, db_obj: Permission, obj_in: Union[PermissionUpdate, Dict[str, Any]]
+    ) -> Permission:
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        principal_cache.bump_version()
+        return db_obj
+
+    def remove(self, db: Session, *, id: Any) -> Optional[Permission]:
+        obj = super().remove(db, id=id)
+        principal_cache.bump_version()
+        return obj
+
 permission = CRUDPermission(Permission)
@@ -4,6 +4,7 @@ from app import models
 from datetime import date, timedelta
 from typing import List, Dict, Any, Optional
 import calendar
+from app.utils.helpers import date_range_bounds
 
 class CRUDReport:
     def _get_bulk_employee_presence_details(
@@ -20,11 +21,12 @@ class CRUDReport:
         if not employee_ids:
             return {}
 
-        # 1. Fetch all data in bulk
+        # 1. Fetch all data in bulk (half-open range: served by the (employee_id, timestamp) index)
+        range_start, range_end = date_range_bounds(start_date, end_date)
         attendances = db.query(models.Attendance).filter(
             models.Attendance.employee_id.in_(employee_ids),
-            func.date(models.Attendance.timestamp) >= start_date,
-            func.date(models.Attendance.timestamp) <= end_date,
+            models.Attendance.timestamp >= range_start,
+            models.Attendance.timestamp < range_end,
         ).order_by(models.Attendance.timestamp).all()
 
         leaves = db.query(models.Leave).filter(
@@ -1,13 +1,26 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.role import Role, Permission
 from app.schemas.role import RoleCreate, RoleUpdate
+from app.services.principal_cache import principal_cache
 
 class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
     def get_by_name(self, db: Session, *, name: str) -> Role | None:
         return db.query(Role).filter(Role.name == name).first()
 
+    def update(
+        self, db: Session, *, db_obj: Role, obj_in: Union[RoleUpdate, Dict[str, Any]]
+    ) -> Role:
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        principal_cache.bump_version()
+        return db_obj
+
+    def remove(self, db: Session, *, id: Any) -> Optional[Role]:
+        obj = super().remove(db, id=id)
+        principal_cache.bump_version()
+        return obj
+
     def assign_permissions_to_role(
         self, db: Session, *, role: Role, permissions: List[Permission]
     ) -> Role:
@@ -18,6 +31,7 @@ class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
         db.add(role)
         db.commit()
         db.refresh(role)
+        principal_cache.bump_version()
         return role
 
     def revoke_permission_from_role(
@@ -31,6 +45,7 @@ class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
             db.add(role)
             db.commit()
             db.refresh(role)
+            principal_cache.bump_version()
         return role
 
 role = CRUDRole(Role)
@@ -4,6 +4,7 @@ from sqlalchemy import or_, asc, desc
 from app.crud.base import CRUDBase
 from app.models.site import Site
 from app.schemas.site import SiteCreate, SiteUpdate
+from app.services.list_counts import list_counter
 
 class CRUDSite(CRUDBase[Site, SiteCreate, SiteUpdate]):
     def get_multi_paginated(
@@ -14,7 +15,8 @@ class CRUDSite(CRUDBase[Site, SiteCreate, SiteUpdate]):
         limit: int = 100,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         query = db.query(self.model).options(joinedload(Site.organization))
 
@@ -30,7 +32,9 @@ class CRUDSite(CRUDBase[Site, SiteCreate, SiteUpdate]):
                 )
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="sites", filters=(search,), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -47,7 +51,7 @@ class CRUDSite(CRUDBase[Site, SiteCreate, SiteUpdate]):
             query = query.order_by(Site.name)
 
         items = query.offset(skip).limit(limit).all()
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
     def create_with_organization(self, db: Session, *, obj_in: SiteCreate) -> Site:
         # This is a placeholder. The actual creation logic is in the base class.
@@ -1,12 +1,41 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Union
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, asc, desc
+from sqlalchemy import or_, asc, desc, update, values, column, cast, func, case, String, Date, DateTime, Integer
 from app.crud.base import CRUDBase
 from app.models.device import Device, DeviceStatus
+from app.models.organization import Organization
+from app.models.site import Site
 from app.schemas.device import DeviceCreate, DeviceUpdate, DeviceHeartbeatUpdate
+from app.services.badge_directory import badge_directory
+from app.services.list_counts import list_counter
 
 class CRUDDevice(CRUDBase[Device, DeviceCreate, DeviceUpdate]):
+    def create(self, db: Session, *, obj_in: DeviceCreate) -> Device:
+        db_obj = super().create(db, obj_in=obj_in)
+        # Le terminal peut être en cache comme inconnu
+        badge_directory.invalidate_device(db_obj.serial_number)
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Device,
+        obj_in: Union[DeviceUpdate, Dict[str, Any]]
+    ) -> Device:
+        old_serial_number = db_obj.serial_number
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        badge_directory.invalidate_device(old_serial_number, db_obj.serial_number)
+        return db_obj
+
+    def remove(self, db: Session, *, id: Any) -> Optional[Device]:
+        obj = db.query(self.model).get(id)
+        serial_number = obj.serial_number if obj else None
+        obj = super().remove(db, id=id)
+        badge_directory.invalidate_device(serial_number)
+        return obj
+
     def get_by_serial_number(self, db: Session, *, serial_number: str) -> Optional[Device]:
         return db.query(self.model).filter(Device.serial_number == serial_number).first()
 
@@ -14,6 +43,15 @@ class CRUDDevice(CRUDBase[Device, DeviceCreate, DeviceUpdate]):
     def get_by_serial(self, db: Session, *, serial_number: str) -> Optional[Device]:
         return self.get_by_serial_number(db, serial_number=serial_number)
 
+    def get_multi_by_serials(self, db: Session, *, serial_numbers: Iterable[str]) -> List[Device]:
+        """
+        Récupère en une requête tous les devices d'un lot de pointages.
+        """
+        serial_numbers = list(set(serial_numbers))
+        if not serial_numbers:
+            return []
+        return db.query(self.model).filter(Device.serial_number.in_(serial_numbers)).all()
+
     def get_multi_paginated(
         self,
         db: Session,
@@ -23,7 +61,8 @@ class CRUDDevice(CRUDBase[Device, DeviceCreate, DeviceUpdate]):
         organization_id: Optional[str] = None,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         query = db.query(self.model).options(
             joinedload(Device.organization),
@@ -46,7 +85,9 @@ class CRUDDevice(CRUDBase[Device, DeviceCreate, DeviceUpdate]):
                 )
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="devices", filters=(organization_id, search), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -63,7 +104,7 @@ class CRUDDevice(CRUDBase[Device, DeviceCreate, DeviceUpdate]):
             query = query.order_by(Device.serial_number)
 
         items = query.offset(skip).limit(limit).all()
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
     def get_multi_paginated_by_org(
         self, db: Session, *, organization_id: str, skip: int = 0, limit: int = 100
@@ -113,6 +154,124 @@ class CRUDDevice(CRUDBase[Device, DeviceCreate, DeviceUpdate]):
         db.refresh(device)
         return device
 
+    def apply_telemetry_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> int:
+        """
+        Applique la télémétrie de plusieurs devices en un seul
+        UPDATE ... FROM (VALUES ...). Passe les devices concernés à ONLINE.
+
+        Chaque ligne contient: id, last_seen_at, firmware_version,
+        battery_level, wifi_rssi (None = valeur inchangée).
+        Retourne le nombre de devices mis à jour.
+        """
+        if not rows:
+            return 0
+
+        telemetry = values(
+            column("id", String),
+            column("last_seen_at", DateTime(timezone=True)),
+            column("firmware_version", String),
+            column("battery_level", Integer),
+            column("wifi_rssi", Integer),
+            name="telemetry",
+        ).data([
+            (
+                row["id"],
+                row["last_seen_at"],
+                row.get("firmware_version"),
+                row.get("battery_level"),
+                row.get("wifi_rssi"),
+            )
+            for row in rows
+        ])
+
+        result = db.execute(
+            update(Device)
+            .where(Device.id == telemetry.c.id)
+            .values(
+                status=DeviceStatus.ONLINE,
+                # GREATEST ignore les NULL (device jamais vu)
+                last_seen_at=func.greatest(
+                    Device.last_seen_at, cast(telemetry.c.last_seen_at, DateTime(timezone=True))
+                ),
+                firmware_version=func.coalesce(
+                    cast(telemetry.c.firmware_version, String), Device.firmware_version
+                ),
+                battery_level=func.coalesce(
+                    cast(telemetry.c.battery_level, Integer), Device.battery_level
+                ),
+                wifi_rssi=func.coalesce(
+                    cast(telemetry.c.wifi_rssi, Integer), Device.wifi_rssi
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def apply_attendance_stats_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> int:
+        """
+        Applique les statistiques de pointage de plusieurs devices en un seul
+        UPDATE ... FROM (VALUES ...).
+
+        Chaque ligne contient: id, day (jour local du device), count (pointages
+        de ce jour à ajouter) et last_attendance_at. Le compteur repart de
+        `count` quand le jour change ; les pointages d'un jour antérieur au
+        compteur courant ne le modifient pas.
+        Retourne le nombre de devices mis à jour.
+        """
+        if not rows:
+            return 0
+
+        stats = values(
+            column("id", String),
+            column("day", Date),
+            column("count", Integer),
+            column("last_attendance_at", DateTime(timezone=True)),
+            name="stats",
+        ).data([
+            (row["id"], row["day"], row["count"], row["last_attendance_at"])
+            for row in rows
+        ])
+        day = cast(stats.c.day, Date)
+        count = cast(stats.c.count, Integer)
+
+        result = db.execute(
+            update(Device)
+            .where(Device.id == stats.c.id)
+            .values(
+                attendance_count=case(
+                    (Device.attendance_count_day == day, Device.attendance_count + count),
+                    (or_(Device.attendance_count_day.is_(None), Device.attendance_count_day < day), count),
+                    else_=Device.attendance_count,
+                ),
+                # GREATEST ignore les NULL (premier pointage)
+                attendance_count_day=func.greatest(Device.attendance_count_day, day),
+                last_attendance_at=func.greatest(
+                    Device.last_attendance_at, cast(stats.c.last_attendance_at, DateTime(timezone=True))
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def get_timezones(self, db: Session, *, device_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Fuseau horaire de chaque device : celui de son site, sinon celui de
+        son organisation, sinon UTC.
+        """
+        device_ids = list(set(device_ids))
+        if not device_ids:
+            return {}
+        rows = (
+            db.query(Device.id, func.coalesce(Site.timezone, Organization.timezone, "UTC"))
+            .join(Organization, Device.organization_id == Organization.id)
+            .outerjoin(Site, Device.site_id == Site.id)
+            .filter(Device.id.in_(device_ids))
+            .all()
+        )
+        return dict(rows)
+
     def get_stale_devices(
         self,
         db: Session,
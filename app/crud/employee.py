@@ -1,15 +1,57 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Iterable, Union
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_, asc, desc
 from app.crud.base import CRUDBase
 from app.models.employee import Employee
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate
+from app.services.badge_directory import badge_directory
+from app.services.principal_cache import principal_cache
+from app.services.list_counts import list_counter
 
 class CRUDEmployee(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
     def get_by_badge(self, db: Session, *, badge_id: str) -> Optional[Employee]:
         """Get employee by badge ID (used by MQTT client for attendance)"""
         return db.query(self.model).filter(Employee.badge_id == badge_id).first()
 
+    def get_multi_by_badges(self, db: Session, *, badge_ids: Iterable[str]) -> List[Employee]:
+        """
+        Récupère en une requête tous les employés d'un lot de badges.
+        """
+        badge_ids = list(set(badge_ids))
+        if not badge_ids:
+            return []
+        return db.query(self.model).filter(Employee.badge_id.in_(badge_ids)).all()
+
+    def create(self, db: Session, *, obj_in: EmployeeCreate) -> Employee:
+        db_obj = super().create(db, obj_in=obj_in)
+        # Le badge peut être en cache comme inconnu
+        badge_directory.invalidate_badge(db_obj.badge_id)
+        principal_cache.invalidate(db_obj.user_id)
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Employee,
+        obj_in: Union[EmployeeUpdate, Dict[str, Any]]
+    ) -> Employee:
+        old_badge_id = db_obj.badge_id
+        old_user_id = db_obj.user_id
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        badge_directory.invalidate_badge(old_badge_id, db_obj.badge_id)
+        principal_cache.invalidate(old_user_id, db_obj.user_id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: Any) -> Optional[Employee]:
+        obj = db.query(self.model).get(id)
+        badge_id = obj.badge_id if obj else None
+        user_id = obj.user_id if obj else None
+        obj = super().remove(db, id=id)
+        badge_directory.invalidate_badge(badge_id)
+        principal_cache.invalidate(user_id)
+        return obj
+
     def get_multi_paginated(
         self,
         db: Session,
@@ -19,7 +61,8 @@ class CRUDEmployee(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
         organization_id: Optional[str] = None,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
 
         query = (
@@ -49,7 +92,9 @@ class CRUDEmployee(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
                 )
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="employees", filters=(organization_id, search), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -70,7 +115,7 @@ class CRUDEmployee(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
 
         items = query.offset(skip).limit(limit).all()
 
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
     def get_multi_by_organization(
         self, db: Session, *, organization_id: str, skip: int = 0, limit: int = 100
@@ -4,6 +4,7 @@ from sqlalchemy import or_, asc, desc
 from app.crud.base import CRUDBase
 from app.models.organization import Organization
 from app.schemas.organization import OrganizationCreate, OrganizationUpdate
+from app.services.list_counts import list_counter
 
 class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUpdate]):
     def get_multi_paginated(
@@ -14,7 +15,8 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
         limit: int = 100,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         query = db.query(self.model)
 
@@ -30,7 +32,9 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
                 )
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="organizations", filters=(search,), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -47,6 +51,6 @@ class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationUp
             query = query.order_by(Organization.name)
 
         items = query.offset(skip).limit(limit).all()
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
 organization = CRUDOrganization(Organization)
\ No newline at end of file
@@ -1,15 +1,29 @@
 from typing import Any, Dict, Optional, Union
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import or_, asc, desc
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.models.role import Role
+from app.services.principal_cache import principal_cache
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.list_counts import list_counter
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(self.model).filter(User.email == email).first()
 
+    def get_with_permissions(self, db: Session, *, id: Any) -> Optional[User]:
+        """Charge un utilisateur avec ses rôles, leurs permissions et son employé."""
+        return (
+            db.query(self.model)
+            .options(
+                selectinload(User.roles).selectinload(Role.permissions),
+                joinedload(User.employee),
+            )
+            .filter(User.id == id)
+            .first()
+        )
+
     def get_multi_paginated(
         self,
         db: Session,
@@ -18,7 +32,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         limit: int = 100,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         query = db.query(self.model).options(
             joinedload(User.organization),
@@ -36,7 +51,9 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 )
             )
 
-        total = query.count()
+        total, total_kind = list_counter.count(
+            db, query, resource="users", filters=(search,), include_total=include_total
+        )
 
         # Sort functionality
         if sort_by:
@@ -53,7 +70,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             query = query.order_by(User.email)
 
         items = query.offset(skip).limit(limit).all()
-        return {"items": items, "total": total}
+        return {"items": items, "total": total, "total_kind": total_kind}
 
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         from app.core.security import get_password_hash
@@ -80,7 +97,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
 
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate(db_obj.id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: Any) -> Optional[User]:
+        obj = super().remove(db, id=id)
+        principal_cache.invalidate(id)
+        return obj
 
     def is_superuser(self, user: User) -> bool:
         return user.is_superuser
@@ -90,6 +114,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db.add(user)
         db.commit()
         db.refresh(user)
+        principal_cache.bump_version()
         return user
 
     def count_by_organization(self, db: Session, *, organization_id: str) -> int:
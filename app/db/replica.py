@@ -0,0 +1,128 @@
+"""
+Routage des lectures vers la réplique.
+
+Les sessions en lecture sont ouvertes sur la réplique (READ_REPLICA_URL)
+tant que son retard de réplication reste sous READ_REPLICA_MAX_LAG_SECONDS ;
+au-delà, si la réplique est injoignable ou si elle ne reçoit plus le WAL de
+la primaire (réplication en streaming interrompue), elles repassent sur la
+base primaire. Le retard est mesuré au plus une fois toutes les
+READ_REPLICA_LAG_CHECK_SECONDS secondes, pas à chaque requête.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import ReadSessionLocal, SessionLocal, read_engine
+
+logger = logging.getLogger(__name__)
+
+# NULL si la réplique ne reçoit plus le WAL en continu (elle a alors rejoué
+# tout ce qu'elle a reçu et paraîtrait à jour), 0 si elle a rejoué tout ce
+# qu'elle a reçu (pas d'écriture récente), sinon l'ancienneté de la dernière
+# transaction rejouée
+REPLICATION_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaRouter:
+    """
+    Choisit la base (réplique ou primaire) des sessions en lecture.
+    Thread-safe : utilisé depuis les threads des endpoints synchrones.
+    """
+
+    def __init__(self, max_lag_seconds: float = 30.0, check_interval_seconds: float = 5.0):
+        """
+        Initialise le routeur.
+
+        Args:
+            max_lag_seconds: Retard maximal toléré (en secondes)
+            check_interval_seconds: Durée de validité d'une mesure du retard
+        """
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._healthy = False
+        self.lag_seconds: Optional[float] = None
+
+        # Statistiques
+        self.replica_sessions = 0
+        self.primary_fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return ReadSessionLocal is not None
+
+    def _measure_lag(self) -> Optional[float]:
+        try:
+            with read_engine.connect() as conn:
+                lag = conn.execute(REPLICATION_LAG_QUERY).scalar()
+        except Exception as e:
+            logger.warning(f"Réplique en lecture injoignable: {e}")
+            return None
+        if lag is None:
+            logger.warning("Réplique en lecture déconnectée de la primaire (WAL non reçu en continu)")
+            return None
+        return float(lag)
+
+    def replica_available(self) -> bool:
+        """Indique si la réplique est joignable et suffisamment à jour."""
+        if not self.enabled:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.check_interval_seconds:
+                return self._healthy
+            # Les autres threads gardent l'ancien état pendant la mesure
+            self._checked_at = now
+
+        lag = self._measure_lag()
+        healthy = lag is not None and lag <= self.max_lag_seconds
+        with self._lock:
+            if self._healthy and not healthy:
+                logger.warning(
+                    f"Réplique en retard ({lag if lag is not None else 'injoignable ou déconnectée'} s), "
+                    f"lectures redirigées vers la base primaire"
+                )
+            self.lag_seconds = lag
+            self._healthy = healthy
+        return healthy
+
+    def session(self) -> Session:
+        """Ouvre une session en lecture sur la réplique, ou sur la primaire en repli."""
+        if self.replica_available():
+            self.replica_sessions += 1
+            return ReadSessionLocal()
+        if self.enabled:
+            self.primary_fallbacks += 1
+        return SessionLocal()
+
+    def get_stats(self) -> dict:
+        """Retourne l'état de la réplique."""
+        return {
+            "enabled": self.enabled,
+            "healthy": self._healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "replica_sessions": self.replica_sessions,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+# Instance globale du routeur des lectures
+replica_router = ReplicaRouter(
+    max_lag_seconds=settings.READ_REPLICA_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.READ_REPLICA_LAG_CHECK_SECONDS,
+)
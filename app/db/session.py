@@ -14,6 +14,19 @@ engine = create_engine(
 # Session locale
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Réplique en lecture (optionnelle) : pool séparé, les rapports et tableaux
+# de bord ne prennent plus les connexions de l'ingestion des pointages
+read_engine = create_engine(
+    settings.READ_REPLICA_URL,
+    pool_pre_ping=True,
+    pool_size=settings.READ_REPLICA_POOL_SIZE,
+    max_overflow=settings.READ_REPLICA_MAX_OVERFLOW
+) if settings.READ_REPLICA_URL else None
+
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
+)
+
 # Base pour les modèles
 Base = declarative_base()
 
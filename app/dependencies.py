@@ -1,4 +1,4 @@
-from typing import Generator, Optional, List, Set
+from typing import Generator, Optional, List
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
@@ -7,9 +7,11 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.db.session import SessionLocal
+from app.db.replica import replica_router
 from app.schemas.token import TokenPayload
 from app.crud.user import user as crud_user
 from app.models.user import User
+from app.services.principal_cache import Principal, principal_cache
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
@@ -22,6 +24,17 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+def get_read_db() -> Generator:
+    """
+    Session en lecture seule pour les rapports et tableaux de bord : ouverte
+    sur la réplique si elle est configurée et à jour, sinon sur la primaire.
+    """
+    db = replica_router.session()
+    try:
+        yield db
+    finally:
+        db.close()
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> User:
@@ -56,29 +69,51 @@ def get_current_active_superuser(
     return current_user
 
 
+def get_current_principal(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> Principal:
+    """
+    Resolves the authenticated user from the principal cache (no query
+    when the entry is cached: the session is never used).
+    """
+    try:
+        from app.core.security import decode_token
+        payload = decode_token(token, db)
+        token_data = TokenPayload(**payload)
+    except (jwt.JWTError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    principal = principal_cache.get(db, token_data.sub)
+    if not principal:
+        raise HTTPException(status_code=404, detail="User not found")
+    return principal
+
+def get_current_active_principal(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+    return principal
+
+
 class PermissionChecker:
     """
     Dependency that checks if the user has the required permissions.
+    The check is an in-memory set lookup on the cached principal.
     """
 
     def __init__(self, required_permissions: List[str]):
-        self.required_permissions = set(required_permissions)
-
-    def __call__(self, user: User = Depends(get_current_active_user)) -> User:
-        user_permissions: Set[str] = set()
-        for role in user.roles:
-            for permission in role.permissions:
-                user_permissions.add(permission.name)
-
-        if user.is_superuser:
-            return user
+        self.required_permissions = frozenset(required_permissions)
 
-        if not self.required_permissions.issubset(user_permissions):
+    def __call__(self, principal: Principal = Depends(get_current_active_principal)) -> Principal:
+        if not principal.has_permissions(self.required_permissions):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Permissions insuffisantes pour effectuer cette action.",
             )
-        return user
+        return principal
 
 
 def require_role(required_role: str):
@@ -7,6 +7,8 @@ import time
 from app.config import settings
 from app.api.v1.api import api_router
 from app.db.session import engine, Base
+from app.middleware.rate_limit import RateLimitMiddleware, default_rules
+from app.services.password_hasher import PasswordHasherBusy
 
 # Créer les tables (en développement - en production utiliser Alembic)
 Base.metadata.create_all(bind=engine)
@@ -41,6 +43,18 @@ app = FastAPI(
     openapi_tags=tags_metadata,
 )
 
+# Limitation du débit (par utilisateur, clé d'API ou IP)
+# Ajouté avant CORS pour que les réponses 429 portent les en-têtes CORS
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        default_limit_per_minute=settings.RATE_LIMIT_PER_MINUTE,
+        rules=default_rules(),
+        exempt_paths=("/health", "/docs", "/redoc", f"{settings.API_V1_PREFIX}/openapi.json"),
+        backend=settings.RATE_LIMIT_BACKEND,
+    )
+
+
 # Configuration CORS
 app.add_middleware(
     CORSMiddleware,
@@ -73,6 +87,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+# Pool de hachage des mots de passe saturé (rafale de logins)
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # Gestionnaire d'erreurs de base de données
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
@@ -117,9 +141,20 @@ def root():
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+from app.db.session import SessionLocal
 from app.services.mqtt_client import mqtt_client
+from app.services.badge_directory import badge_directory
+from app.services.device_telemetry import device_telemetry
+from app.websocket.connection_manager import manager
+from app.websocket.event_bridge import realtime_bridge
 from app.services.token_cleanup import token_cleanup_service
+from app.services.token_revocation import token_revocation
 from app.services.device_status_monitor import device_status_monitor
+from app.services.attendance_partitions import attendance_partitions
+from app.services.counter_reconciliation import counter_reconciliation
+from app.services.device_stats import device_stats
+from app.services.dashboard_snapshots import dashboard_snapshots
+from app.services.daily_presence import daily_presence_tracker
 
 # Événement de démarrage
 @app.on_event("startup")
@@ -130,12 +165,37 @@ async def startup_event():
     print(f"{settings.PROJECT_NAME} v{settings.VERSION} démarré")
     print(f"Documentation disponible sur: /docs")
     print(f"Mode Debug: {settings.DEBUG}")
+    # Précharger l'annuaire des badges et terminaux (validation des pointages)
+    with SessionLocal() as db:
+        badge_directory.warm(db)
+        # Charger la liste des tokens révoqués (vérification sans requête SQL)
+        token_revocation.load(db)
+        # Créer les partitions mensuelles des pointages avant l'arrivée des pointages
+        attendance_partitions.maintain(db)
+    # Synchroniser les révocations faites par les autres workers
+    token_revocation.start()
+    # Brancher le backplane de diffusion entre workers
+    await manager.start()
+    # Démarrer le pont MQTT -> WebSocket sur la boucle de l'application
+    realtime_bridge.start()
+    # Démarrer l'écriture différée de la télémétrie des devices
+    device_telemetry.start()
+    # Démarrer l'écriture différée des statistiques de pointage des devices
+    device_stats.start()
+    # Démarrer l'écriture différée des présences du jour
+    daily_presence_tracker.start()
     # Démarrer le client MQTT
     mqtt_client.start()
     # Démarrer le service de nettoyage des tokens expirés
     token_cleanup_service.start()
     # Démarrer le service de surveillance des devices (heartbeat)
     device_status_monitor.start()
+    # Démarrer la maintenance des partitions de pointages
+    attendance_partitions.start()
+    # Démarrer la réconciliation des compteurs dénormalisés
+    counter_reconciliation.start()
+    # Démarrer le recalcul des instantanés de tableaux de bord
+    dashboard_snapshots.start()
 
 
 # Événement d'arrêt
@@ -146,8 +206,25 @@ async def shutdown_event():
     """
     # Arrêter le client MQTT
     mqtt_client.stop()
+    # Écrire la télémétrie des devices encore en attente
+    await device_telemetry.stop()
+    # Écrire les statistiques de pointage encore en attente
+    await device_stats.stop()
+    # Écrire les présences du jour encore en attente
+    await daily_presence_tracker.stop()
+    # Arrêter le pont temps réel
+    await realtime_bridge.stop()
+    await manager.stop()
+    # Arrêter la synchronisation des révocations
+    await token_revocation.stop()
     # Arrêter le service de nettoyage des tokens
     await token_cleanup_service.stop()
     # Arrêter le service de surveillance des devices
     await device_status_monitor.stop()
+    # Arrêter la maintenance des partitions de pointages
+    await attendance_partitions.stop()
+    # Arrêter la réconciliation des compteurs
+    await counter_reconciliation.stop()
+    # Arrêter le recalcul des instantanés de tableaux de bord
+    await dashboard_snapshots.stop()
     print(f"{settings.PROJECT_NAME} arrêté")
\ No newline at end of file
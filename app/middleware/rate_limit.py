@@ -0,0 +1,226 @@
+"""
+Limitation du débit des requêtes HTTP (token bucket).
+
+Chaque client dispose d'un seau de `limit` jetons rempli en continu
+(`limit` jetons par minute) ; une requête consomme un jeton, un seau vide
+donne une réponse 429 avec l'en-tête Retry-After.
+
+- Clé du client : l'utilisateur (token JWT valide), sinon la clé d'API
+  (en-tête X-API-Key), sinon l'adresse IP (lancer uvicorn avec
+  --proxy-headers derrière un reverse proxy)
+- Règles par route : plus strictes pour /auth/login et les téléchargements
+  de rapports, chaque règle ayant ses propres seaux
+- Compteurs en mémoire répartis sur plusieurs verrous (lock striping) ;
+  backend Redis optionnel (fenêtre fixe d'une minute) pour partager les
+  compteurs entre workers
+"""
+import hashlib
+import json
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from jose import JWTError, jwt
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITED_BODY = json.dumps({"detail": "Trop de requêtes, réessayez plus tard"}).encode()
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Limite appliquée aux chemins correspondant à `pattern`."""
+    name: str
+    pattern: Pattern
+    limit_per_minute: int
+    methods: Optional[Tuple[str, ...]] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.methods is None or method in self.methods) and bool(self.pattern.match(path))
+
+
+class InMemoryRateLimiter:
+    """
+    Seaux à jetons en mémoire, répartis sur `stripes` verrous pour limiter
+    la contention entre threads.
+    """
+
+    def __init__(self, stripes: int = 64, max_keys_per_stripe: int = 10000):
+        self.stripes = stripes
+        self.max_keys_per_stripe = max_keys_per_stripe
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._buckets: List[Dict[str, List[float]]] = [{} for _ in range(stripes)]
+
+    def _prune(self, buckets: Dict[str, List[float]], now: float):
+        """Oublie les seaux redevenus pleins (clients inactifs)."""
+        for key in [
+            k for k, (tokens, ts, limit) in buckets.items()
+            if tokens + (now - ts) * limit / 60.0 >= limit
+        ]:
+            del buckets[key]
+
+    async def hit(self, key: str, limit_per_minute: int) -> Tuple[bool, int]:
+        """
+        Consomme un jeton.
+
+        Returns:
+            (autorisé, délai en secondes avant le prochain jeton si refusé)
+        """
+        rate = limit_per_minute / 60.0
+        now = time.monotonic()
+        stripe = hash(key) % self.stripes
+
+        with self._locks[stripe]:
+            buckets = self._buckets[stripe]
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self.max_keys_per_stripe:
+                    self._prune(buckets, now)
+                bucket = buckets[key] = [float(limit_per_minute), now, limit_per_minute]
+
+            tokens = min(float(limit_per_minute), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return True, 0
+            bucket[0] = tokens
+            return False, max(1, math.ceil((1.0 - tokens) / rate))
+
+
+class RedisRateLimiter:
+    """
+    Compteurs partagés entre workers dans Redis (fenêtre fixe d'une minute).
+    En cas d'indisponibilité de Redis, les requêtes sont autorisées.
+    """
+
+    def __init__(self, url: str, prefix: str = "kuilinga:ratelimit"):
+        import redis.asyncio as aioredis
+
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url)
+
+    async def hit(self, key: str, limit_per_minute: int) -> Tuple[bool, int]:
+        now = time.time()
+        window = int(now // 60)
+        redis_key = f"{self.prefix}:{key}:{window}"
+        try:
+            pipe = self._redis.pipeline()
+            pipe.incr(redis_key)
+            pipe.expire(redis_key, 61)
+            count, _ = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Rate limiter Redis indisponible: {e}")
+            return True, 0
+        if count <= limit_per_minute:
+            return True, 0
+        return False, max(1, math.ceil((window + 1) * 60 - now))
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI de limitation du débit.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_limit_per_minute: int,
+        rules: List[RateLimitRule],
+        exempt_paths: Tuple[str, ...] = (),
+        backend: str = "memory",
+        token_cache_size: int = 10000,
+    ):
+        self.app = app
+        self.default_limit_per_minute = default_limit_per_minute
+        self.rules = rules
+        self.exempt_paths = exempt_paths
+        self.limiter = RedisRateLimiter(settings.REDIS_URL) if backend == "redis" else InMemoryRateLimiter()
+        self.token_cache_size = token_cache_size
+        # token -> identifiant de l'utilisateur (évite de revérifier la signature)
+        self._token_subjects: Dict[str, Optional[str]] = {}
+
+    def _user_from_token(self, token: str) -> Optional[str]:
+        if token in self._token_subjects:
+            return self._token_subjects[token]
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            subject = payload.get("sub")
+        except JWTError:
+            subject = None
+        if len(self._token_subjects) >= self.token_cache_size:
+            self._token_subjects.clear()
+        self._token_subjects[token] = subject
+        return subject
+
+    def _client_key(self, scope: Scope) -> str:
+        headers = dict(scope.get("headers") or ())
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if authorization[:7].lower() == "bearer ":
+            user_id = self._user_from_token(authorization[7:])
+            if user_id:
+                return f"user:{user_id}"
+        api_key = headers.get(b"x-api-key")
+        if api_key:
+            return f"key:{hashlib.sha256(api_key).hexdigest()[:32]}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    def _limit_for(self, method: str, path: str) -> Tuple[str, int]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule.name, rule.limit_per_minute
+        return "default", self.default_limit_per_minute
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path.startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        rule_name, limit = self._limit_for(scope["method"], path)
+        allowed, retry_after = await self.limiter.hit(f"{rule_name}:{self._client_key(scope)}", limit)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = RATE_LIMITED_BODY
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+                (b"x-ratelimit-limit", str(limit).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def default_rules() -> List[RateLimitRule]:
+    """Règles par route configurées dans les paramètres."""
+    prefix = re.escape(settings.API_V1_PREFIX)
+    return [
+        RateLimitRule(
+            name="login",
+            pattern=re.compile(rf"^{prefix}/auth/login/?$"),
+            limit_per_minute=settings.RATE_LIMIT_LOGIN_PER_MINUTE,
+            methods=("POST",),
+        ),
+        RateLimitRule(
+            name="report_download",
+            pattern=re.compile(rf"^{prefix}/reports/.+/download/?$"),
+            limit_per_minute=settings.RATE_LIMIT_REPORT_DOWNLOAD_PER_MINUTE,
+        ),
+    ]
@@ -1,5 +1,6 @@
 from .attendance import Attendance, AttendanceType
 from .blacklisted_token import BlacklistedToken
+from .daily_presence import DailyPresenceCount
 from .department import Department
 from .device import Device
 from .employee import Employee
@@ -9,3 +10,4 @@ from .role import Role, Permission
 # from .shift import Shift
 from .user import User
 from .site import Site
+from . import counters  # Maintenance des compteurs dénormalisés
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, DateTime, String, JSON, Enum, ForeignKey
+from sqlalchemy import Column, DateTime, String, JSON, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -9,8 +9,18 @@ class AttendanceType(str, enum.Enum):
 
 class Attendance(BaseModel):
     __tablename__ = "attendances"
+    __table_args__ = (
+        # Pagination par curseur (timestamp, id), globale et par employé
+        Index("ix_attendances_timestamp_id", "timestamp", "id"),
+        Index("ix_attendances_employee_id_timestamp_id", "employee_id", "timestamp", "id"),
+        # Filtres par terminal sur une plage horaire (pointages du jour d'un terminal)
+        Index("ix_attendances_device_id_timestamp", "device_id", "timestamp"),
+        # Partitions mensuelles (voir app/services/attendance_partitions.py)
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
-    timestamp = Column(DateTime(timezone=True), nullable=False)
+    # La clé de partitionnement fait partie de la clé primaire (id, timestamp)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     type = Column(Enum(AttendanceType), nullable=False)
     geo = Column(String, nullable=True)
     extra_data = Column(JSON, nullable=True)
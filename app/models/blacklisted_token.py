@@ -7,13 +7,14 @@ class BlacklistedToken(BaseModel):
     """
     Model pour stocker les tokens JWT invalidés (blacklist).
     Les tokens sont ajoutés ici lors du logout pour empêcher leur réutilisation.
+    Un token est identifié par son `jti` (ou l'empreinte SHA-256 des tokens sans jti).
     """
     __tablename__ = "blacklisted_tokens"
 
-    token = Column(String, unique=True, index=True, nullable=False)
-    blacklisted_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    expires_at = Column(DateTime, nullable=False)
+    token_id = Column(String(64), unique=True, index=True, nullable=False)
+    blacklisted_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
     user_id = Column(String, nullable=True)  # Optional: pour tracer quel utilisateur a déconnecté
 
     def __repr__(self):
-        return f"<BlacklistedToken {self.token[:20]}... blacklisted at {self.blacklisted_on}>"
+        return f"<BlacklistedToken {self.token_id} blacklisted at {self.blacklisted_on}>"
@@ -0,0 +1,84 @@
+"""
+Compteurs dénormalisés (counter cache) des organisations, sites et départements.
+
+Chaque compteur est une colonne entière du parent (ex. `sites.employees_count`)
+tenue à jour dans la transaction qui crée, rattache ou supprime l'enfant :
+les événements ORM émettent un `UPDATE parent SET compteur = compteur ± 1`
+atomique. Les écritures hors ORM (SQL brut, suppressions en masse) ne sont
+pas suivies : le service counter_reconciliation recalcule régulièrement les
+compteurs et corrige les écarts.
+"""
+from collections import namedtuple
+
+from sqlalchemy import event, inspect
+
+from .department import Department
+from .device import Device
+from .employee import Employee
+from .organization import Organization
+from .site import Site
+from .user import User
+
+CounterCache = namedtuple("CounterCache", ["child", "foreign_key", "parent", "column"])
+
+COUNTER_CACHES = [
+    CounterCache(Site, "organization_id", Organization, "sites_count"),
+    CounterCache(Employee, "organization_id", Organization, "employees_count"),
+    CounterCache(User, "organization_id", Organization, "users_count"),
+    CounterCache(Device, "organization_id", Organization, "devices_count"),
+    CounterCache(Department, "site_id", Site, "departments_count"),
+    CounterCache(Employee, "site_id", Site, "employees_count"),
+    CounterCache(Device, "site_id", Site, "devices_count"),
+    CounterCache(Employee, "department_id", Department, "employees_count"),
+]
+
+
+def _increment(connection, counter: CounterCache, parent_id, delta: int):
+    if parent_id is None:
+        return
+    table = counter.parent.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == parent_id)
+        .values({counter.column: table.c[counter.column] + delta})
+    )
+
+
+def _keep_previous(target, value, oldvalue, initiator):
+    """Écouteur vide : sa présence active `active_history` sur la clé étrangère."""
+    return value
+
+
+def _register(child, counters):
+    # Sans active_history, une clé étrangère expirée (ex. après un commit) est
+    # modifiée sans que son ancienne valeur soit chargée : l'historique n'a
+    # alors rien dans `deleted` et l'ancien parent ne serait jamais décrémenté
+    for foreign_key in {counter.foreign_key for counter in counters}:
+        event.listen(getattr(child, foreign_key), "set", _keep_previous, active_history=True, retval=True)
+
+    @event.listens_for(child, "after_insert")
+    def after_insert(mapper, connection, target):
+        for counter in counters:
+            _increment(connection, counter, getattr(target, counter.foreign_key), 1)
+
+    @event.listens_for(child, "after_delete")
+    def after_delete(mapper, connection, target):
+        for counter in counters:
+            _increment(connection, counter, getattr(target, counter.foreign_key), -1)
+
+    @event.listens_for(child, "after_update")
+    def after_update(mapper, connection, target):
+        state = inspect(target)
+        for counter in counters:
+            history = state.attrs[counter.foreign_key].history
+            if not history.has_changes():
+                continue
+            previous = history.deleted[0] if history.deleted else None
+            current = getattr(target, counter.foreign_key)
+            if previous != current:
+                _increment(connection, counter, previous, -1)
+                _increment(connection, counter, current, 1)
+
+
+for _child in {counter.child for counter in COUNTER_CACHES}:
+    _register(_child, [counter for counter in COUNTER_CACHES if counter.child is _child])
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String, UniqueConstraint
+from .base import BaseModel
+
+# Valeur de site_id des employés sans site (la contrainte d'unicité ne
+# distingue pas les NULL)
+NO_SITE = ""
+
+
+class DailyPresenceCount(BaseModel):
+    """
+    Présences par organisation, site et jour local de l'organisation
+    (voir app/services/daily_presence.py).
+    """
+    __tablename__ = "daily_presence_counts"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "day", "site_id", name="uq_daily_presence_counts_org_day_site"),
+        # Pointages du jour de toutes les organisations
+        Index("ix_daily_presence_counts_day", "day"),
+    )
+
+    organization_id = Column(String, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    site_id = Column(
+        String,
+        nullable=False,
+        default=NO_SITE,
+        server_default=NO_SITE,
+        comment="Site des employés comptés ('' = sans site)",
+    )
+    day = Column(Date, nullable=False, comment="Jour dans le fuseau horaire de l'organisation")
+    present_count = Column(
+        Integer, nullable=False, default=0, server_default="0",
+        comment="Nombre d'employés distincts ayant pointé ce jour",
+    )
+    attendance_count = Column(
+        Integer, nullable=False, default=0, server_default="0",
+        comment="Nombre de pointages ce jour",
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -10,6 +10,9 @@ class Department(BaseModel):
     site_id = Column(String, ForeignKey("sites.id"), nullable=False)
     manager_id = Column(String, ForeignKey("employees.id"), nullable=True)
 
+    # Compteur dénormalisé (voir app/models/counters.py)
+    employees_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     site = relationship("Site", back_populates="departments")
     manager = relationship("Employee", foreign_keys=[manager_id])
     employees = relationship(
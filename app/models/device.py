@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, String, Enum, ForeignKey, DateTime, Integer, Float
+from sqlalchemy import Column, String, Enum, ForeignKey, Date, DateTime, Integer, Float
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -51,6 +51,25 @@ class Device(BaseModel):
         comment="Force du signal WiFi en dBm (ex: -45)"
     )
 
+    # Statistiques de pointage (écriture différée, voir device_stats)
+    last_attendance_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Horodatage du dernier pointage enregistré"
+    )
+    attendance_count_day = Column(
+        Date,
+        nullable=True,
+        comment="Jour (fuseau du site) auquel se rapporte attendance_count"
+    )
+    attendance_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Nombre de pointages du jour attendance_count_day"
+    )
+
     organization_id = Column(String, ForeignKey("organizations.id"), nullable=False)
     site_id = Column(String, ForeignKey("sites.id"), nullable=True)
 
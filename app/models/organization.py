@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, JSON
+from sqlalchemy import Column, String, Boolean, Integer, JSON
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from .site import Site
@@ -15,6 +15,12 @@ class Organization(BaseModel):
     is_active = Column(Boolean, default=True)
     settings = Column(JSON, nullable=True)
 
+    # Compteurs dénormalisés (voir app/models/counters.py)
+    sites_count = Column(Integer, nullable=False, default=0, server_default="0")
+    employees_count = Column(Integer, nullable=False, default=0, server_default="0")
+    users_count = Column(Integer, nullable=False, default=0, server_default="0")
+    devices_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     users = relationship("User", back_populates="organization")
     sites = relationship("Site", back_populates="organization", cascade="all, delete-orphan")
     employees = relationship("Employee", back_populates="organization", cascade="all, delete-orphan")
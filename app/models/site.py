@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -11,6 +11,11 @@ class Site(BaseModel):
 
     organization_id = Column(String, ForeignKey("organizations.id"), nullable=False)
 
+    # Compteurs dénormalisés (voir app/models/counters.py)
+    departments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    employees_count = Column(Integer, nullable=False, default=0, server_default="0")
+    devices_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     organization = relationship("Organization", back_populates="sites")
     employees = relationship("Employee", back_populates="site")
     departments = relationship("Department", back_populates="site", cascade="all, delete-orphan")
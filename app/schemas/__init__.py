@@ -62,7 +62,7 @@ from .report import (
 )
 from .role import Role, RoleCreate, RoleUpdate, Permission, PermissionCreate, PermissionUpdate
 from .shift import Shift, ShiftCreate, ShiftUpdate
-from .token import Token, TokenPayload, RefreshTokenRequest
+from .token import Token, TokenPayload, RefreshTokenRequest, UserInLogin
 from .user import User, UserCreate, UserUpdate, PasswordChange, AvatarUploadResponse
 from .site import Site, SiteCreate, SiteUpdate
 from .leave import Leave, LeaveCreate, LeaveUpdate
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Optional
 from pydantic import BaseModel, Field
 
 T = TypeVar('T')
@@ -6,6 +6,8 @@ T = TypeVar('T')
 class PaginatedResponse(BaseModel, Generic[T]):
     """Réponse paginée générique pour les listes d'éléments."""
     items: List[T] = Field(..., description="Liste des éléments de la page courante")
-    total: int = Field(..., description="Nombre total d'éléments disponibles")
+    total: Optional[int] = Field(..., description="Nombre total d'éléments disponibles (null si non calculé)")
+    total_kind: Optional[str] = Field(None, description="Type du total : exact, cached (mis en cache) ou estimate (estimation du planificateur)")
     skip: int = Field(..., description="Nombre d'éléments sautés (offset)")
-    limit: int = Field(..., description="Nombre maximum d'éléments par page")
\ No newline at end of file
+    limit: int = Field(..., description="Nombre maximum d'éléments par page")
+    next_cursor: Optional[str] = Field(None, description="Curseur de la page suivante (pagination par curseur, null en fin de liste)")
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+File d'ingestion des pointages reçus via MQTT.
+
+Les callbacks paho s'exécutent sur le thread réseau MQTT : y faire des
+allers-retours en base bloque la réception des messages suivants. Ce module
+découple la réception de l'écriture :
+
+- `on_message` dépose chaque pointage dans une file bornée (submit)
+- un thread dédié regroupe les pointages en lots (taille max / attente max)
+- le lot est confié à un handler qui valide et écrit en une seule transaction
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestItem:
+    """Un pointage en attente d'écriture."""
+    device_serial: str
+    badge_id: str
+    data: dict
+    received_at: datetime = field(default_factory=datetime.now)
+
+
+class AttendanceIngestQueue:
+    """
+    File bornée + thread de vidage par lots pour les pointages MQTT.
+
+    Un lot est transmis au handler dès qu'il atteint `batch_size` éléments
+    ou que le plus ancien élément a attendu `max_linger_ms` millisecondes.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 200,
+        max_linger_ms: int = 50,
+        put_timeout_seconds: float = 1.0,
+    ):
+        """
+        Initialise la file d'ingestion.
+
+        Args:
+            max_size: Nombre max de pointages en attente
+            batch_size: Nombre max de pointages par lot
+            max_linger_ms: Attente max avant d'écrire un lot incomplet
+            put_timeout_seconds: Attente max du thread MQTT quand la file est pleine
+        """
+        self.max_size = max_size
+        self.batch_size = max(1, batch_size)
+        self.max_linger_seconds = max_linger_ms / 1000
+        self.put_timeout_seconds = put_timeout_seconds
+
+        self._queue: "queue.Queue[IngestItem]" = queue.Queue(maxsize=max_size)
+        self._handler: Optional[Callable[[List[IngestItem]], None]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.is_running = False
+
+        # Statistiques
+        self.submitted = 0
+        self.dropped = 0
+        self.batches_flushed = 0
+        self.items_flushed = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+
+    def submit(self, item: IngestItem) -> bool:
+        """
+        Dépose un pointage dans la file (appelé depuis le thread MQTT).
+
+        Returns:
+            True si le pointage a été accepté, False si la file est pleine
+        """
+        try:
+            self._queue.put(item, timeout=self.put_timeout_seconds)
+        except queue.Full:
+            self.dropped += 1
+            logger.error(
+                f"File d'ingestion pleine ({self.max_size}), pointage ignoré "
+                f"(device={item.device_serial}, badge={item.badge_id})"
+            )
+            return False
+
+        self.submitted += 1
+        return True
+
+    def _collect_batch(self) -> List[IngestItem]:
+        """
+        Attend le premier élément puis accumule jusqu'à `batch_size`
+        éléments ou l'expiration du délai d'attente.
+        """
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_linger_seconds
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _drain(self) -> List[IngestItem]:
+        """Récupère sans attendre jusqu'à `batch_size` éléments restants."""
+        batch: List[IngestItem] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: List[IngestItem]):
+        """Transmet un lot au handler et met à jour les statistiques."""
+        start = time.perf_counter()
+        try:
+            self._handler(batch)
+        except Exception as e:
+            logger.error(f"Erreur écriture lot de {len(batch)} pointages: {e}", exc_info=True)
+        finally:
+            self.batches_flushed += 1
+            self.items_flushed += len(batch)
+            self.last_batch_size = len(batch)
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    def _run(self):
+        """Boucle du thread de vidage."""
+        logger.info(
+            f"File d'ingestion démarrée (batch_size={self.batch_size}, "
+            f"max_linger={self.max_linger_seconds * 1000:.0f}ms, max_size={self.max_size})"
+        )
+
+        while not self._stop_event.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+
+        # Vider ce qui reste avant de s'arrêter
+        while True:
+            batch = self._drain()
+            if not batch:
+                break
+            self._flush(batch)
+
+    def start(self, handler: Callable[[List[IngestItem]], None]):
+        """
+        Démarre le thread de vidage.
+
+        Args:
+            handler: Fonction appelée avec chaque lot de pointages
+        """
+        if self.is_running:
+            logger.warning("La file d'ingestion est déjà démarrée")
+            return
+
+        self._handler = handler
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="attendance-ingest", daemon=True
+        )
+        self.is_running = True
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Arrête le thread après avoir écrit les pointages en attente."""
+        if not self.is_running:
+            return
+
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self.is_running = False
+        logger.info("File d'ingestion arrêtée")
+
+    def get_stats(self) -> dict:
+        """Retourne les statistiques de la file."""
+        return {
+            "is_running": self.is_running,
+            "queue_depth": self._queue.qsize(),
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "max_linger_ms": int(self.max_linger_seconds * 1000),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "batches_flushed": self.batches_flushed,
+            "items_flushed": self.items_flushed,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
@@ -0,0 +1,284 @@
+"""
+Gestion des partitions mensuelles de la table attendances.
+
+La table attendances est partitionnée par mois sur `timestamp` (PostgreSQL,
+PARTITION BY RANGE) : les requêtes bornées sur `timestamp` (rapports,
+tableaux de bord) ne lisent que les mois concernés, et la rétention se fait
+en détachant ou supprimant une partition entière au lieu d'un DELETE massif.
+
+- Les partitions du mois courant et des `months_ahead` mois suivants sont
+  créées à l'avance (au démarrage puis à chaque passage)
+- Une partition par défaut reçoit les pointages hors des mois créés
+  (horloge de terminal déréglée) ; ils sont déplacés dans la partition de
+  leur mois quand celle-ci est créée
+- Si `retention_months` > 0, les partitions entièrement plus anciennes sont
+  détachées (tables autonomes, à archiver) ou supprimées selon
+  `retention_action`
+"""
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "attendances"
+DEFAULT_PARTITION = "attendances_default"
+PARTITION_NAME = re.compile(r"^attendances_y(\d{4})m(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+class AttendancePartitionManager:
+    """
+    Service qui crée les partitions futures et applique la rétention.
+    """
+
+    def __init__(
+        self,
+        months_ahead: int = 3,
+        retention_months: int = 0,
+        retention_action: str = "detach",
+        interval_hours: int = 24,
+    ):
+        """
+        Initialise le service.
+
+        Args:
+            months_ahead: Nombre de mois créés à l'avance après le mois courant
+            retention_months: Nombre de mois conservés (0 = illimité)
+            retention_action: "detach" (la partition devient une table
+                autonome) ou "drop" (suppression)
+            interval_hours: Intervalle entre deux passages (en heures)
+        """
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.retention_action = retention_action
+        self.interval_hours = interval_hours
+        self.is_running = False
+        self.task = None
+
+        self.last_run_at: Optional[datetime] = None
+        self.partitions_created: List[str] = []
+        self.partitions_removed: List[str] = []
+
+    def is_partitioned(self, db: Session) -> bool:
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        return bool(db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:table)"
+            ),
+            {"table": PARENT_TABLE},
+        ).scalar())
+
+    def list_partitions(self, db: Session) -> List[str]:
+        return list(db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = to_regclass(:table) "
+                "ORDER BY child.relname"
+            ),
+            {"table": PARENT_TABLE},
+        ).scalars())
+
+    def create_partition(self, db: Session, month: date):
+        """
+        Crée la partition d'un mois. Les pointages de ce mois déjà reçus par la
+        partition par défaut (horloge de terminal en avance) y sont déplacés :
+        la partition par défaut est détachée le temps du déplacement, dans la
+        même transaction (les écritures concurrentes attendent le verrou).
+        """
+        name = partition_name(month)
+        bounds = {
+            "start": f"{month.isoformat()} 00:00:00+00",
+            "end": f"{add_months(month, 1).isoformat()} 00:00:00+00",
+        }
+        create = text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+        )
+        in_range = "timestamp >= CAST(:start AS timestamptz) AND timestamp < CAST(:end AS timestamptz)"
+
+        misplaced = db.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds
+        ).scalar()
+        if not misplaced:
+            db.execute(create)
+            db.commit()
+            return
+
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        db.execute(create)
+        moved = db.execute(
+            text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds
+        ).rowcount
+        db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        db.commit()
+        logger.info(f"Attendance partitions: {moved} row(s) moved from {DEFAULT_PARTITION} to {name}")
+
+    def ensure_partitions(self, db: Session) -> List[str]:
+        """
+        Crée la partition par défaut et celles des mois à venir manquantes.
+        Chaque mois est créé dans sa propre transaction : un échec est
+        journalisé sans empêcher les mois suivants.
+        """
+        existing = set(self.list_partitions(db))
+        created = []
+        if DEFAULT_PARTITION not in existing:
+            db.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+            db.commit()
+            created.append(DEFAULT_PARTITION)
+
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        for offset in range(self.months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            try:
+                self.create_partition(db, month)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error creating attendance partition {name}: {str(e)}")
+                continue
+            created.append(name)
+        return created
+
+    def apply_retention(self, db: Session) -> List[str]:
+        """Détache ou supprime les partitions antérieures à la période conservée."""
+        if self.retention_months <= 0:
+            return []
+
+        cutoff = add_months(datetime.now(timezone.utc).date().replace(day=1), -self.retention_months)
+        removed = []
+        for name in self.list_partitions(db):
+            month = partition_month(name)
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+            if self.retention_action == "drop":
+                db.execute(text(f"DROP TABLE {name}"))
+            else:
+                db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            removed.append(name)
+        db.commit()
+        return removed
+
+    def maintain(self, db: Session):
+        """Crée les partitions à venir puis applique la rétention."""
+        if not self.is_partitioned(db):
+            logger.debug("Attendance partitions: table is not partitioned, skipping")
+            return
+
+        created, removed = [], []
+        try:
+            created = self.ensure_partitions(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error in attendance partition creation: {str(e)}")
+        # La rétention ne dépend pas de la création des partitions à venir
+        try:
+            removed = self.apply_retention(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error in attendance partition retention: {str(e)}")
+
+        self.last_run_at = datetime.now(timezone.utc)
+        self.partitions_created.extend(created)
+        self.partitions_removed.extend(removed)
+        if created:
+            logger.info(f"Attendance partitions created: {', '.join(created)}")
+        if removed:
+            logger.info(
+                f"Attendance partitions {'dropped' if self.retention_action == 'drop' else 'detached'}: "
+                f"{', '.join(removed)}"
+            )
+
+    def _maintain(self):
+        with SessionLocal() as db:
+            self.maintain(db)
+
+    async def _maintenance_loop(self):
+        """
+        Boucle de maintenance qui s'exécute à intervalle régulier.
+        """
+        logger.info(
+            f"Attendance partition manager started (interval: {self.interval_hours}h)"
+        )
+
+        while self.is_running:
+            await asyncio.sleep(self.interval_hours * 3600)
+            await asyncio.to_thread(self._maintain)
+
+    def start(self):
+        """
+        Démarre la maintenance périodique (le premier passage est fait au
+        démarrage de l'application, avant la réception des pointages).
+        """
+        if self.is_running:
+            logger.warning("Attendance partition manager is already running")
+            return
+
+        self.is_running = True
+        self.task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self):
+        """
+        Arrête la maintenance périodique.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Attendance partition manager stopped")
+
+    def get_status(self) -> dict:
+        """
+        Retourne le statut du service.
+        """
+        return {
+            "is_running": self.is_running,
+            "months_ahead": self.months_ahead,
+            "retention_months": self.retention_months,
+            "retention_action": self.retention_action,
+            "last_run_at": self.last_run_at,
+            "partitions_created": self.partitions_created,
+            "partitions_removed": self.partitions_removed,
+        }
+
+
+# Instance globale du gestionnaire de partitions
+attendance_partitions = AttendancePartitionManager(
+    months_ahead=settings.ATTENDANCE_PARTITIONS_AHEAD_MONTHS,
+    retention_months=settings.ATTENDANCE_RETENTION_MONTHS,
+    retention_action=settings.ATTENDANCE_RETENTION_ACTION,
+)
@@ -0,0 +1,227 @@
+"""
+Annuaire en mémoire des badges et des terminaux.
+
+Chaque pointage MQTT doit retrouver le terminal (par numéro de série) et
+l'employé (par badge). Ces données changent rarement : l'annuaire en garde
+une copie réduite aux champs utiles à la validation, pour que le chemin
+d'ingestion ne touche pas la base quand l'entrée est en cache.
+
+- Préchargé au démarrage (warm)
+- Invalidé par les écritures CRUD sur les employés et les terminaux
+- Chaque entrée expire après `ttl_seconds` (filet de sécurité, notamment
+  pour les écritures faites par un autre worker)
+- Les badges/terminaux inconnus sont aussi mis en cache (entrée None)
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BadgeEntry:
+    """Champs d'un employé nécessaires à la validation d'un badge."""
+    badge_id: str
+    employee_id: str
+    first_name: str
+    last_name: str
+    employee_number: Optional[str]
+    is_active: bool
+    badge_active: bool
+    organization_id: str
+    site_id: Optional[str]
+    department_id: Optional[str]
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    @classmethod
+    def from_employee(cls, employee) -> "BadgeEntry":
+        return cls(
+            badge_id=employee.badge_id,
+            employee_id=employee.id,
+            first_name=employee.first_name,
+            last_name=employee.last_name,
+            employee_number=employee.employee_number,
+            is_active=getattr(employee, 'is_active', True),
+            badge_active=getattr(employee, 'badge_active', True),
+            organization_id=employee.organization_id,
+            site_id=employee.site_id,
+            department_id=employee.department_id,
+        )
+
+
+@dataclass(frozen=True)
+class DeviceEntry:
+    """Champs d'un terminal nécessaires à la validation d'un pointage."""
+    serial_number: str
+    device_id: str
+    type: Optional[str]
+    organization_id: str
+    site_id: Optional[str]
+
+    @classmethod
+    def from_device(cls, device) -> "DeviceEntry":
+        return cls(
+            serial_number=device.serial_number,
+            device_id=device.id,
+            type=device.type,
+            organization_id=device.organization_id,
+            site_id=device.site_id,
+        )
+
+
+class BadgeDirectory:
+    """
+    Cache des badges (clé: badge_id) et des terminaux (clé: serial_number).
+    Thread-safe : utilisé par le thread d'ingestion MQTT et par les requêtes HTTP.
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        """
+        Initialise l'annuaire.
+
+        Args:
+            ttl_seconds: Durée de vie d'une entrée (en secondes)
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._badges: Dict[str, Tuple[float, Optional[BadgeEntry]]] = {}
+        self._devices: Dict[str, Tuple[float, Optional[DeviceEntry]]] = {}
+
+        # Statistiques
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.last_warm_at: Optional[float] = None
+
+    def _lookup(self, store: dict, keys: Iterable[str]) -> Tuple[dict, List[str]]:
+        """Retourne les entrées valides trouvées et la liste des clés manquantes."""
+        now = time.monotonic()
+        found = {}
+        missing = []
+        with self._lock:
+            for key in set(keys):
+                cached = store.get(key)
+                if cached is not None and now - cached[0] < self.ttl_seconds:
+                    found[key] = cached[1]
+                else:
+                    missing.append(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def _store(self, store: dict, entries: Dict[str, Optional[object]]):
+        now = time.monotonic()
+        with self._lock:
+            for key, entry in entries.items():
+                store[key] = (now, entry)
+
+    def resolve_badges(self, db: Session, badge_ids: Iterable[str]) -> Dict[str, Optional[BadgeEntry]]:
+        """
+        Résout un lot de badges. Les badges absents du cache sont chargés
+        en une seule requête. Un badge inconnu est associé à None.
+        """
+        from app.crud.employee import employee as crud_employee
+
+        found, missing = self._lookup(self._badges, badge_ids)
+        if missing:
+            loaded: Dict[str, Optional[BadgeEntry]] = dict.fromkeys(missing)
+            for employee in crud_employee.get_multi_by_badges(db, badge_ids=missing):
+                loaded[employee.badge_id] = BadgeEntry.from_employee(employee)
+            self._store(self._badges, loaded)
+            found.update(loaded)
+        return found
+
+    def resolve_devices(self, db: Session, serial_numbers: Iterable[str]) -> Dict[str, Optional[DeviceEntry]]:
+        """
+        Résout un lot de terminaux. Les terminaux absents du cache sont
+        chargés en une seule requête. Un terminal inconnu est associé à None.
+        """
+        from app.crud.device import device as crud_device
+
+        found, missing = self._lookup(self._devices, serial_numbers)
+        if missing:
+            loaded: Dict[str, Optional[DeviceEntry]] = dict.fromkeys(missing)
+            for device in crud_device.get_multi_by_serials(db, serial_numbers=missing):
+                loaded[device.serial_number] = DeviceEntry.from_device(device)
+            self._store(self._devices, loaded)
+            found.update(loaded)
+        return found
+
+    def get_device(self, db: Session, serial_number: str) -> Optional[DeviceEntry]:
+        """Résout un seul terminal."""
+        return self.resolve_devices(db, [serial_number]).get(serial_number)
+
+    def invalidate_badge(self, *badge_ids: Optional[str]):
+        """Retire des badges du cache (appelé après une écriture sur un employé)."""
+        with self._lock:
+            for badge_id in badge_ids:
+                if badge_id and self._badges.pop(badge_id, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_device(self, *serial_numbers: Optional[str]):
+        """Retire des terminaux du cache (appelé après une écriture sur un terminal)."""
+        with self._lock:
+            for serial_number in serial_numbers:
+                if serial_number and self._devices.pop(serial_number, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        """Vide entièrement le cache."""
+        with self._lock:
+            self._badges.clear()
+            self._devices.clear()
+
+    def warm(self, db: Session) -> Tuple[int, int]:
+        """
+        Précharge tous les badges et tous les terminaux.
+
+        Returns:
+            Le nombre de badges et de terminaux chargés
+        """
+        from app.models.device import Device
+        from app.models.employee import Employee
+
+        badges = {
+            e.badge_id: BadgeEntry.from_employee(e)
+            for e in db.query(Employee).filter(Employee.badge_id.isnot(None))
+        }
+        devices = {d.serial_number: DeviceEntry.from_device(d) for d in db.query(Device)}
+
+        with self._lock:
+            self._badges.clear()
+            self._devices.clear()
+        self._store(self._badges, badges)
+        self._store(self._devices, devices)
+        self.last_warm_at = time.time()
+
+        logger.info(f"Annuaire des badges préchargé: {len(badges)} badges, {len(devices)} terminaux")
+        return len(badges), len(devices)
+
+    def get_stats(self) -> dict:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            badges = len(self._badges)
+            devices = len(self._devices)
+        return {
+            "badges": badges,
+            "devices": devices,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "last_warm_at": self.last_warm_at,
+        }
+
+
+# Instance globale de l'annuaire
+badge_directory = BadgeDirectory(ttl_seconds=settings.BADGE_DIRECTORY_TTL_SECONDS)
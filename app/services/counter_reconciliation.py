@@ -0,0 +1,155 @@
+"""
+Réconciliation des compteurs dénormalisés.
+
+Les compteurs des organisations, sites et départements sont tenus à jour
+par les événements ORM (app/models/counters.py). Ce service les recalcule
+périodiquement à partir des tables enfants et corrige ceux qui ont dérivé
+(écritures SQL hors ORM, suppressions en cascade en base, incident).
+
+Chaque compteur est corrigé par une seule requête, dans sa propre
+transaction : `UPDATE parent SET n = (SELECT count(*) ...) WHERE n <> (...)`.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.counters import COUNTER_CACHES, CounterCache
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_counter(db: Session, counter: CounterCache) -> int:
+    """
+    Recalcule un compteur et corrige les lignes en écart.
+
+    Returns:
+        Le nombre de lignes parentes corrigées
+    """
+    parent = counter.parent.__table__
+    child = counter.child.__table__
+    actual = (
+        select(func.count())
+        .select_from(child)
+        .where(child.c[counter.foreign_key] == parent.c.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        parent.update()
+        .where(parent.c[counter.column] != actual)
+        .values({counter.column: actual})
+    )
+    db.commit()
+    return result.rowcount
+
+
+class CounterReconciliationService:
+    """
+    Service qui détecte et corrige périodiquement la dérive des compteurs.
+    """
+
+    def __init__(self, interval_hours: int = 6):
+        """
+        Initialise le service.
+
+        Args:
+            interval_hours: Intervalle entre deux réconciliations (en heures)
+        """
+        self.interval_hours = interval_hours
+        self.is_running = False
+        self.task = None
+
+        self.last_run_at: Optional[datetime] = None
+        self.last_repaired: Dict[str, int] = {}
+        self.total_repaired = 0
+
+    def _reconcile_all(self) -> Dict[str, int]:
+        repaired = {}
+        with SessionLocal() as db:
+            for counter in COUNTER_CACHES:
+                name = f"{counter.parent.__tablename__}.{counter.column}"
+                repaired[name] = reconcile_counter(db, counter)
+        return repaired
+
+    async def reconcile(self) -> Dict[str, int]:
+        """
+        Réconcilie tous les compteurs.
+
+        Returns:
+            Le nombre de lignes corrigées par compteur
+        """
+        repaired = await asyncio.to_thread(self._reconcile_all)
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_repaired = repaired
+        self.total_repaired += sum(repaired.values())
+
+        drifted = {name: count for name, count in repaired.items() if count}
+        if drifted:
+            logger.warning(f"Counter reconciliation: drift repaired {drifted}")
+        else:
+            logger.debug("Counter reconciliation: no drift")
+        return repaired
+
+    async def _reconciliation_loop(self):
+        """
+        Boucle de réconciliation qui s'exécute à intervalle régulier.
+        """
+        logger.info(
+            f"Counter reconciliation service started (interval: {self.interval_hours}h)"
+        )
+
+        while self.is_running:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Error in counter reconciliation: {str(e)}")
+
+            await asyncio.sleep(self.interval_hours * 3600)
+
+    def start(self):
+        """
+        Démarre le service de réconciliation.
+        """
+        if self.is_running:
+            logger.warning("Counter reconciliation service is already running")
+            return
+
+        self.is_running = True
+        self.task = asyncio.create_task(self._reconciliation_loop())
+
+    async def stop(self):
+        """
+        Arrête le service de réconciliation.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Counter reconciliation service stopped")
+
+    def get_status(self) -> dict:
+        """
+        Retourne le statut du service.
+        """
+        return {
+            "is_running": self.is_running,
+            "interval_hours": self.interval_hours,
+            "last_run_at": self.last_run_at,
+            "last_repaired": self.last_repaired,
+            "total_repaired": self.total_repaired,
+        }
+
+
+# Instance globale du service de réconciliation
+counter_reconciliation = CounterReconciliationService()
@@ -0,0 +1,229 @@
+"""
+Présences du jour par organisation et par site.
+
+« Présents aujourd'hui », le taux de présence et le nombre de pointages du
+jour recomptaient les employés distincts sur la table attendances à chaque
+tableau de bord. Ils sont désormais lus dans `daily_presence_counts`, une
+ligne par (organisation, site, jour local de l'organisation) :
+
+- L'ingestion MQTT et les endpoints de pointage enregistrent chaque pointage
+  dans ce tampon, vidé périodiquement ; le jour est calculé dans le fuseau
+  horaire de l'organisation, un nouveau jour local repart donc de zéro
+- Les pointages du jour sont additionnés (INSERT ... ON CONFLICT DO UPDATE)
+- Un ensemble en mémoire des employés déjà vus par jour et par organisation
+  évite de toucher au nombre de présents pour les pointages suivants d'un
+  employé. À la première apparition d'un employé, le nombre de présents du
+  site est recalculé sur les pointages de ce jour seulement : le résultat
+  reste exact avec plusieurs workers, dont les ensembles sont distincts
+- Les ensembles des jours terminés sont oubliés (bascule à minuit local)
+- Les instantanés des tableaux de bord des organisations concernées sont
+  invalidés après chaque écriture
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.crud.crud_daily_presence import daily_presence as crud_daily_presence
+from app.db.session import SessionLocal
+from app.services.dashboard_snapshots import dashboard_snapshots
+from app.utils.helpers import local_day, local_day_bounds, local_today
+
+logger = logging.getLogger(__name__)
+
+# (organization_id, site_id, employee_id, timestamp)
+PresenceEvent = Tuple[str, Optional[str], str, datetime]
+
+
+class DailyPresenceTracker:
+    """
+    Tampon des pointages par organisation, site et jour, vidé à intervalle régulier.
+    Thread-safe : alimenté depuis le thread d'ingestion MQTT et les requêtes HTTP.
+    """
+
+    def __init__(self, flush_interval_seconds: int = 10):
+        """
+        Initialise le tampon.
+
+        Args:
+            flush_interval_seconds: Intervalle entre chaque écriture en base (en secondes)
+        """
+        self.flush_interval_seconds = flush_interval_seconds
+        self.is_running = False
+        self.task = None
+
+        self._lock = threading.Lock()
+        self._pending: List[PresenceEvent] = []
+        # Employés déjà comptés, par (organisation, jour local)
+        self._present: Dict[Tuple[str, date], Set[str]] = defaultdict(set)
+        self._timezones: Dict[str, str] = {}
+
+        # Statistiques
+        self.recorded = 0
+        self.recounts = 0
+        self.last_flush_at: Optional[datetime] = None
+
+    def record(
+        self,
+        organization_id: str,
+        site_id: Optional[str],
+        employee_id: str,
+        timestamp: datetime,
+    ):
+        """Enregistre un pointage d'un employé."""
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        with self._lock:
+            self._pending.append((organization_id, site_id, employee_id, timestamp))
+            self.recorded += 1
+
+    def _requeue(self, pending: List[PresenceEvent]):
+        """Remet en attente des pointages non écrits."""
+        with self._lock:
+            self._pending[:0] = pending
+
+    def _rollover(self):
+        """Oublie les employés vus les jours précédents (jour local de chaque organisation)."""
+        with self._lock:
+            for organization_id, day in list(self._present):
+                if day < local_today(self._timezones.get(organization_id)):
+                    del self._present[(organization_id, day)]
+
+    def flush(self) -> int:
+        """
+        Applique les pointages en attente : ajout des pointages du jour, puis
+        recalcul des présents des sites où un employé est apparu.
+
+        Returns:
+            Le nombre de pointages écrits
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        if pending:
+            try:
+                self._apply(pending)
+            except Exception as e:
+                self._requeue(pending)
+                logger.error(f"Erreur écriture présences du jour ({len(pending)} pointages): {e}")
+                return 0
+
+        self._rollover()
+        self.last_flush_at = datetime.now(timezone.utc)
+        return len(pending)
+
+    def _apply(self, pending: List[PresenceEvent]):
+        with SessionLocal() as db:
+            unknown = {event[0] for event in pending} - self._timezones.keys()
+            if unknown:
+                self._timezones.update(
+                    crud_daily_presence.get_organization_timezones(db, organization_ids=unknown)
+                )
+            # Organisation supprimée entre-temps
+            pending = [event for event in pending if event[0] in self._timezones]
+
+            counts: Dict[Tuple[str, Optional[str], date], int] = defaultdict(int)
+            arrivals: Dict[Tuple[str, date], Set[str]] = defaultdict(set)
+            recount: Set[Tuple[str, Optional[str], date]] = set()
+            with self._lock:
+                for organization_id, site_id, employee_id, timestamp in pending:
+                    day = local_day(timestamp, self._timezones.get(organization_id))
+                    counts[(organization_id, site_id, day)] += 1
+                    if employee_id not in self._present[(organization_id, day)]:
+                        arrivals[(organization_id, day)].add(employee_id)
+                        recount.add((organization_id, site_id, day))
+
+            crud_daily_presence.add_attendances_many(db, rows=[
+                {"organization_id": organization_id, "site_id": site_id, "day": day, "count": count}
+                for (organization_id, site_id, day), count in counts.items()
+            ])
+            rows = []
+            for organization_id, site_id, day in recount:
+                start, end = local_day_bounds(day, self._timezones.get(organization_id))
+                rows.append({
+                    "organization_id": organization_id, "site_id": site_id,
+                    "day": day, "start": start, "end": end,
+                })
+            crud_daily_presence.recount_presence_many(db, rows=rows)
+            db.commit()
+
+        # Les employés ne sont marqués vus qu'une fois les présents recalculés
+        with self._lock:
+            for key, employee_ids in arrivals.items():
+                self._present[key].update(employee_ids)
+        self.recounts += len(recount)
+        # Les tableaux de bord lisent ces compteurs : recalcul après l'écriture
+        dashboard_snapshots.invalidate_many(organization_id for organization_id, _, _ in counts)
+        logger.debug(
+            f"Présences du jour: {len(pending)} pointage(s), {len(recount)} site(s) recalculé(s)"
+        )
+
+    async def _flush_loop(self):
+        """
+        Boucle de vidage qui s'exécute à intervalle régulier.
+        """
+        logger.info(
+            f"Daily presence tracker started (flush interval: {self.flush_interval_seconds}s)"
+        )
+
+        while self.is_running:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Error in daily presence flush loop: {str(e)}")
+
+    def start(self):
+        """
+        Démarre le vidage périodique.
+        """
+        if self.is_running:
+            logger.warning("Daily presence tracker is already running")
+            return
+
+        self.is_running = True
+        self.task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """
+        Arrête le vidage périodique et écrit les pointages restants.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        await asyncio.to_thread(self.flush)
+        logger.info("Daily presence tracker stopped")
+
+    def get_status(self) -> dict:
+        """
+        Retourne le statut actuel du tampon.
+        """
+        with self._lock:
+            pending = len(self._pending)
+            tracked = sum(len(employee_ids) for employee_ids in self._present.values())
+        return {
+            "is_running": self.is_running,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            "pending_attendances": pending,
+            "tracked_employees": tracked,
+            "recorded": self.recorded,
+            "recounts": self.recounts,
+            "last_flush_at": self.last_flush_at,
+        }
+
+
+# Instance globale des présences du jour
+daily_presence_tracker = DailyPresenceTracker(
+    flush_interval_seconds=settings.DAILY_PRESENCE_FLUSH_INTERVAL_SECONDS
+)
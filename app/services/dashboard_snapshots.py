@@ -0,0 +1,370 @@
+"""
+Instantanés précalculés des tableaux de bord par organisation.
+
+Les tableaux de bord manager, intégrateur et analyses enchaînaient à chaque
+appel une dizaine de requêtes d'agrégat (la présence du jour était calculée
+trois fois). Chaque tableau de bord d'une organisation est désormais calculé
+une fois, puis servi depuis la mémoire :
+
+- Un pointage, une demande de congé ou un changement de terminal marque les
+  instantanés de l'organisation comme périmés (`invalidate`) ; la boucle les
+  recalcule en arrière-plan après `debounce_seconds`, ce qui regroupe une
+  rafale de pointages en un seul recalcul
+- Un instantané n'est jamais servi au-delà de `max_age_seconds` : il est
+  rafraîchi en arrière-plan avant cette limite tant qu'il est consulté, et
+  recalculé pendant la requête sinon. Cette limite couvre aussi les
+  événements reçus par les autres workers
+- Les instantanés non consultés depuis `idle_seconds` sont oubliés
+"""
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.crud_dashboard import dashboard as crud_dashboard
+from app.db.replica import replica_router
+from app.schemas.dashboard import AdvancedAnalytics, IntegratorDashboard, ManagerDashboard
+
+logger = logging.getLogger(__name__)
+
+# Part de max_age_seconds au-delà de laquelle un instantané consulté est rafraîchi
+REFRESH_RATIO = 0.8
+
+
+def compute_manager(db: Session, organization_id: str) -> ManagerDashboard:
+    """Tableau de bord manager/RH (présence du jour calculée une seule fois)."""
+    present_today, total_employees = crud_dashboard.get_daily_presence_and_total_employees(
+        db=db, organization_id=organization_id
+    )
+    absent_today = total_employees - present_today
+    tardy_today = crud_dashboard.get_daily_tardiness_count(db=db, organization_id=organization_id)
+    attendance_rate = (present_today / total_employees) * 100 if total_employees else 0.0
+
+    return ManagerDashboard.model_validate({
+        "present_today": present_today,
+        "absent_today": absent_today,
+        "tardy_today": tardy_today,
+        "attendance_rate": attendance_rate,
+        "total_work_hours": crud_dashboard.get_total_work_hours(db=db, organization_id=organization_id),
+        "pending_leaves": crud_dashboard.get_pending_leaves_count(db=db, organization_id=organization_id),
+        "presence_evolution": crud_dashboard.get_presence_evolution_last_30_days(
+            db=db, organization_id=organization_id
+        ),
+        "presence_absence_tardiness_distribution": {
+            "present": present_today,
+            "absent": absent_today,
+            "tardy": tardy_today,
+        },
+        "real_time_attendances": crud_dashboard.get_real_time_attendances(
+            db=db, organization_id=organization_id
+        ),
+    }, from_attributes=True)
+
+
+def compute_integrator(db: Session, organization_id: str) -> IntegratorDashboard:
+    """Tableau de bord intégrateur/technicien IoT."""
+    return IntegratorDashboard.model_validate({
+        "device_status_ratio": crud_dashboard.get_device_status_ratio(db=db),
+        "attendance_per_device": crud_dashboard.get_attendance_per_device(
+            db=db, organization_id=organization_id
+        ),
+    })
+
+
+def compute_analytics(db: Session, organization_id: str) -> AdvancedAnalytics:
+    """Analyses avancées."""
+    return AdvancedAnalytics.model_validate({
+        "tardiness_by_day_of_week": crud_dashboard.get_tardiness_by_day_of_week(
+            db=db, organization_id=organization_id
+        ),
+    })
+
+
+COMPUTERS: Dict[str, Callable[[Session, str], BaseModel]] = {
+    "manager": compute_manager,
+    "integrator": compute_integrator,
+    "analytics": compute_analytics,
+}
+
+
+@dataclass
+class Snapshot:
+    payload: BaseModel
+    computed_at: float
+    accessed_at: float
+    dirty_at: Optional[float] = None
+
+
+class DashboardSnapshotService:
+    """
+    Cache des tableaux de bord par (type, organisation).
+    Thread-safe : lu par les requêtes HTTP, invalidé depuis le thread
+    d'ingestion MQTT et les endpoints.
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: int = 60,
+        debounce_seconds: float = 2.0,
+        idle_seconds: int = 600,
+    ):
+        """
+        Initialise le service.
+
+        Args:
+            max_age_seconds: Âge maximal d'un instantané servi (en secondes)
+            debounce_seconds: Délai de regroupement des événements avant recalcul (en secondes)
+            idle_seconds: Durée sans consultation avant d'oublier un instantané (en secondes)
+        """
+        self.max_age_seconds = max_age_seconds
+        self.debounce_seconds = debounce_seconds
+        self.idle_seconds = idle_seconds
+        self.is_running = False
+        self.task = None
+
+        self._lock = threading.Lock()
+        self._snapshots: Dict[Tuple[str, str], Snapshot] = {}
+        self._compute_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+        # Statistiques
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.recomputes = 0
+        self.recompute_errors = 0
+        self.recompute_seconds_total = 0.0
+        self.recompute_seconds_max = 0.0
+        self.last_refresh_at: Optional[datetime] = None
+
+    def _compute(
+        self,
+        kind: str,
+        organization_id: str,
+        db: Session,
+        accessed_at: Optional[float] = None,
+    ) -> BaseModel:
+        """
+        Calcule un tableau de bord et l'enregistre comme instantané.
+        `accessed_at` est l'instant de la lecture qui déclenche le calcul
+        (None pour un rafraîchissement en arrière-plan).
+        """
+        started = time.monotonic()
+        payload = COMPUTERS[kind](db, organization_id)
+        elapsed = time.monotonic() - started
+
+        with self._lock:
+            previous = self._snapshots.get((kind, organization_id))
+            snapshot = Snapshot(payload=payload, computed_at=started, accessed_at=accessed_at or started)
+            if previous is not None:
+                if accessed_at is None:
+                    snapshot.accessed_at = previous.accessed_at
+                # Un événement reçu pendant le calcul reste à prendre en compte
+                if previous.dirty_at is not None and previous.dirty_at > started:
+                    snapshot.dirty_at = previous.dirty_at
+            self._snapshots[(kind, organization_id)] = snapshot
+            self.recomputes += 1
+            self.recompute_seconds_total += elapsed
+            self.recompute_seconds_max = max(self.recompute_seconds_max, elapsed)
+        return payload
+
+    def get(self, kind: str, organization_id: str, db: Session) -> BaseModel:
+        """
+        Retourne le tableau de bord `kind` ("manager", "integrator" ou
+        "analytics") d'une organisation : l'instantané s'il a moins de
+        `max_age_seconds`, sinon un nouveau calcul sur la session fournie.
+        """
+        key = (kind, organization_id)
+        payload = self._fresh(key)
+        if payload is not None:
+            return payload
+
+        # Un seul calcul par clé : les lectures concurrentes attendent son résultat
+        with self._key_lock(key):
+            payload = self._fresh(key)
+            if payload is not None:
+                return payload
+            with self._lock:
+                self.misses += 1
+            return self._compute(kind, organization_id, db, accessed_at=time.monotonic())
+
+    def _fresh(self, key: Tuple[str, str]) -> Optional[BaseModel]:
+        """Instantané de moins de `max_age_seconds` (compté comme hit), sinon None."""
+        now = time.monotonic()
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or now - snapshot.computed_at > self.max_age_seconds:
+                return None
+            snapshot.accessed_at = now
+            self.hits += 1
+            return snapshot.payload
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._compute_locks.setdefault(key, threading.Lock())
+
+    def invalidate(self, organization_id: Optional[str], kinds: Iterable[str] = tuple(COMPUTERS)):
+        """Marque les instantanés d'une organisation comme périmés."""
+        if not organization_id:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for kind in kinds:
+                snapshot = self._snapshots.get((kind, organization_id))
+                if snapshot is not None and snapshot.dirty_at is None:
+                    snapshot.dirty_at = now
+                    self.invalidations += 1
+
+    def invalidate_many(self, organization_ids: Iterable[Optional[str]], kinds: Iterable[str] = tuple(COMPUTERS)):
+        """Marque les instantanés de plusieurs organisations comme périmés."""
+        kinds = tuple(kinds)
+        for organization_id in set(organization_ids):
+            self.invalidate(organization_id, kinds)
+
+    def invalidate_kind(self, kind: str):
+        """Marque un type d'instantané comme périmé pour toutes les organisations."""
+        now = time.monotonic()
+        with self._lock:
+            for (snapshot_kind, _), snapshot in self._snapshots.items():
+                if snapshot_kind == kind and snapshot.dirty_at is None:
+                    snapshot.dirty_at = now
+                    self.invalidations += 1
+
+    def _due(self) -> List[Tuple[str, str]]:
+        """Oublie les instantanés inactifs et retourne ceux à recalculer."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for key, snapshot in list(self._snapshots.items()):
+                if now - snapshot.accessed_at > self.idle_seconds:
+                    del self._snapshots[key]
+                    compute_lock = self._compute_locks.get(key)
+                    if compute_lock is not None and not compute_lock.locked():
+                        del self._compute_locks[key]
+                elif (
+                    (snapshot.dirty_at is not None and now - snapshot.dirty_at >= self.debounce_seconds)
+                    or now - snapshot.computed_at >= self.max_age_seconds * REFRESH_RATIO
+                ):
+                    due.append(key)
+        return due
+
+    def refresh(self) -> int:
+        """
+        Recalcule les instantanés périmés ou proches de leur âge maximal.
+
+        Returns:
+            Le nombre d'instantanés recalculés
+        """
+        due = self._due()
+        if not due:
+            return 0
+
+        refreshed = 0
+        db = replica_router.session()
+        try:
+            for kind, organization_id in due:
+                compute_lock = self._key_lock((kind, organization_id))
+                # Déjà en cours de calcul par une requête
+                if not compute_lock.acquire(blocking=False):
+                    continue
+                try:
+                    self._compute(kind, organization_id, db)
+                    refreshed += 1
+                except Exception as e:
+                    db.rollback()
+                    self.recompute_errors += 1
+                    logger.error(f"Erreur recalcul tableau de bord {kind} ({organization_id}): {e}")
+                finally:
+                    compute_lock.release()
+        finally:
+            db.close()
+
+        self.last_refresh_at = datetime.now(timezone.utc)
+        logger.debug(f"Tableaux de bord: {refreshed} instantané(s) recalculé(s)")
+        return refreshed
+
+    async def _refresh_loop(self):
+        """
+        Boucle de recalcul qui s'exécute à intervalle régulier.
+        """
+        logger.info(
+            f"Dashboard snapshot service started "
+            f"(max age: {self.max_age_seconds}s, debounce: {self.debounce_seconds}s)"
+        )
+
+        while self.is_running:
+            await asyncio.sleep(self.debounce_seconds)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Error in dashboard snapshot loop: {str(e)}")
+
+    def start(self):
+        """
+        Démarre le recalcul en arrière-plan.
+        """
+        if self.is_running:
+            logger.warning("Dashboard snapshot service is already running")
+            return
+
+        self.is_running = True
+        self.task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """
+        Arrête le recalcul en arrière-plan.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Dashboard snapshot service stopped")
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les statistiques du cache.
+        """
+        with self._lock:
+            snapshots = len(self._snapshots)
+            dirty = sum(1 for snapshot in self._snapshots.values() if snapshot.dirty_at is not None)
+        requests = self.hits + self.misses
+        return {
+            "is_running": self.is_running,
+            "max_age_seconds": self.max_age_seconds,
+            "debounce_seconds": self.debounce_seconds,
+            "snapshots": snapshots,
+            "dirty_snapshots": dirty,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 3) if requests else None,
+            "invalidations": self.invalidations,
+            "recomputes": self.recomputes,
+            "recompute_errors": self.recompute_errors,
+            "recompute_avg_ms": (
+                round(self.recompute_seconds_total / self.recomputes * 1000, 1)
+                if self.recomputes else None
+            ),
+            "recompute_max_ms": round(self.recompute_seconds_max * 1000, 1),
+            "last_refresh_at": self.last_refresh_at,
+        }
+
+
+# Instance globale des instantanés de tableaux de bord
+dashboard_snapshots = DashboardSnapshotService(
+    max_age_seconds=settings.DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS,
+    debounce_seconds=settings.DASHBOARD_SNAPSHOT_DEBOUNCE_SECONDS,
+    idle_seconds=settings.DASHBOARD_SNAPSHOT_IDLE_SECONDS,
+)
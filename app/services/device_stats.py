@@ -0,0 +1,220 @@
+"""
+Statistiques de pointage en direct des terminaux.
+
+La liste des terminaux affichait, pour chaque ligne, le dernier pointage et
+le nombre de pointages du jour, au prix de deux requêtes par terminal. Ces
+statistiques sont désormais portées par la ligne `devices` elle-même
+(`last_attendance_at`, `attendance_count_day`, `attendance_count`) :
+
+- L'ingestion MQTT et les endpoints de pointage enregistrent chaque pointage
+  dans ce tampon, vidé périodiquement en un seul UPDATE ... FROM (VALUES ...)
+  qui incrémente les compteurs (correct avec plusieurs workers)
+- Le jour d'un pointage est calculé dans le fuseau horaire du site du
+  terminal (à défaut celui de l'organisation, sinon UTC) ; le compteur
+  repart de zéro au premier pointage d'un nouveau jour local
+- La lecture (`lookup`) combine les colonnes de la ligne et les pointages
+  pas encore écrits, sans requête
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.crud.device import device as crud_device
+from app.db.session import SessionLocal
+from app.utils.helpers import local_day
+
+logger = logging.getLogger(__name__)
+
+
+def device_timezone(device) -> str:
+    """Fuseau d'un terminal chargé avec son site et son organisation."""
+    if device.site is not None and device.site.timezone:
+        return device.site.timezone
+    if device.organization is not None and device.organization.timezone:
+        return device.organization.timezone
+    return "UTC"
+
+
+class DeviceStatsStore:
+    """
+    Tampon des pointages par terminal, vidé à intervalle régulier.
+    Thread-safe : alimenté depuis le thread d'ingestion MQTT et les requêtes HTTP.
+    """
+
+    def __init__(self, flush_interval_seconds: int = 10):
+        """
+        Initialise le tampon.
+
+        Args:
+            flush_interval_seconds: Intervalle entre chaque écriture en base (en secondes)
+        """
+        self.flush_interval_seconds = flush_interval_seconds
+        self.is_running = False
+        self.task = None
+
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[datetime]] = defaultdict(list)
+
+        # Statistiques
+        self.recorded = 0
+        self.flushed_rows = 0
+        self.last_flush_at: Optional[datetime] = None
+
+    def record(self, device_id: Optional[str], timestamp: datetime):
+        """Enregistre un pointage d'un terminal (ignoré sans terminal)."""
+        if not device_id:
+            return
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        with self._lock:
+            self._pending[device_id].append(timestamp)
+            self.recorded += 1
+
+    def record_many(self, rows: Iterable[dict]):
+        """Enregistre des pointages insérés en lot (lignes de create_many)."""
+        for row in rows:
+            self.record(row.get("device_id"), row["timestamp"])
+
+    @staticmethod
+    def _aggregate(timestamps: List[datetime], timezone_name: Optional[str]) -> Tuple[date, int, datetime]:
+        """Retourne (jour local le plus récent, pointages de ce jour, dernier pointage)."""
+        days = [local_day(timestamp, timezone_name) for timestamp in timestamps]
+        latest = max(days)
+        return latest, days.count(latest), max(timestamps)
+
+    def lookup(self, devices: Iterable) -> Dict[str, Tuple[Optional[datetime], int]]:
+        """
+        Retourne (dernier pointage, pointages du jour) de chaque terminal, à
+        partir des colonnes des lignes chargées (avec site et organisation)
+        et des pointages pas encore écrits.
+        """
+        devices = list(devices)
+        with self._lock:
+            pending = {
+                device.id: list(self._pending[device.id])
+                for device in devices if device.id in self._pending
+            }
+
+        stats = {}
+        for device in devices:
+            timezone_name = device_timezone(device)
+            today = local_day(datetime.now(timezone.utc), timezone_name)
+            last_at = device.last_attendance_at
+            count = device.attendance_count if device.attendance_count_day == today else 0
+
+            timestamps = pending.get(device.id)
+            if timestamps:
+                day, day_count, pending_last = self._aggregate(timestamps, timezone_name)
+                if day == today:
+                    count += day_count
+                last_at = max(last_at, pending_last) if last_at else pending_last
+            stats[device.id] = (last_at, count)
+        return stats
+
+    def _requeue(self, pending: Dict[str, List[datetime]]):
+        """Remet en attente des pointages non écrits."""
+        with self._lock:
+            for device_id, timestamps in pending.items():
+                self._pending[device_id].extend(timestamps)
+
+    def flush(self) -> int:
+        """
+        Applique les pointages en attente en un seul UPDATE.
+
+        Returns:
+            Le nombre de terminaux mis à jour
+        """
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(list)
+
+        if not pending:
+            return 0
+
+        try:
+            with SessionLocal() as db:
+                timezones = crud_device.get_timezones(db, device_ids=pending.keys())
+                rows = []
+                for device_id, timestamps in pending.items():
+                    day, count, last_at = self._aggregate(timestamps, timezones.get(device_id))
+                    rows.append({
+                        "id": device_id, "day": day, "count": count, "last_attendance_at": last_at,
+                    })
+                updated = crud_device.apply_attendance_stats_many(db, rows=rows)
+        except Exception as e:
+            self._requeue(pending)
+            logger.error(f"Erreur écriture statistiques de pointage ({len(pending)} terminaux): {e}")
+            return 0
+
+        self.flushed_rows += updated
+        self.last_flush_at = datetime.now(timezone.utc)
+        logger.debug(f"Statistiques de pointage: {updated} terminal(aux) mis à jour")
+        return updated
+
+    async def _flush_loop(self):
+        """
+        Boucle de vidage qui s'exécute à intervalle régulier.
+        """
+        logger.info(
+            f"Device stats store started (flush interval: {self.flush_interval_seconds}s)"
+        )
+
+        while self.is_running:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Error in device stats flush loop: {str(e)}")
+
+    def start(self):
+        """
+        Démarre le vidage périodique.
+        """
+        if self.is_running:
+            logger.warning("Device stats store is already running")
+            return
+
+        self.is_running = True
+        self.task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """
+        Arrête le vidage périodique et écrit les pointages restants.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        await asyncio.to_thread(self.flush)
+        logger.info("Device stats store stopped")
+
+    def get_status(self) -> dict:
+        """
+        Retourne le statut actuel du tampon.
+        """
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "is_running": self.is_running,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            "pending_devices": pending,
+            "recorded": self.recorded,
+            "flushed_rows": self.flushed_rows,
+            "last_flush_at": self.last_flush_at,
+        }
+
+
+# Instance globale des statistiques de pointage des terminaux
+device_stats = DeviceStatsStore(
+    flush_interval_seconds=settings.DEVICE_STATS_FLUSH_INTERVAL_SECONDS
+)
@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 
 from app.db.session import SessionLocal
 from app.crud.device import device as crud_device
+from app.services.dashboard_snapshots import dashboard_snapshots
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -55,6 +56,7 @@ class DeviceStatusMonitorService:
             db.close()
 
             if marked_offline > 0:
+                dashboard_snapshots.invalidate_kind("integrator")
                 logger.info(
                     f"Device status check: {marked_offline} device(s) marked OFFLINE "
                     f"(no heartbeat for {self.offline_timeout_minutes} min)"
@@ -0,0 +1,194 @@
+"""
+Tampon d'écriture différée de la télémétrie des terminaux IoT.
+
+Chaque pointage et chaque heartbeat mettaient à jour la ligne du terminal
+dans `devices` (add/commit/refresh). Ce service garde en mémoire la dernière
+télémétrie connue de chaque terminal et l'applique périodiquement en un seul
+UPDATE ... FROM (VALUES ...) : plusieurs heartbeats d'un même terminal entre
+deux vidages ne coûtent qu'une ligne.
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.config import settings
+from app.crud.device import device as crud_device
+from app.db.session import SessionLocal
+from app.schemas.device import DeviceHeartbeatUpdate
+
+logger = logging.getLogger(__name__)
+
+TELEMETRY_FIELDS = ("firmware_version", "battery_level", "wifi_rssi")
+
+
+class DeviceTelemetryBuffer:
+    """
+    Tampon "dernière télémétrie" par terminal, vidé à intervalle régulier.
+    Thread-safe : alimenté depuis le thread MQTT et le thread d'ingestion.
+    """
+
+    def __init__(self, flush_interval_seconds: int = 10):
+        """
+        Initialise le tampon.
+
+        Args:
+            flush_interval_seconds: Intervalle entre chaque écriture en base (en secondes)
+        """
+        self.flush_interval_seconds = flush_interval_seconds
+        self.is_running = False
+        self.task = None
+
+        self._lock = threading.Lock()
+        self._pending: Dict[str, dict] = {}
+
+        # Statistiques
+        self.recorded = 0
+        self.flushed_rows = 0
+        self.last_flush_at: Optional[datetime] = None
+
+    def _merge(self, device_id: str, values: dict):
+        """Fusionne une télémétrie avec celle déjà en attente pour ce terminal."""
+        current = self._pending.get(device_id)
+        if current is None:
+            self._pending[device_id] = values
+            return
+
+        if values["last_seen_at"] >= current["last_seen_at"]:
+            current["last_seen_at"] = values["last_seen_at"]
+        for field in TELEMETRY_FIELDS:
+            if values.get(field) is not None:
+                current[field] = values[field]
+
+    def _requeue(self, pending: Dict[str, dict]):
+        """Remet en attente une télémétrie non écrite sans écraser une valeur plus récente."""
+        with self._lock:
+            for device_id, values in pending.items():
+                current = self._pending.get(device_id)
+                if current is None:
+                    self._pending[device_id] = values
+                    continue
+                current["last_seen_at"] = max(current["last_seen_at"], values["last_seen_at"])
+                for field in TELEMETRY_FIELDS:
+                    if current.get(field) is None:
+                        current[field] = values.get(field)
+
+    def record_seen(self, device_id: str, seen_at: Optional[datetime] = None):
+        """Enregistre qu'un terminal a communiqué (pointage)."""
+        values = {"last_seen_at": seen_at or datetime.now(timezone.utc)}
+        with self._lock:
+            self._merge(device_id, values)
+            self.recorded += 1
+
+    def record_heartbeat(self, device_id: str, heartbeat_data: DeviceHeartbeatUpdate):
+        """Enregistre un heartbeat complet d'un terminal."""
+        values = {
+            "last_seen_at": heartbeat_data.last_seen_at,
+            "firmware_version": heartbeat_data.firmware_version,
+            "battery_level": heartbeat_data.battery_level,
+            "wifi_rssi": heartbeat_data.wifi_rssi,
+        }
+        with self._lock:
+            self._merge(device_id, values)
+            self.recorded += 1
+
+    def flush(self) -> int:
+        """
+        Applique la télémétrie en attente en un seul UPDATE.
+
+        Returns:
+            Le nombre de terminaux mis à jour
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        rows = [
+            {
+                "id": device_id,
+                "last_seen_at": values["last_seen_at"],
+                **{field: values.get(field) for field in TELEMETRY_FIELDS},
+            }
+            for device_id, values in pending.items()
+        ]
+
+        try:
+            with SessionLocal() as db:
+                updated = crud_device.apply_telemetry_many(db, rows=rows)
+        except Exception as e:
+            self._requeue(pending)
+            logger.error(f"Erreur écriture télémétrie ({len(rows)} terminaux): {e}")
+            return 0
+
+        self.flushed_rows += updated
+        self.last_flush_at = datetime.now(timezone.utc)
+        logger.debug(f"Télémétrie: {updated} terminal(aux) mis à jour")
+        return updated
+
+    async def _flush_loop(self):
+        """
+        Boucle de vidage qui s'exécute à intervalle régulier.
+        """
+        logger.info(
+            f"Device telemetry buffer started (flush interval: {self.flush_interval_seconds}s)"
+        )
+
+        while self.is_running:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Error in telemetry flush loop: {str(e)}")
+
+    def start(self):
+        """
+        Démarre le vidage périodique.
+        """
+        if self.is_running:
+            logger.warning("Device telemetry buffer is already running")
+            return
+
+        self.is_running = True
+        self.task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """
+        Arrête le vidage périodique et écrit la télémétrie restante.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        await asyncio.to_thread(self.flush)
+        logger.info("Device telemetry buffer stopped")
+
+    def get_status(self) -> dict:
+        """
+        Retourne le statut actuel du tampon.
+        """
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "is_running": self.is_running,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            "pending_devices": pending,
+            "recorded": self.recorded,
+            "flushed_rows": self.flushed_rows,
+            "last_flush_at": self.last_flush_at,
+        }
+
+
+# Instance globale du tampon de télémétrie
+device_telemetry = DeviceTelemetryBuffer(
+    flush_interval_seconds=settings.DEVICE_TELEMETRY_FLUSH_INTERVAL_SECONDS
+)
@@ -0,0 +1,197 @@
+"""
+Calcul des totaux des listes paginées.
+
+Chaque liste paginée exécutait un `query.count()` exact à côté de la
+requête de page : sur les grosses organisations, le comptage coûte autant
+que la page elle-même. La stratégie est choisie par ressource
+(`COUNT_STRATEGIES`) :
+
+- "exact" : `SELECT count(*)` à chaque requête
+- "cached" : total exact mis en cache `COUNT_CACHE_TTL_SECONDS` secondes,
+  par ressource et jeu de filtres
+- "estimate" : estimation du planificateur PostgreSQL (`reltuples` sans
+  filtre, `EXPLAIN` sinon) ; en dessous de `COUNT_ESTIMATE_THRESHOLD` lignes
+  estimées, le total exact reste bon marché et il est calculé
+
+La réponse indique le type du total (`total_kind`) : "exact", "cached" ou
+"estimate", null si le total n'a pas été demandé (`include_total=false`).
+"""
+import json
+import logging
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query, Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATE = "estimate"
+
+
+class ListCounter:
+    """
+    Totaux des listes paginées selon la stratégie de chaque ressource.
+    Thread-safe : utilisé depuis les threads des endpoints synchrones.
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, str],
+        cache_ttl_seconds: int = 30,
+        estimate_threshold: int = 100000,
+        max_cache_entries: int = 10000,
+    ):
+        """
+        Initialise le compteur.
+
+        Args:
+            strategies: Stratégie par ressource ("exact" par défaut)
+            cache_ttl_seconds: Durée de vie d'un total en cache (en secondes)
+            estimate_threshold: Nombre de lignes estimées à partir duquel
+                l'estimation remplace le comptage exact
+            max_cache_entries: Nombre maximum de totaux en cache
+        """
+        self.strategies = strategies
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.estimate_threshold = estimate_threshold
+        self.max_cache_entries = max_cache_entries
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, Hashable], Tuple[float, int]] = {}
+
+        # Statistiques
+        self.exact_counts = 0
+        self.cache_hits = 0
+        self.estimates = 0
+
+    def strategy_for(self, resource: str) -> str:
+        return self.strategies.get(resource, COUNT_EXACT)
+
+    def count(
+        self,
+        db: Session,
+        query: Query,
+        *,
+        resource: str,
+        filters: Hashable = (),
+        include_total: bool = True,
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Compte les lignes de `query` (avant tri et pagination).
+
+        Args:
+            resource: Nom de la ressource (clé de `COUNT_STRATEGIES`)
+            filters: Filtres appliqués à la requête (clé du cache)
+            include_total: False pour ne pas calculer de total
+
+        Returns:
+            (total, type du total), (None, None) si le total n'est pas demandé
+        """
+        if not include_total:
+            return None, None
+
+        strategy = self.strategy_for(resource)
+        if strategy == COUNT_CACHED:
+            return self._cached_count(query, (resource, filters))
+        if strategy == COUNT_ESTIMATE:
+            estimate = self._estimate(db, query, unfiltered=not any(filters))
+            if estimate is not None and estimate >= self.estimate_threshold:
+                self.estimates += 1
+                return estimate, COUNT_ESTIMATE
+        return self._exact_count(query), COUNT_EXACT
+
+    def _exact_count(self, query: Query) -> int:
+        self.exact_counts += 1
+        return query.order_by(None).count()
+
+    def _cached_count(self, query: Query, key: Tuple[str, Hashable]) -> Tuple[int, str]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                self.cache_hits += 1
+                return cached[1], COUNT_CACHED
+
+        total = self._exact_count(query)
+        with self._lock:
+            if len(self._cache) >= self.max_cache_entries:
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+                if len(self._cache) >= self.max_cache_entries:
+                    self._cache.clear()
+            self._cache[key] = (now + self.cache_ttl_seconds, total)
+        return total, COUNT_EXACT
+
+    def _estimate(self, db: Session, query: Query, unfiltered: bool) -> Optional[int]:
+        """
+        Estimation du planificateur, None si elle n'est pas disponible
+        (base autre que PostgreSQL, table jamais analysée, erreur).
+        """
+        dialect = db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+
+        try:
+            with db.begin_nested():
+                if unfiltered:
+                    table = query.column_descriptions[0]["entity"].__tablename__
+                    row = db.execute(
+                        text(
+                            "SELECT parent.relkind, parent.reltuples, ("
+                            "    SELECT sum(child.reltuples) FILTER (WHERE child.reltuples >= 0) "
+                            "    FROM pg_inherits "
+                            "    JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                            "    WHERE pg_inherits.inhparent = parent.oid"
+                            ") FROM pg_class parent WHERE parent.oid = to_regclass(:table)"
+                        ),
+                        {"table": table},
+                    ).first()
+                    if row is None:
+                        return None
+                    relkind, reltuples, partitions_reltuples = row
+                    # Une table partitionnée n'est jamais analysée par l'autovacuum :
+                    # somme des partitions analysées
+                    if relkind == "p":
+                        reltuples = partitions_reltuples
+                    # -1 : table jamais analysée (PostgreSQL 14+)
+                    return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+                statement = query.enable_eagerloads(False).order_by(None).statement
+                compiled = statement.compile(dialect=dialect)
+                plan = db.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                ).scalar()
+        except SQLAlchemyError as e:
+            logger.warning(f"Estimation du nombre de lignes impossible: {e}")
+            return None
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_stats(self) -> dict:
+        """Retourne les statistiques des comptages."""
+        with self._lock:
+            entries = len(self._cache)
+        return {
+            "strategies": self.strategies,
+            "cache_entries": entries,
+            "cache_ttl_seconds": self.cache_ttl_seconds,
+            "estimate_threshold": self.estimate_threshold,
+            "exact_counts": self.exact_counts,
+            "cache_hits": self.cache_hits,
+            "estimates": self.estimates,
+        }
+
+
+# Instance globale du compteur des listes paginées
+list_counter = ListCounter(
+    strategies=settings.COUNT_STRATEGIES,
+    cache_ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS,
+    estimate_threshold=settings.COUNT_ESTIMATE_THRESHOLD,
+)
@@ -9,24 +9,36 @@ Fonctionnalités:
 """
 import json
 import logging
-import asyncio
+import os
 import ssl
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import paho.mqtt.client as mqtt
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.crud.attendance import attendance as crud_attendance
-from app.crud.employee import employee as crud_employee
-from app.crud.device import device as crud_device
-from app.schemas.attendance import AttendanceCreate, Attendance
+from app.schemas.attendance import (
+    AttendanceCreate,
+    Attendance,
+    AttendanceEmployee,
+    AttendanceDevice,
+)
 from app.schemas.device_command import DeviceCommandCode, DeviceCommandType, COMMAND_TYPE_TO_CODE
 from app.schemas.device import DeviceHeartbeatUpdate
 from app.db.session import SessionLocal
-from app.websocket.connection_manager import manager
+from app.services.attendance_ingest import AttendanceIngestQueue, IngestItem
+from app.services.badge_directory import badge_directory, BadgeEntry, DeviceEntry
+from app.services.device_telemetry import device_telemetry
+from app.services.device_stats import device_stats
+from app.services.dashboard_snapshots import dashboard_snapshots
+from app.services.daily_presence import daily_presence_tracker
+from app.websocket.connection_manager import subscription_keys
+from app.websocket.event_bridge import realtime_bridge
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,14 +55,6 @@ def get_greeting() -> str:
         return "Bonsoir"
 
 
-# Récupérer la boucle d'événements asyncio principale
-try:
-    loop = asyncio.get_running_loop()
-except RuntimeError:
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-
 class MQTTClient:
     """
     Client MQTT pour la gestion des appareils IoT.
@@ -60,6 +64,13 @@ class MQTTClient:
     - kuilinga/devices/{serial}/response : Envoi des réponses de validation
     - kuilinga/devices/{serial}/command : Envoi des commandes administratives
     - kuilinga/devices/{serial}/status : Réception du statut des appareils
+
+    Mode groupe de consommateurs (MQTT_SHARED_SUBSCRIPTION_GROUP défini):
+    le client se connecte en MQTT v5 et s'abonne via des abonnements
+    partagés ($share/<groupe>/...). Le broker répartit alors chaque message
+    entrant sur un seul membre du groupe, quel que soit le nombre de workers
+    ou d'hôtes. La publication (réponses, commandes) reste possible depuis
+    n'importe quel worker.
     """
 
     # Topics MQTT
@@ -68,17 +79,34 @@ class MQTTClient:
     TOPIC_COMMAND = "kuilinga/devices/{serial}/command"
     TOPIC_STATUS = "kuilinga/devices/{serial}/status"
 
+    # Topics d'abonnement (tous les appareils)
+    SUBSCRIBE_ATTENDANCE = "kuilinga/devices/+/attendance"
+    SUBSCRIBE_STATUS = "kuilinga/devices/+/status"
+
     def __init__(self):
+        self.shared_group = settings.MQTT_SHARED_SUBSCRIPTION_GROUP
+        # Les abonnements partagés sont définis par MQTT v5
+        self.protocol = mqtt.MQTTv5 if self.shared_group else mqtt.MQTTv311
+
         # Utiliser la version callback_api_version pour éviter les warnings
+        # Le PID distingue les workers démarrés au même instant
         self.client = mqtt.Client(
             callback_api_version=mqtt.CallbackAPIVersion.VERSION1,
-            client_id=f"kuilinga-backend-{datetime.now().timestamp()}"
+            client_id=f"kuilinga-backend-{os.getpid()}-{datetime.now().timestamp()}",
+            protocol=self.protocol,
         )
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message
         self.client.on_disconnect = self.on_disconnect
         self.connected = False
 
+        # File d'ingestion des pointages (écriture par lots)
+        self.ingest_queue = AttendanceIngestQueue(
+            max_size=settings.MQTT_INGEST_QUEUE_SIZE,
+            batch_size=settings.MQTT_INGEST_BATCH_SIZE,
+            max_linger_ms=settings.MQTT_INGEST_MAX_LINGER_MS,
+        )
+
         # Configuration authentification
         if settings.MQTT_USERNAME and settings.MQTT_PASSWORD:
             self.client.username_pw_set(settings.MQTT_USERNAME, settings.MQTT_PASSWORD)
@@ -141,30 +169,43 @@ class MQTTClient:
 
     def start(self):
         """Démarre le client MQTT en mode non-bloquant."""
+        self.ingest_queue.start(self._process_attendance_batch)
         self.connect()
         self.client.loop_start()
 
     def stop(self):
         """Arrête le client MQTT proprement."""
         logger.info("Arrêt du client MQTT...")
+        # Écrire les pointages en attente tant que les réponses peuvent partir
+        self.ingest_queue.stop()
         self.client.loop_stop()
         self.client.disconnect()
         self.connected = False
 
-    def on_connect(self, client, userdata, flags, rc):
+    def _subscription_topic(self, topic: str) -> str:
+        """Préfixe le topic par $share/<groupe>/ en mode groupe de consommateurs."""
+        if self.shared_group:
+            return f"$share/{self.shared_group}/{topic}"
+        return topic
+
+    def on_connect(self, client, userdata, flags, rc, properties=None):
         """Callback appelé lors de la connexion au broker."""
         if rc == 0:
             logger.info("Connecté au broker MQTT avec succès")
             self.connected = True
 
             # S'abonner aux topics de pointage et de statut
-            attendance_topic = "kuilinga/devices/+/attendance"
-            status_topic = "kuilinga/devices/+/status"
+            attendance_topic = self._subscription_topic(self.SUBSCRIBE_ATTENDANCE)
+            status_topic = self._subscription_topic(self.SUBSCRIBE_STATUS)
 
             client.subscribe(attendance_topic)
             client.subscribe(status_topic)
 
             logger.info(f"Abonné aux topics: {attendance_topic}, {status_topic}")
+        elif self.protocol == mqtt.MQTTv5:
+            # En MQTT v5, rc est un ReasonCode qui porte son propre libellé
+            logger.error(f"Échec de connexion MQTT: {rc}")
+            self.connected = False
         else:
             error_messages = {
                 1: "Version de protocole incorrecte",
@@ -177,7 +218,7 @@ class MQTTClient:
             logger.error(f"Échec de connexion MQTT: {error_msg}")
             self.connected = False
 
-    def on_disconnect(self, client, userdata, rc):
+    def on_disconnect(self, client, userdata, rc, properties=None):
         """Callback appelé lors de la déconnexion."""
         self.connected = False
         if rc != 0:
@@ -199,7 +240,7 @@ class MQTTClient:
             message_type = topic_parts[3]
 
             if message_type == "attendance":
-                self._handle_attendance_message(client, device_serial, msg.payload)
+                self._enqueue_attendance(device_serial, msg.payload)
             elif message_type == "status":
                 self._handle_status_message(device_serial, msg.payload)
             else:
@@ -208,92 +249,192 @@ class MQTTClient:
         except Exception as e:
             logger.error(f"Erreur traitement message MQTT: {e}", exc_info=True)
 
-    def _handle_attendance_message(self, client, device_serial: str, payload: bytes):
+    def _enqueue_attendance(self, device_serial: str, payload: bytes):
         """
-        Traite un message de pointage depuis un appareil IoT.
+        Dépose un pointage dans la file d'ingestion.
 
-        Logique de validation:
-        1. Vérifie si l'appareil existe → sinon ignore
-        2. Vérifie si le badge existe → REJECTED (0x108080)
-        3. Vérifie si l'employé/badge est actif → REFUSED (0x003020)
-        4. Enregistre le pointage → ACCEPTED (0x001020)
+        Seul le décodage JSON est fait sur le thread MQTT : la validation
+        et l'écriture en base sont faites par lots (_process_attendance_batch).
         """
         try:
             data = json.loads(payload.decode())
-            badge_id = data.get("badge_id")
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON invalide dans le message de pointage: {e}")
+            return
 
-            if not badge_id:
-                logger.error("Message de pointage sans badge_id")
-                return
+        badge_id = data.get("badge_id")
+        if not badge_id:
+            logger.error("Message de pointage sans badge_id")
+            return
 
-            with SessionLocal() as db:
-                # 1. Vérifier l'appareil
-                device = crud_device.get_by_serial(db, serial_number=device_serial)
+        self.ingest_queue.submit(
+            IngestItem(device_serial=device_serial, badge_id=badge_id, data=data)
+        )
+
+    def _process_attendance_batch(self, batch: List[IngestItem]):
+        """
+        Valide et enregistre un lot de pointages depuis les appareils IoT.
+
+        Logique de validation (pour chaque pointage):
+        1. Vérifie si l'appareil existe → sinon ignore
+        2. Vérifie si le badge existe → REJECTED (0x108080)
+        3. Vérifie si l'employé/badge est actif → REFUSED (0x003020)
+        4. Enregistre le pointage → ACCEPTED (0x001020)
+
+        Les appareils et employés du lot sont résolus via l'annuaire en
+        mémoire (badge_directory) : la base n'est interrogée que pour les
+        entrées absentes du cache. Les pointages acceptés sont insérés en un
+        seul INSERT multi-lignes et le lot est validé par un seul commit ; si
+        le lot échoue, les pointages sont réessayés un par un et ceux qui
+        échouent encore reçoivent REJECTED (voir _insert_attendances).
+        Les réponses aux appareils ne sont envoyées qu'après ce commit.
+        """
+        responses = []
+        broadcasts = []
+
+        with SessionLocal() as db:
+            # 1. Résoudre les appareils et les employés du lot
+            devices = badge_directory.resolve_devices(
+                db, [item.device_serial for item in batch]
+            )
+            employees = badge_directory.resolve_badges(
+                db, [item.badge_id for item in batch]
+            )
+
+            accepted = []
+
+            for item in batch:
+                device = devices.get(item.device_serial)
                 if not device:
-                    logger.error(f"Appareil inconnu: {device_serial}")
-                    return
+                    logger.error(f"Appareil inconnu: {item.device_serial}")
+                    continue
 
-                # Mettre à jour last_seen_at car le device communique
-                crud_device.update_last_seen(db, device=device)
+                # Le device communique : last_seen_at sera mis à jour (écriture différée)
+                device_telemetry.record_seen(device.device_id)
 
                 # 2. Vérifier le badge/employé
-                employee = crud_employee.get_by_badge(db, badge_id=badge_id)
-
+                employee = employees.get(item.badge_id)
                 if not employee:
                     # Badge non trouvé en base → REJECTED
-                    logger.warning(f"Badge inconnu: {badge_id}")
-                    self._send_validation_response(
-                        client, device_serial,
-                        DeviceCommandCode.REJECTED,
-                        "Badge non reconnu"
-                    )
-                    return
+                    logger.warning(f"Badge inconnu: {item.badge_id}")
+                    responses.append((
+                        item.device_serial, DeviceCommandCode.REJECTED,
+                        "Badge non reconnu", {}
+                    ))
+                    continue
 
-                # 3. Vérifier si l'employé est actif (si le champ existe)
-                is_active = getattr(employee, 'is_active', True)
-                badge_active = getattr(employee, 'badge_active', True)
+                # 3. Vérifier si l'employé est actif
+                employee_name = employee.full_name
 
-                if not is_active or not badge_active:
+                if not employee.is_active or not employee.badge_active:
                     # Badge désactivé par l'admin → REFUSED
-                    logger.warning(f"Badge désactivé: {badge_id} (employé: {employee.id})")
-                    self._send_validation_response(
-                        client, device_serial,
-                        DeviceCommandCode.REFUSED,
-                        "Badge désactivé",
-                        employee_name=f"{employee.first_name} {employee.last_name}"
+                    logger.warning(f"Badge désactivé: {item.badge_id} (employé: {employee.employee_id})")
+                    responses.append((
+                        item.device_serial, DeviceCommandCode.REFUSED,
+                        "Badge désactivé", {"employee_name": employee_name}
+                    ))
+                    continue
+
+                # 4. Préparer le pointage → ACCEPTED
+                attendance_type = item.data.get("type", "in")
+                try:
+                    attendance_in = AttendanceCreate(
+                        timestamp=item.data.get("timestamp", item.received_at.isoformat()),
+                        type=attendance_type,
+                        employee_id=employee.employee_id,
+                        device_id=device.device_id,
                     )
-                    return
-
-                # 4. Enregistrer le pointage → ACCEPTED
-                attendance_in = AttendanceCreate(
-                    timestamp=data.get("timestamp", datetime.now().isoformat()),
-                    type=data.get("type", "in"),
-                    employee_id=employee.id,
-                    device_id=device.id,
+                except ValidationError as e:
+                    logger.error(f"Pointage invalide de {item.device_serial}: {e}")
+                    continue
+
+                accepted.append((attendance_in, employee, device, item))
+
+            inserted, failed = self._insert_attendances(db, accepted)
+            for _, _, employee, _, item in inserted:
+                responses.append((
+                    item.device_serial, DeviceCommandCode.ACCEPTED,
+                    f"{get_greeting()} {employee.full_name}",
+                    {"employee_name": employee.full_name, "attendance_type": item.data.get("type", "in")}
+                ))
+            for _, employee, _, item in failed:
+                responses.append((
+                    item.device_serial, DeviceCommandCode.REJECTED,
+                    "Pointage non enregistré", {"employee_name": employee.full_name}
+                ))
+
+            rows = [row for row, _, _, _, _ in inserted]
+            accepted = [(attendance_in, employee, device) for _, attendance_in, employee, device, _ in inserted]
+            # Dernier pointage / pointages du jour des terminaux (écriture différée)
+            device_stats.record_many(rows)
+            # Présences du jour par organisation et site (écriture différée)
+            for row, (_, employee, _) in zip(rows, accepted):
+                daily_presence_tracker.record(
+                    employee.organization_id, employee.site_id, employee.employee_id, row["timestamp"]
                 )
+            # Tableaux de bord des organisations concernées à recalculer
+            dashboard_snapshots.invalidate_many(employee.organization_id for _, employee, _ in accepted)
 
-                new_attendance = crud_attendance.create(db, obj_in=attendance_in)
-                logger.info(f"Pointage enregistré pour {employee.first_name} {employee.last_name}")
+            for row, (_, employee, device) in zip(rows, accepted):
+                broadcasts.append((
+                    self._build_attendance_payload(row, employee, device),
+                    subscription_keys(
+                        employee.organization_id, employee.site_id, employee.department_id
+                    ),
+                ))
 
-                # Envoyer la réponse ACCEPTED avec salutation
-                greeting = get_greeting()
-                employee_name = f"{employee.first_name} {employee.last_name}"
+        if rows:
+            logger.info(f"{len(rows)} pointage(s) enregistré(s) (lot de {len(batch)} messages)")
 
-                self._send_validation_response(
-                    client, device_serial,
-                    DeviceCommandCode.ACCEPTED,
-                    f"{greeting} {employee_name}",
-                    employee_name=employee_name,
-                    attendance_type=data.get("type", "in")
-                )
+        # Envoyer les réponses après le commit
+        for device_serial, code, message, extra in responses:
+            self._send_validation_response(self.client, device_serial, code, message, **extra)
 
-                # Diffuser via WebSocket
-                self._broadcast_attendance(db, new_attendance)
+        # Diffuser via WebSocket
+        for attendance_data, keys in broadcasts:
+            self._broadcast_attendance(attendance_data, keys)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON invalide dans le message de pointage: {e}")
-        except Exception as e:
-            logger.error(f"Erreur traitement pointage: {e}", exc_info=True)
+    def _insert_attendances(self, db: Session, accepted: list):
+        """
+        Insère les pointages acceptés en une seule transaction. Si elle échoue
+        (badge ou terminal supprimé depuis la mise en cache, valeur hors
+        limites...), annule et réessaie pointage par pointage.
+
+        Returns:
+            (insérés, en échec) : les insérés sont des tuples
+            (ligne, attendance_in, employé, appareil, message), les
+            pointages en échec gardent la forme de `accepted`
+        """
+        if not accepted:
+            return [], []
+
+        try:
+            rows = crud_attendance.create_many(
+                db, objs_in=[attendance_in for attendance_in, _, _, _ in accepted]
+            )
+            db.commit()
+            return [(row, *entry) for row, entry in zip(rows, accepted)], []
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(
+                f"Échec du lot de {len(accepted)} pointage(s), nouvel essai pointage par pointage: {e}"
+            )
+
+        inserted, failed = [], []
+        for entry in accepted:
+            attendance_in, employee, device, item = entry
+            try:
+                rows = crud_attendance.create_many(db, objs_in=[attendance_in])
+                db.commit()
+                inserted.append((rows[0], *entry))
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.error(f"Pointage rejeté ({item.device_serial}, badge {item.badge_id}): {e}")
+                # L'annuaire peut référencer un badge ou un terminal supprimé
+                badge_directory.invalidate_badge(item.badge_id)
+                badge_directory.invalidate_device(item.device_serial)
+                failed.append(entry)
+        return inserted, failed
 
     def _send_validation_response(
         self,
@@ -344,59 +485,68 @@ class MQTTClient:
             logger.info(f"Heartbeat reçu de {device_serial}: {data}")
 
             with SessionLocal() as db:
-                device = crud_device.get_by_serial(db, serial_number=device_serial)
-                if not device:
-                    logger.warning(f"Heartbeat ignoré - appareil inconnu: {device_serial}")
-                    return
-
-                # Construire l'objet de mise à jour du heartbeat
-                heartbeat_data = DeviceHeartbeatUpdate(
-                    last_seen_at=datetime.now(),
-                    firmware_version=data.get("firmware_version"),
-                    battery_level=data.get("battery_level"),
-                    wifi_rssi=data.get("wifi_rssi")
-                )
+                device = badge_directory.get_device(db, device_serial)
+            if not device:
+                logger.warning(f"Heartbeat ignoré - appareil inconnu: {device_serial}")
+                return
 
-                # Mettre à jour le device en base
-                crud_device.update_heartbeat(
-                    db,
-                    device=device,
-                    heartbeat_data=heartbeat_data
-                )
+            # Construire l'objet de mise à jour du heartbeat
+            heartbeat_data = DeviceHeartbeatUpdate(
+                last_seen_at=datetime.now(timezone.utc),
+                firmware_version=data.get("firmware_version"),
+                battery_level=data.get("battery_level"),
+                wifi_rssi=data.get("wifi_rssi")
+            )
 
-                logger.info(
-                    f"Appareil {device_serial} mis à jour: ONLINE, "
-                    f"firmware={heartbeat_data.firmware_version}, "
-                    f"battery={heartbeat_data.battery_level}%, "
-                    f"rssi={heartbeat_data.wifi_rssi}dBm"
-                )
+            # Mettre à jour le device (écriture différée, voir device_telemetry)
+            device_telemetry.record_heartbeat(device.device_id, heartbeat_data)
+
+            logger.info(
+                f"Appareil {device_serial} mis à jour: ONLINE, "
+                f"firmware={heartbeat_data.firmware_version}, "
+                f"battery={heartbeat_data.battery_level}%, "
+                f"rssi={heartbeat_data.wifi_rssi}dBm"
+            )
 
         except json.JSONDecodeError as e:
             logger.error(f"JSON invalide dans le heartbeat de {device_serial}: {e}")
         except Exception as e:
             logger.error(f"Erreur traitement heartbeat: {e}", exc_info=True)
 
-    def _broadcast_attendance(self, db: Session, attendance):
-        """Diffuse un nouveau pointage via WebSocket."""
-        try:
-            db.refresh(attendance)
-            enriched = crud_attendance.get(db, id=attendance.id)
-
-            if enriched:
-                attendance_schema = Attendance.from_orm(enriched)
-                message = {
-                    "type": "new_attendance",
-                    "payload": attendance_schema.dict()
-                }
-
-                future = asyncio.run_coroutine_threadsafe(
-                    manager.broadcast(json.dumps(message, default=str)),
-                    loop
-                )
-                future.result()
+    @staticmethod
+    def _build_attendance_payload(row: dict, employee: BadgeEntry, device: DeviceEntry) -> dict:
+        """Construit le payload d'un pointage inséré sans relire la base."""
+        return Attendance(
+            id=row["id"],
+            timestamp=row["timestamp"],
+            type=row["type"],
+            geo=row.get("geo"),
+            extra_data=row.get("extra_data"),
+            employee=AttendanceEmployee(
+                id=employee.employee_id,
+                first_name=employee.first_name,
+                last_name=employee.last_name,
+                employee_number=employee.employee_number,
+            ),
+            device=AttendanceDevice(
+                id=device.device_id,
+                serial_number=device.serial_number,
+                type=device.type,
+            ),
+        ).model_dump()
+
+    def _broadcast_attendance(self, attendance_data: dict, keys: List[str]):
+        """
+        Diffuse un nouveau pointage via WebSocket aux abonnés concernés
+        (organisation, site, département de l'employé).
 
-        except Exception as e:
-            logger.error(f"Erreur broadcast WebSocket: {e}")
+        L'événement est confié au pont temps réel, vidé par la boucle
+        asyncio de l'application : l'ingestion n'attend jamais les clients.
+        """
+        realtime_bridge.publish({
+            "type": "new_attendance",
+            "payload": attendance_data
+        }, keys)
 
     def send_command(self, device_serial: str, command: DeviceCommandType) -> bool:
         """
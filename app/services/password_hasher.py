@@ -0,0 +1,169 @@
+"""
+Pool borné pour le hachage et la vérification des mots de passe (bcrypt).
+
+Un calcul bcrypt prend ~250ms. Exécuté directement dans les endpoints
+synchrones, il occupait un thread du pool partagé de FastAPI : à la prise de
+poste, une rafale de logins affamait tous les autres endpoints synchrones.
+
+Les calculs passent par un pool dédié de `max_workers` threads (bcrypt
+libère le GIL). Au-delà de `max_pending` calculs en cours ou en attente, la
+demande est refusée immédiatement (`PasswordHasherBusy`, réponse 503) au lieu
+de bloquer un thread de plus. Les endpoints asynchrones (login, changement de
+mot de passe) attendent le résultat avec les variantes `*_async`, sans
+occuper de thread du pool partagé pendant l'attente et le calcul.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Le pool de hachage est saturé : la demande est refusée sans attendre."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Service d'authentification saturé, réessayez plus tard")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Hachage/vérification bcrypt sur un pool de threads borné.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 4, max_pending: int = 32):
+        """
+        Initialise le pool.
+
+        Args:
+            rounds: Coût bcrypt des nouveaux hashs ; les hashs d'un autre coût
+                sont recalculés au prochain login réussi
+            max_workers: Nombre de calculs bcrypt simultanés
+            max_pending: Nombre max de calculs en cours ou en attente
+        """
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        # Statistiques
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_wait_ms = 0.0
+        self.total_compute_ms = 0.0
+
+    def _submit(self, func: Callable[..., T], *args) -> Future:
+        """Soumet un calcul au pool, ou lève PasswordHasherBusy s'il est saturé."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self.total_wait_ms += (started_at - submitted_at) * 1000
+                    self.total_compute_ms += (finished_at - started_at) * 1000
+
+        def done(_future: Future):
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(done)
+        return future
+
+    def _run(self, func: Callable[..., T], *args) -> T:
+        """Exécute un calcul en bloquant le thread appelant."""
+        return self._submit(func, *args).result()
+
+    async def _run_async(self, func: Callable[..., T], *args) -> T:
+        """Exécute un calcul sans occuper de thread pendant l'attente."""
+        return await asyncio.wrap_future(self._submit(func, *args))
+
+    def hash(self, password: str) -> str:
+        return self._run(self.context.hash, password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(self.context.hash, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(self.context.verify, password, hashed_password)
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        return await self._run_async(self.context.verify, password, hashed_password)
+
+    def _count_rehash(self, new_hash: Optional[str]):
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Vérifie un mot de passe et retourne, si le hash a été calculé avec un
+        autre coût (ou schéma), le nouveau hash à enregistrer.
+        """
+        valid, new_hash = self._run(self.context.verify_and_update, password, hashed_password)
+        self._count_rehash(new_hash)
+        return valid, new_hash
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Variante asynchrone de `verify_and_update`."""
+        valid, new_hash = await self._run_async(self.context.verify_and_update, password, hashed_password)
+        self._count_rehash(new_hash)
+        return valid, new_hash
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> dict:
+        """Retourne les statistiques du pool."""
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "rounds": self.rounds,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_wait_ms": round(self.total_wait_ms / completed, 2),
+                "avg_compute_ms": round(self.total_compute_ms / completed, 2),
+            }
+
+
+# Instance globale du pool de hachage
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
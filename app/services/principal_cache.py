@@ -0,0 +1,136 @@
+"""
+Cache des utilisateurs authentifiés (principals).
+
+Chaque requête protégée chargeait la ligne `users` puis parcourait
+`user.roles` -> `role.permissions` (requêtes paresseuses) pour reconstruire
+l'ensemble des permissions. Le principal garde les champs utiles aux
+contrôles d'accès et un frozenset des permissions : la vérification d'une
+permission devient une simple opération d'ensemble en mémoire.
+
+- Chaque entrée expire après `ttl_seconds` (filet de sécurité, notamment
+  pour les modifications faites par un autre worker)
+- Un compteur de version, incrémenté à chaque modification des rôles, des
+  permissions ou de leurs affectations, invalide toutes les entrées
+- Une modification d'un utilisateur (ou de son employé) invalide son entrée
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Utilisateur authentifié, réduit aux champs utiles aux contrôles d'accès."""
+    user_id: str
+    is_active: bool
+    is_superuser: bool
+    organization_id: Optional[str]
+    employee_id: Optional[str]
+    department_id: Optional[str]
+    roles: FrozenSet[str]
+    permissions: FrozenSet[str]
+
+    def has_permissions(self, required: Iterable[str]) -> bool:
+        return self.is_superuser or self.permissions.issuperset(required)
+
+    def has_role(self, role: str) -> bool:
+        return self.is_superuser or role in self.roles
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        employee = user.employee
+        return cls(
+            user_id=user.id,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            organization_id=user.organization_id,
+            employee_id=employee.id if employee else None,
+            department_id=employee.department_id if employee else None,
+            roles=frozenset(role.name for role in user.roles),
+            permissions=frozenset(
+                permission.name for role in user.roles for permission in role.permissions
+            ),
+        )
+
+
+class PrincipalCache:
+    """
+    Cache des principals par user_id.
+    Thread-safe : utilisé depuis les threads des endpoints synchrones.
+    """
+
+    def __init__(self, ttl_seconds: int = 60):
+        """
+        Initialise le cache.
+
+        Args:
+            ttl_seconds: Durée de vie d'une entrée (en secondes)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, int, Principal]] = {}
+
+        # Statistiques
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, user_id: str) -> Optional[Principal]:
+        """
+        Retourne le principal d'un utilisateur, chargé en base (rôles et
+        permissions en une requête chacun) s'il est absent ou périmé.
+        """
+        from app.crud.user import user as crud_user
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached and cached[1] == self.version and now - cached[0] < self.ttl_seconds:
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+            version = self.version
+
+        user = crud_user.get_with_permissions(db, id=user_id)
+        if not user:
+            return None
+        principal = Principal.from_user(user)
+        with self._lock:
+            # Une modification concurrente rend ce chargement obsolète
+            if version == self.version:
+                self._entries[user_id] = (now, version, principal)
+        return principal
+
+    def bump_version(self):
+        """Invalide toutes les entrées (rôles, permissions ou affectations modifiés)."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def invalidate(self, *user_ids: Optional[str]):
+        """Invalide les entrées d'utilisateurs modifiés."""
+        with self._lock:
+            for user_id in user_ids:
+                if user_id:
+                    self._entries.pop(user_id, None)
+
+    def get_stats(self) -> dict:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "version": self.version,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Instance globale du cache des principals
+principal_cache = PrincipalCache(ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS)
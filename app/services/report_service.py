@@ -16,6 +16,7 @@ from app.models.employee import Employee
 from app.crud.organization import organization as org_crud
 from app.crud.employee import employee as employee_crud
 from app.schemas.report import AttendanceReportRow, AttendanceReport
+from app.utils.helpers import date_range_bounds
 
 
 class ReportService:
@@ -119,15 +120,14 @@ class ReportService:
         status: AttendanceStatus
     ) -> int:
         """Compter les pointages par statut"""
-        start_dt = datetime.combine(start_date, datetime.min.time())
-        end_dt = datetime.combine(end_date, datetime.max.time())
+        start_dt, end_dt = date_range_bounds(start_date, end_date)
         
         # Compter les jours uniques avec ce statut
         count = db.query(func.count(func.distinct(func.date(Attendance.timestamp)))).filter(
             Attendance.employee_id == employee_id,
             Attendance.status == status,
             Attendance.timestamp >= start_dt,
-            Attendance.timestamp <= end_dt
+            Attendance.timestamp < end_dt
         ).scalar()
         
         return count or 0
@@ -140,14 +140,13 @@ class ReportService:
         end_date: date
     ) -> float:
         """Calculer le total d'heures travaillées"""
-        start_dt = datetime.combine(start_date, datetime.min.time())
-        end_dt = datetime.combine(end_date, datetime.max.time())
+        start_dt, end_dt = date_range_bounds(start_date, end_date)
         
         # Récupérer tous les pointages
         attendances = db.query(Attendance).filter(
             Attendance.employee_id == employee_id,
             Attendance.timestamp >= start_dt,
-            Attendance.timestamp <= end_dt
+            Attendance.timestamp < end_dt
         ).order_by(Attendance.timestamp).all()
         
         total_hours = 0.0
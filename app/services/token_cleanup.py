@@ -2,11 +2,17 @@
 Service de nettoyage des tokens blacklistés expirés.
 Ce service s'exécute en arrière-plan pour supprimer périodiquement
 les tokens expirés de la base de données.
+
+La purge se fait par lots courts (une transaction chacun) séparés d'une
+pause : après un logout massif, elle ne garde pas de verrous longtemps et
+laisse au WAL et aux autres requêtes le temps de suivre.
 """
 import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
+from app.config import settings
 from app.db.session import SessionLocal
 from app.crud.blacklisted_token import blacklisted_token
 
@@ -18,37 +24,76 @@ class TokenCleanupService:
     Service qui nettoie périodiquement les tokens blacklistés expirés.
     """
 
-    def __init__(self, interval_hours: int = 24):
+    def __init__(self, interval_hours: int = 24, batch_size: int = 1000, pause_seconds: float = 0.5):
         """
         Initialise le service de nettoyage.
 
         Args:
             interval_hours: Intervalle entre chaque nettoyage (en heures)
+            batch_size: Nombre max de tokens supprimés par transaction
+            pause_seconds: Pause entre deux lots (en secondes)
         """
         self.interval_hours = interval_hours
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
         self.is_running = False
         self.task = None
 
+        # Progression de la purge en cours (ou de la dernière)
+        self.purge_running = False
+        self.purge_started_at: Optional[datetime] = None
+        self.purge_finished_at: Optional[datetime] = None
+        self.purge_batches = 0
+        self.purge_deleted = 0
+
+    def _delete_batch(self, before: datetime) -> int:
+        with SessionLocal() as db:
+            return blacklisted_token.remove_expired_batch(
+                db, before=before, batch_size=self.batch_size
+            )
+
     async def cleanup_expired_tokens(self):
         """
-        Supprime les tokens expirés de la blacklist.
+        Supprime les tokens expirés de la blacklist, lot par lot.
         """
+        if self.purge_running:
+            logger.warning("Token cleanup: a purge is already running")
+            return 0
+
+        before = datetime.now(timezone.utc)
+        self.purge_running = True
+        self.purge_started_at = before
+        self.purge_finished_at = None
+        self.purge_batches = 0
+        self.purge_deleted = 0
         try:
-            db = SessionLocal()
-            deleted_count = blacklisted_token.remove_expired(db)
-            db.close()
+            while True:
+                deleted = await asyncio.to_thread(self._delete_batch, before)
+                self.purge_batches += 1
+                self.purge_deleted += deleted
+                if deleted < self.batch_size:
+                    break
+                logger.info(
+                    f"Token cleanup: {self.purge_deleted} expired tokens removed "
+                    f"({self.purge_batches} batches), continuing"
+                )
+                await asyncio.sleep(self.pause_seconds)
 
-            if deleted_count > 0:
+            if self.purge_deleted > 0:
                 logger.info(
-                    f"Token cleanup: {deleted_count} expired tokens removed from blacklist"
+                    f"Token cleanup: {self.purge_deleted} expired tokens removed from blacklist "
+                    f"in {self.purge_batches} batches"
                 )
             else:
                 logger.debug("Token cleanup: No expired tokens to remove")
 
-            return deleted_count
+            return self.purge_deleted
         except Exception as e:
             logger.error(f"Error during token cleanup: {str(e)}")
-            return 0
+            return self.purge_deleted
+        finally:
+            self.purge_running = False
+            self.purge_finished_at = datetime.now(timezone.utc)
 
     async def _cleanup_loop(self):
         """
@@ -106,6 +151,26 @@ class TokenCleanupService:
         logger.info("Manual token cleanup triggered")
         return await self.cleanup_expired_tokens()
 
+    def get_status(self) -> dict:
+        """
+        Retourne le statut du service et la progression de la purge.
+        """
+        return {
+            "is_running": self.is_running,
+            "interval_hours": self.interval_hours,
+            "batch_size": self.batch_size,
+            "pause_seconds": self.pause_seconds,
+            "purge_running": self.purge_running,
+            "purge_started_at": self.purge_started_at,
+            "purge_finished_at": self.purge_finished_at,
+            "purge_batches": self.purge_batches,
+            "purge_deleted": self.purge_deleted,
+        }
+
 
 # Instance globale du service de nettoyage
-token_cleanup_service = TokenCleanupService(interval_hours=24)
+token_cleanup_service = TokenCleanupService(
+    interval_hours=24,
+    batch_size=settings.TOKEN_CLEANUP_BATCH_SIZE,
+    pause_seconds=settings.TOKEN_CLEANUP_PAUSE_SECONDS,
+)
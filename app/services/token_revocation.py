@@ -0,0 +1,255 @@
+"""
+Liste de révocation des tokens JWT en mémoire.
+
+`decode_token` interrogeait la table `blacklisted_tokens` (sur le token
+complet) à chaque requête authentifiée. Les tokens révoqués sont désormais
+identifiés par leur `jti` (ou l'empreinte SHA-256 des anciens tokens sans
+jti) et vérifiés en mémoire :
+
+- un filtre de Bloom écarte immédiatement la quasi-totalité des tokens
+  valides (aucun faux négatif)
+- un ensemble exact (token_id -> expiration) confirme les rares positifs ;
+  une entrée disparaît à l'expiration du token
+
+La liste est chargée au démarrage, mise à jour au logout, et synchronisée
+périodiquement avec la base pour propager les révocations des autres workers.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.blacklisted_token import blacklisted_token
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Recouvrement des synchronisations (écarts d'horloge entre hôtes, transactions lentes)
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def token_revocation_key(token: str, payload: dict) -> str:
+    """Identifiant de révocation d'un token : son jti, sinon l'empreinte SHA-256."""
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom : "peut-être présent" ou "absent à coup sûr".
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialise le filtre.
+
+        Args:
+            capacity: Nombre d'éléments prévus
+            error_rate: Taux de faux positifs visé à pleine capacité
+        """
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class TokenRevocationList:
+    """
+    Tokens révoqués non expirés, vérifiables sans requête SQL.
+    Thread-safe : interrogée depuis les threads des endpoints synchrones.
+    """
+
+    def __init__(self, sync_interval_seconds: int = 5, bloom_capacity: int = 100000):
+        """
+        Initialise la liste.
+
+        Args:
+            sync_interval_seconds: Intervalle de synchronisation avec la base (en secondes)
+            bloom_capacity: Capacité initiale du filtre de Bloom (doublée si dépassée)
+        """
+        self.sync_interval_seconds = sync_interval_seconds
+        self.bloom_capacity = bloom_capacity
+        self.is_running = False
+        self.task = None
+        self.loaded = False
+
+        self._lock = threading.Lock()
+        self._revoked: Dict[str, float] = {}
+        self._bloom = BloomFilter(bloom_capacity)
+        self._last_sync: Optional[datetime] = None
+
+        # Statistiques
+        self.checks = 0
+        self.bloom_positives = 0
+        self.revoked_hits = 0
+
+    @staticmethod
+    def _timestamp(value: datetime) -> float:
+        # Les colonnes DateTime sont stockées sans fuseau (UTC)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
+    def _rebuild(self):
+        """Reconstruit le filtre sans les entrées expirées (appelé sous verrou)."""
+        now = datetime.now(timezone.utc).timestamp()
+        self._revoked = {k: exp for k, exp in self._revoked.items() if exp > now}
+        capacity = self.bloom_capacity
+        while capacity < len(self._revoked) * 2:
+            capacity *= 2
+        self._bloom = BloomFilter(capacity)
+        for key in self._revoked:
+            self._bloom.add(key)
+
+    def _add(self, token_id: str, expires_at: datetime):
+        with self._lock:
+            if token_id in self._revoked:
+                return
+            self._revoked[token_id] = self._timestamp(expires_at)
+            self._bloom.add(token_id)
+            if self._bloom.count > self._bloom.capacity:
+                self._rebuild()
+
+    def revoke(self, token_id: str, expires_at: datetime):
+        """Enregistre localement une révocation (la ligne en base est écrite par l'appelant)."""
+        self._add(token_id, expires_at)
+
+    def is_revoked(self, token_id: str, db: Optional[Session] = None) -> bool:
+        """
+        Vérifie si un token est révoqué. Tant que la liste n'est pas chargée
+        (scripts, tests), la vérification se fait en base si `db` est fourni.
+        """
+        if not self.loaded:
+            return bool(db) and blacklisted_token.is_blacklisted(db, token_id)
+
+        self.checks += 1
+        if token_id not in self._bloom:
+            return False
+
+        self.bloom_positives += 1
+        with self._lock:
+            expires_at = self._revoked.get(token_id)
+        if expires_at is None or expires_at <= datetime.now(timezone.utc).timestamp():
+            return False
+        self.revoked_hits += 1
+        return True
+
+    def load(self, db: Session) -> int:
+        """Charge toutes les révocations non expirées."""
+        started_at = datetime.now(timezone.utc)
+        rows = blacklisted_token.get_active(db)
+        with self._lock:
+            self._revoked = {}
+            for row in rows:
+                self._revoked[row.token_id] = self._timestamp(row.expires_at)
+            self._rebuild()
+            self._last_sync = started_at
+        self.loaded = True
+        logger.info(f"Token revocation list loaded: {len(rows)} revoked tokens")
+        return len(rows)
+
+    def sync(self) -> int:
+        """
+        Récupère les révocations enregistrées depuis la dernière synchronisation
+        (par ce worker ou un autre) et purge les entrées expirées.
+        """
+        started_at = datetime.now(timezone.utc)
+        since = self._last_sync - SYNC_OVERLAP if self._last_sync else None
+        with SessionLocal() as db:
+            rows = blacklisted_token.get_active(db, since=since)
+        for row in rows:
+            self._add(row.token_id, row.expires_at)
+        with self._lock:
+            self._last_sync = started_at
+            now = started_at.timestamp()
+            if any(exp <= now for exp in self._revoked.values()):
+                self._rebuild()
+        return len(rows)
+
+    async def _sync_loop(self):
+        """
+        Boucle de synchronisation qui s'exécute à intervalle régulier.
+        """
+        logger.info(
+            f"Token revocation sync started (interval: {self.sync_interval_seconds}s)"
+        )
+
+        while self.is_running:
+            await asyncio.sleep(self.sync_interval_seconds)
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                logger.error(f"Error in token revocation sync: {str(e)}")
+
+    def start(self):
+        """
+        Démarre la synchronisation périodique.
+        """
+        if self.is_running:
+            logger.warning("Token revocation sync is already running")
+            return
+
+        self.is_running = True
+        self.task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        """
+        Arrête la synchronisation périodique.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Token revocation sync stopped")
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les statistiques de la liste.
+        """
+        with self._lock:
+            revoked = len(self._revoked)
+            bloom_size = self._bloom.size
+        return {
+            "loaded": self.loaded,
+            "revoked_tokens": revoked,
+            "bloom_bits": bloom_size,
+            "checks": self.checks,
+            "bloom_positives": self.bloom_positives,
+            "revoked_hits": self.revoked_hits,
+            "last_sync": self._last_sync,
+        }
+
+
+# Instance globale de la liste de révocation
+token_revocation = TokenRevocationList(
+    sync_interval_seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS
+)
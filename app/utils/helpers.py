@@ -0,0 +1,57 @@
+"""
+Bornes de dates pour les filtres sur les horodatages.
+
+Un filtre `date(timestamp) = :jour` applique une fonction à la colonne et
+empêche l'utilisation des index sur `timestamp`. Les fonctions ci-dessous
+retournent des intervalles semi-ouverts `[début, fin[` à comparer
+directement à la colonne (`timestamp >= début AND timestamp < fin`). Les
+journées sont découpées en UTC, comme le faisait `current_date` sur une
+base configurée en UTC, sauf pour les fonctions `local_*` qui utilisent le
+fuseau horaire d'une organisation ou d'un site.
+"""
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """Retourne [début du jour, début du lendemain[ en UTC."""
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def date_range_bounds(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """Retourne [début de start_date, début du lendemain de end_date[ en UTC."""
+    return day_bounds(start_date)[0], day_bounds(end_date)[1]
+
+
+def get_zone(name: Optional[str]) -> tzinfo:
+    """Fuseau horaire IANA (UTC s'il est absent ou inconnu)."""
+    try:
+        return ZoneInfo(name) if name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def local_day(timestamp: datetime, timezone_name: Optional[str]) -> date:
+    """Jour local d'un horodatage (les horodatages naïfs sont en UTC)."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(get_zone(timezone_name)).date()
+
+
+def local_today(timezone_name: Optional[str]) -> date:
+    return local_day(datetime.now(timezone.utc), timezone_name)
+
+
+def local_day_bounds(day: date, timezone_name: Optional[str]) -> Tuple[datetime, datetime]:
+    """Retourne [début du jour, début du lendemain[ dans le fuseau donné."""
+    zone = get_zone(timezone_name)
+    return (
+        datetime.combine(day, time.min, tzinfo=zone),
+        datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone),
+    )
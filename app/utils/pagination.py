@@ -0,0 +1,46 @@
+"""
+Curseurs opaques pour la pagination par clé (keyset).
+
+Un curseur encode la position du dernier élément d'une page, ici le couple
+(timestamp, id) : la page suivante est lue par un prédicat
+`(timestamp, id) < (:timestamp, :id)` sur un index composite, pour un coût
+identique quelle que soit la profondeur de la page. Il encode aussi le sens
+du tri : réutilisé avec l'autre sens, il désignerait une autre page.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException, status
+
+
+def _order(descending: bool) -> str:
+    return "desc" if descending else "asc"
+
+
+def encode_cursor(timestamp: datetime, id: str, descending: bool) -> str:
+    raw = json.dumps([timestamp.isoformat(), id, _order(descending)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, descending: bool) -> Tuple[datetime, str]:
+    """
+    Décode un curseur ; lève une erreur 400 s'il est invalide ou s'il a été
+    émis pour l'autre sens de tri.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, id, order = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = datetime.fromisoformat(timestamp), str(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Curseur de pagination invalide",
+        )
+    if order != _order(descending):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Curseur de pagination émis pour le tri {order}, pas {_order(descending)}",
+        )
+    return position
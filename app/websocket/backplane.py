@@ -0,0 +1,183 @@
+"""
+Backplane de diffusion temps réel entre workers.
+
+Avec plusieurs workers uvicorn, chaque processus a son propre
+`ConnectionManager` : un pointage traité par le worker A n'atteindrait que
+les WebSockets connectées au worker A. Le backplane relaie chaque événement
+à tous les workers, qui le livrent une seule fois à leurs propres abonnés.
+
+- `InMemoryBackplane` : un seul processus (développement, tests)
+- `RedisBackplane` : Pub/Sub Redis (`REDIS_URL`), pour plusieurs workers/hôtes
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Livraison locale d'un événement : (clés d'abonnement, message) -> nb de destinataires
+DeliverCallback = Callable[[List[str], dict], Awaitable[int]]
+
+
+class InMemoryBackplane:
+    """
+    Backplane d'un seul processus : l'événement est livré directement
+    aux abonnés locaux.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._deliver: Optional[DeliverCallback] = None
+        self._sequences: Dict[str, int] = {}
+        self.published = 0
+
+    async def start(self, deliver: DeliverCallback):
+        self._deliver = deliver
+
+    async def next_sequence(self, organization_id: str) -> Optional[int]:
+        """Prochain numéro de séquence des événements de l'organisation."""
+        seq = self._sequences.get(organization_id, 0) + 1
+        self._sequences[organization_id] = seq
+        return seq
+
+    async def publish(self, keys: List[str], message: dict):
+        self.published += 1
+        if self._deliver:
+            await self._deliver(keys, message)
+
+    async def stop(self):
+        self._deliver = None
+
+    def get_stats(self) -> dict:
+        return {"backend": self.name, "published": self.published}
+
+
+class RedisBackplane(InMemoryBackplane):
+    """
+    Backplane Redis Pub/Sub.
+
+    L'événement est livré immédiatement aux abonnés locaux puis publié sur
+    le canal Redis. Chaque worker écoute le canal et ignore ses propres
+    publications : chaque worker livre donc chaque événement exactement
+    une fois.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, channel: str, reconnect_delay: float = 1.0):
+        """
+        Initialise le backplane.
+
+        Args:
+            url: URL du serveur Redis
+            channel: Canal Pub/Sub partagé par les workers
+            reconnect_delay: Attente avant de se réabonner après une erreur (en secondes)
+        """
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.task = None
+        self._redis = None
+
+        # Statistiques
+        self.received = 0
+        self.publish_errors = 0
+
+    async def start(self, deliver: DeliverCallback):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.error("Backplane Redis indisponible: le paquet 'redis' n'est pas installé")
+            raise
+
+        await super().start(deliver)
+        self._redis = aioredis.from_url(self.url)
+        self.task = asyncio.create_task(self._listen())
+        logger.info(f"Realtime backplane Redis started (channel: {self.channel}, worker: {self.worker_id})")
+
+    async def next_sequence(self, organization_id: str) -> Optional[int]:
+        """Séquence partagée par tous les workers (INCR Redis)."""
+        try:
+            return await self._redis.incr(f"{self.channel}:seq:{organization_id}")
+        except Exception as e:
+            logger.error(f"Erreur séquence backplane Redis: {e}")
+            return None
+
+    async def publish(self, keys: List[str], message: dict):
+        await super().publish(keys, message)
+
+        envelope = json.dumps(
+            {"origin": self.worker_id, "keys": keys, "message": message}, default=str
+        )
+        try:
+            await self._redis.publish(self.channel, envelope)
+        except Exception as e:
+            self.publish_errors += 1
+            logger.error(f"Erreur publication backplane Redis: {e}")
+
+    async def _listen(self):
+        """Relaie aux abonnés locaux les événements publiés par les autres workers."""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for raw in pubsub.listen():
+                    if raw.get("type") != "message":
+                        continue
+                    envelope = json.loads(raw["data"])
+                    if envelope.get("origin") == self.worker_id:
+                        continue
+                    self.received += 1
+                    if self._deliver:
+                        await self._deliver(envelope["keys"], envelope["message"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erreur écoute backplane Redis: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+        await super().stop()
+        logger.info("Realtime backplane Redis stopped")
+
+    def get_stats(self) -> dict:
+        return {
+            **super().get_stats(),
+            "channel": self.channel,
+            "worker_id": self.worker_id,
+            "received": self.received,
+            "publish_errors": self.publish_errors,
+        }
+
+
+def create_backplane() -> InMemoryBackplane:
+    """Instancie le backplane configuré par `REALTIME_BACKPLANE`."""
+    if settings.REALTIME_BACKPLANE == "redis":
+        return RedisBackplane(url=settings.REDIS_URL, channel=settings.REALTIME_BACKPLANE_CHANNEL)
+    if settings.REALTIME_BACKPLANE != "memory":
+        logger.warning(f"Backplane inconnu '{settings.REALTIME_BACKPLANE}', utilisation de 'memory'")
+    return InMemoryBackplane()
@@ -1,23 +1,379 @@
-from typing import List
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from fastapi import WebSocket
 
+from app.config import settings
+from app.websocket.backplane import InMemoryBackplane, create_backplane
+from app.websocket.replay_buffer import ReplayBuffer
+
+logger = logging.getLogger(__name__)
+
+# Code de fermeture WebSocket "Try Again Later" (client trop lent)
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+# Trame regroupant plusieurs événements (clients ayant demandé le regroupement)
+BATCH_FRAME_TYPE = "batch"
+BATCH_FRAME_VERSION = 2
+
+# Portées d'abonnement aux événements temps réel
+SUBSCRIPTION_SCOPES = ("all", "organization", "site", "department")
+
+
+def subscription_key(scope: str, scope_id: Optional[str] = None) -> str:
+    """Clé d'abonnement, ex: 'organization:<id>' (ou 'all')."""
+    return scope if scope == "all" else f"{scope}:{scope_id}"
+
+
+def subscription_keys(
+    organization_id: str,
+    site_id: Optional[str] = None,
+    department_id: Optional[str] = None,
+) -> List[str]:
+    """Clés d'abonnement concernées par un événement."""
+    keys = [subscription_key("all"), subscription_key("organization", organization_id)]
+    if site_id:
+        keys.append(subscription_key("site", site_id))
+    if department_id:
+        keys.append(subscription_key("department", department_id))
+    return keys
+
+
+def organization_of(keys: Iterable[str]) -> Optional[str]:
+    """Organisation d'un événement, d'après ses clés d'abonnement."""
+    prefix = "organization:"
+    for key in keys:
+        if key.startswith(prefix):
+            return key[len(prefix):]
+    return None
+
+
+def batch_frame(events: List[str]) -> str:
+    """
+    Trame versionnée regroupant des événements déjà sérialisés :
+    {"type": "batch", "version": 2, "events": [...]}.
+    """
+    return (
+        f'{{"type": "{BATCH_FRAME_TYPE}", "version": {BATCH_FRAME_VERSION}, '
+        f'"events": [{", ".join(events)}]}}'
+    )
+
+
+class ClientConnection:
+    """
+    Connexion WebSocket avec sa propre file d'envoi bornée et sa tâche d'écriture.
+
+    La file contient des couples (est_un_événement, message JSON). Si
+    `coalesce_interval` est non nul, les événements ne passent pas par la
+    file : ils s'accumulent dans `pending_events` (au plus
+    `max_batch_events`) et sont regroupés en une seule trame (voir
+    `batch_frame`) au plus toutes les `coalesce_interval` secondes ; la file
+    ne transporte alors que les messages de contrôle.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue_size: int,
+        coalesce_interval: float = 0.0,
+        max_batch_events: int = 5000,
+    ):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.writer_task: Optional[asyncio.Task] = None
+        self.coalesce_interval = coalesce_interval
+        self.max_batch_events = max_batch_events
+        self.pending_events: List[str] = []
+        self.wakeup = asyncio.Event()
+        self.subscriptions: Set[str] = set()
+        self.sent = 0
+        self.dropped = 0
+        self.consecutive_drops = 0
+
+    def enqueue(self, message: str, is_event: bool = True) -> bool:
+        """Dépose un message sans attendre. Retourne False si la file est pleine."""
+        if self.coalesce_interval and is_event:
+            if len(self.pending_events) >= self.max_batch_events:
+                # Perte due au débit entre deux trames, pas à un client lent :
+                # non comptée dans consecutive_drops (le délai d'envoi s'en charge)
+                self.dropped += 1
+                return False
+            self.pending_events.append(message)
+            self.wakeup.set()
+            return True
+        try:
+            self.queue.put_nowait((is_event, message))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self.consecutive_drops += 1
+            return False
+        self.wakeup.set()
+        return True
+
+    def free_event_slots(self) -> int:
+        """Nombre d'événements pouvant encore être déposés sans perte."""
+        if self.coalesce_interval:
+            return self.max_batch_events - len(self.pending_events)
+        return self.queue.maxsize - self.queue.qsize()
+
+    def pending(self) -> int:
+        """Nombre de messages en attente d'envoi."""
+        return self.queue.qsize() + len(self.pending_events)
+
+    def take_frames(self) -> Tuple[List[str], bool]:
+        """
+        Vide la file et les événements accumulés, et retourne les trames à
+        envoyer : les messages de contrôle tels quels, puis une trame
+        regroupant les événements. Le booléen indique si une trame
+        d'événements a été produite.
+        """
+        controls: List[str] = []
+        while not self.queue.empty():
+            controls.append(self.queue.get_nowait()[1])
+        events, self.pending_events = self.pending_events, []
+        if events:
+            controls.append(batch_frame(events))
+        return controls, bool(events)
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    """
+    Gestionnaire des connexions WebSocket.
 
-    async def connect(self, websocket: WebSocket):
+    Les clients s'abonnent à une organisation, un site ou un département.
+    L'index `subscribers` (clé d'abonnement -> connexions) permet de ne
+    sérialiser et n'envoyer un événement qu'aux abonnés concernés.
+
+    Chaque connexion a sa file d'envoi et sa tâche d'écriture : un broadcast
+    se contente de déposer le message dans chaque file, sans attendre les
+    envois. Un client dont la file reste pleine (`slow_consumer_max_drops`
+    messages abandonnés d'affilée) ou dont un envoi dépasse `send_timeout`
+    est déconnecté. Les clients qui le demandent reçoivent les événements
+    regroupés (une trame au plus toutes les `coalesce_interval_ms`).
+
+    Les événements publiés via `publish` passent par le backplane, qui les
+    relaie à tous les workers ; chacun les livre à ses abonnés (`broadcast_to`).
+    Chaque événement porte un numéro `seq` croissant par organisation et est
+    conservé dans un tampon de rejeu pour les clients qui se reconnectent.
+    """
+
+    def __init__(
+        self,
+        send_queue_size: int = 100,
+        send_timeout: float = 5.0,
+        slow_consumer_max_drops: int = 50,
+        coalesce_interval_ms: int = 150,
+        coalesce_max_events: int = 5000,
+        replay_buffer_size: int = 500,
+        backplane: Optional[InMemoryBackplane] = None,
+    ):
+        self.send_queue_size = send_queue_size
+        self.coalesce_interval_ms = coalesce_interval_ms
+        self.coalesce_max_events = coalesce_max_events
+        self.send_timeout = send_timeout
+        self.slow_consumer_max_drops = slow_consumer_max_drops
+        self.active_connections: Dict[WebSocket, ClientConnection] = {}
+        self.subscribers: Dict[str, Set[ClientConnection]] = {}
+        self.backplane = backplane or InMemoryBackplane()
+        self.replay_buffer = ReplayBuffer(max_events=replay_buffer_size)
+
+        # Statistiques
+        self.total_dropped = 0
+        self.slow_consumers_disconnected = 0
+
+    async def start(self):
+        """Branche le backplane sur la livraison locale."""
+        await self.backplane.start(self.broadcast_to)
+
+    async def stop(self):
+        await self.backplane.stop()
+
+    async def publish(self, keys: List[str], message: dict):
+        """Numérote un événement et le diffuse aux abonnés de tous les workers."""
+        organization_id = organization_of(keys)
+        if organization_id:
+            seq = await self.backplane.next_sequence(organization_id)
+            if seq is not None:
+                message = {**message, "seq": seq}
+        await self.backplane.publish(keys, message)
+
+    def replay(self, websocket: WebSocket, organization_id: str, last_seq: int, keys: List[str]) -> int:
+        """
+        Renvoie à une connexion les événements manqués depuis `last_seq`, ou
+        un message `resync_required` si le tampon ne couvre pas l'écart ou
+        si les événements manqués ne tiennent pas dans sa file d'envoi.
+        À appeler avant `subscribe`, sans attente entre les deux, pour ne
+        perdre ni dupliquer aucun événement.
+        """
+        connection = self.active_connections.get(websocket)
+        if not connection:
+            return 0
+
+        missed = self.replay_buffer.since(organization_id, last_seq, keys)
+        # Une place reste réservée au message resync_required
+        if missed is None or len(missed) >= connection.free_event_slots():
+            self._enqueue(connection, json.dumps({
+                "type": "resync_required",
+                "organization_id": organization_id,
+                "last_seq": last_seq,
+            }), is_event=False)
+            return 0
+
+        for message in missed:
+            self._enqueue(connection, json.dumps(message, default=str))
+        return len(missed)
+
+    async def connect(self, websocket: WebSocket, coalesce: bool = False):
+        """
+        Accepte une connexion. Avec `coalesce`, les événements sont envoyés
+        par trames regroupées toutes les `coalesce_interval_ms` millisecondes.
+        """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        connection = ClientConnection(
+            websocket,
+            self.send_queue_size,
+            coalesce_interval=self.coalesce_interval_ms / 1000 if coalesce else 0.0,
+            max_batch_events=self.coalesce_max_events,
+        )
+        connection.writer_task = asyncio.create_task(self._writer(connection))
+        self.active_connections[websocket] = connection
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        connection = self.active_connections.pop(websocket, None)
+        if not connection:
+            return
+        for key in connection.subscriptions:
+            self._remove_subscriber(key, connection)
+        connection.subscriptions.clear()
+        if connection.writer_task and connection.writer_task is not asyncio.current_task():
+            connection.writer_task.cancel()
+
+    def _remove_subscriber(self, key: str, connection: ClientConnection):
+        subscribers = self.subscribers.get(key)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self.subscribers[key]
+
+    def subscribe(self, websocket: WebSocket, key: str):
+        connection = self.active_connections.get(websocket)
+        if connection:
+            connection.subscriptions.add(key)
+            self.subscribers.setdefault(key, set()).add(connection)
+
+    def unsubscribe(self, websocket: WebSocket, key: str):
+        connection = self.active_connections.get(websocket)
+        if connection and key in connection.subscriptions:
+            connection.subscriptions.discard(key)
+            self._remove_subscriber(key, connection)
+
+    async def _writer(self, connection: ClientConnection):
+        """Envoie les messages de la file d'une connexion, dans l'ordre."""
+        websocket = connection.websocket
+        try:
+            while True:
+                if connection.coalesce_interval:
+                    await connection.wakeup.wait()
+                    connection.wakeup.clear()
+                    frames, has_events = connection.take_frames()
+                else:
+                    item = await connection.queue.get()
+                    frames, has_events = [item[1]], False
+                for frame in frames:
+                    await asyncio.wait_for(websocket.send_text(frame), timeout=self.send_timeout)
+                    connection.sent += 1
+                connection.consecutive_drops = 0
+                if has_events:
+                    # Laisser les événements suivants s'accumuler (pending_events)
+                    await asyncio.sleep(connection.coalesce_interval)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning("Client WebSocket trop lent (délai d'envoi dépassé), déconnexion")
+            self.slow_consumers_disconnected += 1
+            await self._close(websocket, WS_CLOSE_SLOW_CONSUMER)
+        except Exception as e:
+            logger.info(f"Envoi WebSocket impossible, connexion fermée: {e}")
+            self.disconnect(websocket)
+
+    async def _close(self, websocket: WebSocket, code: int):
+        self.disconnect(websocket)
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    def _enqueue(self, connection: ClientConnection, message: str, is_event: bool = True):
+        if connection.enqueue(message, is_event):
+            return
+        self.total_dropped += 1
+        if connection.consecutive_drops >= self.slow_consumer_max_drops:
+            logger.warning(
+                f"Client WebSocket trop lent ({connection.consecutive_drops} messages "
+                f"abandonnés), déconnexion"
+            )
+            self.slow_consumers_disconnected += 1
+            asyncio.create_task(self._close(connection.websocket, WS_CLOSE_SLOW_CONSUMER))
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+        connection = self.active_connections.get(websocket)
+        if connection:
+            self._enqueue(connection, message, is_event=False)
+        else:
+            await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        """Envoie un message à toutes les connexions (sans filtrage)."""
+        for connection in list(self.active_connections.values()):
+            self._enqueue(connection, message)
+
+    async def broadcast_to(self, keys: Iterable[str], message: dict) -> int:
+        """
+        Envoie un événement aux seules connexions abonnées à l'une des clés.
+        Le message n'est sérialisé que s'il a au moins un destinataire.
+        Retourne le nombre de connexions destinataires.
+        """
+        seq = message.get("seq")
+        organization_id = organization_of(keys) if seq is not None else None
+        if organization_id:
+            self.replay_buffer.record(organization_id, seq, list(keys), message)
+
+        targets: Set[ClientConnection] = set()
+        for key in keys:
+            targets.update(self.subscribers.get(key, ()))
+        if not targets:
+            return 0
+
+        data = json.dumps(message, default=str)
+        for connection in targets:
+            self._enqueue(connection, data)
+        return len(targets)
+
+    def get_stats(self) -> dict:
+        depths = [c.pending() for c in self.active_connections.values()]
+        return {
+            "connections": len(depths),
+            "coalescing_connections": sum(
+                1 for c in self.active_connections.values() if c.coalesce_interval
+            ),
+            "subscription_keys": len(self.subscribers),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "send_queue_size": self.send_queue_size,
+            "dropped_messages": self.total_dropped,
+            "slow_consumers_disconnected": self.slow_consumers_disconnected,
+            "backplane": self.backplane.get_stats(),
+            "replay_buffer": self.replay_buffer.get_stats(),
+        }
 
 # Instance globale du gestionnaire
-manager = ConnectionManager()
+manager = ConnectionManager(
+    send_queue_size=settings.WS_SEND_QUEUE_SIZE,
+    send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+    slow_consumer_max_drops=settings.WS_SLOW_CONSUMER_MAX_DROPS,
+    coalesce_interval_ms=settings.WS_COALESCE_INTERVAL_MS,
+    coalesce_max_events=settings.WS_COALESCE_MAX_EVENTS,
+    replay_buffer_size=settings.WS_REPLAY_BUFFER_SIZE,
+    backplane=create_backplane(),
+)
@@ -0,0 +1,143 @@
+"""
+Pont entre les threads d'ingestion (MQTT) et les WebSockets.
+
+Les événements temps réel sont produits hors de la boucle asyncio (thread
+réseau paho, thread d'ingestion par lots). Ils sont déposés dans une file
+bornée thread-safe, vidée par une tâche de la boucle d'événements de
+l'application. Le producteur ne bloque jamais : si la file est pleine,
+l'événement le plus ancien est abandonné.
+"""
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import List, Optional
+
+from app.config import settings
+from app.websocket.connection_manager import manager
+
+logger = logging.getLogger(__name__)
+
+
+class RealtimeEventBridge:
+    """
+    File bornée (politique drop-oldest) vidée par la boucle asyncio de l'application.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        """
+        Initialise le pont.
+
+        Args:
+            max_size: Nombre max d'événements en attente de diffusion
+        """
+        self.max_size = max_size
+        self.is_running = False
+        self.task = None
+
+        self._lock = threading.Lock()
+        self._events: deque = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        # Statistiques
+        self.published = 0
+        self.dropped = 0
+        self.delivered = 0
+
+    def publish(self, message: dict, keys: List[str]):
+        """
+        Dépose un événement à diffuser aux abonnés des clés données
+        (voir connection_manager.subscription_keys). Appelable depuis
+        n'importe quel thread, ne bloque jamais.
+        """
+        with self._lock:
+            if len(self._events) >= self.max_size:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append((message, keys))
+            self.published += 1
+
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_all(self) -> list:
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    async def _drain_loop(self):
+        """
+        Boucle de diffusion exécutée sur la boucle d'événements de l'application.
+        """
+        logger.info(f"Realtime event bridge started (max size: {self.max_size})")
+
+        while self.is_running:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            events = self._take_all()
+            while events:
+                for message, keys in events:
+                    try:
+                        await manager.publish(keys, message)
+                        self.delivered += 1
+                    except Exception as e:
+                        logger.error(f"Erreur broadcast WebSocket: {e}")
+                events = self._take_all()
+
+    def start(self):
+        """
+        Démarre la diffusion sur la boucle d'événements courante.
+        """
+        if self.is_running:
+            logger.warning("Realtime event bridge is already running")
+            return
+
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self.is_running = True
+        self.task = asyncio.create_task(self._drain_loop())
+
+        # Diffuser ce qui a été publié avant le démarrage
+        if self._events:
+            self._wakeup.set()
+
+    async def stop(self):
+        """
+        Arrête la diffusion.
+        """
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        self._loop = None
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Realtime event bridge stopped")
+
+    def get_stats(self) -> dict:
+        """
+        Retourne les statistiques du pont.
+        """
+        with self._lock:
+            depth = len(self._events)
+        return {
+            "is_running": self.is_running,
+            "queue_depth": depth,
+            "max_size": self.max_size,
+            "published": self.published,
+            "dropped": self.dropped,
+            "delivered": self.delivered,
+        }
+
+
+# Instance globale du pont temps réel
+realtime_bridge = RealtimeEventBridge(max_size=settings.REALTIME_BRIDGE_MAX_SIZE)
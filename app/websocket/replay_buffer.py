@@ -0,0 +1,77 @@
+"""
+Tampon de rejeu des événements temps réel.
+
+Chaque événement reçoit un numéro de séquence croissant par organisation
+(attribué par le backplane). Le tampon garde les derniers événements de
+chaque organisation : un client qui se reconnecte avec `last_seq` ne reçoit
+que ce qu'il a manqué, au lieu de recharger les pointages et le tableau de
+bord. Si l'écart est trop grand, le client doit se resynchroniser.
+"""
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+
+class ReplayBuffer:
+    """
+    Anneau borné des derniers événements, par organisation.
+    Utilisé uniquement depuis la boucle asyncio (pas de verrou).
+    """
+
+    def __init__(self, max_events: int = 500):
+        """
+        Initialise le tampon.
+
+        Args:
+            max_events: Nombre d'événements conservés par organisation
+        """
+        self.max_events = max_events
+        self._events: Dict[str, Deque[Tuple[int, List[str], dict]]] = {}
+
+        # Statistiques
+        self.replayed = 0
+        self.resyncs = 0
+
+    def record(self, organization_id: str, seq: int, keys: List[str], message: dict):
+        events = self._events.get(organization_id)
+        if events is None:
+            events = self._events[organization_id] = deque(maxlen=self.max_events)
+        events.append((seq, keys, message))
+
+    def since(self, organization_id: str, last_seq: int, keys: Iterable[str]) -> Optional[List[dict]]:
+        """
+        Événements de l'organisation postérieurs à `last_seq` et concernant
+        l'une des clés d'abonnement données, dans l'ordre des séquences.
+
+        Returns:
+            La liste des événements manqués, ou None si le tampon ne couvre
+            pas l'écart (resynchronisation nécessaire)
+        """
+        events = self._events.get(organization_id)
+        if not events:
+            if last_seq > 0:
+                self.resyncs += 1
+                return None
+            return []
+
+        seqs = [seq for seq, _, _ in events]
+        # Événements manquants déjà sortis de l'anneau, ou compteur réinitialisé
+        if last_seq < min(seqs) - 1 or last_seq > max(seqs):
+            self.resyncs += 1
+            return None
+
+        wanted = set(keys)
+        missed = sorted(
+            (event for event in events if event[0] > last_seq and wanted.intersection(event[1])),
+            key=lambda event: event[0],
+        )
+        self.replayed += len(missed)
+        return [message for _, _, message in missed]
+
+    def get_stats(self) -> dict:
+        return {
+            "organizations": len(self._events),
+            "max_events": self.max_events,
+            "buffered": sum(len(events) for events in self._events.values()),
+            "replayed": self.replayed,
+            "resyncs": self.resyncs,
+        }
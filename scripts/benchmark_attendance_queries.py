@@ -0,0 +1,124 @@
+"""
+Benchmark des filtres de date sur les pointages (PostgreSQL)
+
+Compare les plans d'exécution des filtres `date(timestamp) = :jour` et des
+intervalles semi-ouverts `timestamp >= :debut AND timestamp < :fin`, sans
+puis avec les index composites de la table attendances.
+
+Les données sont générées dans une table temporaire (aucune donnée réelle
+n'est modifiée) :
+
+    python scripts/benchmark_attendance_queries.py --rows 1000000
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.utils.helpers import day_bounds, utc_today
+
+TABLE = "bench_attendances"
+
+INDEXES = [
+    f"CREATE INDEX ON {TABLE} (timestamp, id)",
+    f"CREATE INDEX ON {TABLE} (employee_id, timestamp, id)",
+    f"CREATE INDEX ON {TABLE} (device_id, timestamp)",
+]
+
+
+def seed(conn, rows: int, days: int, employees: int, devices: int):
+    """Génère `rows` pointages répartis sur les `days` derniers jours."""
+    print(f"🌱 Génération de {rows} pointages ({employees} employés, {devices} terminaux, {days} jours)...")
+    conn.execute(text(f"""
+        CREATE TEMP TABLE {TABLE} (
+            id varchar PRIMARY KEY,
+            employee_id varchar NOT NULL,
+            device_id varchar,
+            timestamp timestamptz NOT NULL
+        )
+    """))
+    conn.execute(text(f"""
+        INSERT INTO {TABLE} (id, employee_id, device_id, timestamp)
+        SELECT
+            md5(g::text),
+            'emp-' || (g % :employees),
+            'dev-' || (g % :devices),
+            now() - (random() * :days) * interval '1 day'
+        FROM generate_series(1, :rows) AS g
+    """), {"rows": rows, "days": days, "employees": employees, "devices": devices})
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def queries(day: date):
+    """Paires (libellé, SQL, paramètres) : ancien filtre puis intervalle semi-ouvert."""
+    day_start, day_end = day_bounds(day)
+    month_start = day_bounds(day - timedelta(days=30))[0]
+    return [
+        ("Pointages du jour d'un terminal - date()",
+         f"SELECT count(*) FROM {TABLE} WHERE device_id = 'dev-1' AND date(timestamp) = :day",
+         {"day": day}),
+        ("Pointages du jour d'un terminal - intervalle",
+         f"SELECT count(*) FROM {TABLE} WHERE device_id = 'dev-1' AND timestamp >= :start AND timestamp < :end",
+         {"start": day_start, "end": day_end}),
+        ("Pointages du jour d'un employé - date()",
+         f"SELECT * FROM {TABLE} WHERE employee_id = 'emp-1' AND date(timestamp) = :day",
+         {"day": day}),
+        ("Pointages du jour d'un employé - intervalle",
+         f"SELECT * FROM {TABLE} WHERE employee_id = 'emp-1' AND timestamp >= :start AND timestamp < :end",
+         {"start": day_start, "end": day_end}),
+        ("Pointages du jour (tous) - date()",
+         f"SELECT count(*) FROM {TABLE} WHERE date(timestamp) = :day",
+         {"day": day}),
+        ("Pointages du jour (tous) - intervalle",
+         f"SELECT count(*) FROM {TABLE} WHERE timestamp >= :start AND timestamp < :end",
+         {"start": day_start, "end": day_end}),
+        ("Présence sur 30 jours - date()",
+         f"SELECT date(timestamp), count(DISTINCT employee_id) FROM {TABLE} "
+         f"WHERE date(timestamp) >= :day GROUP BY 1",
+         {"day": day - timedelta(days=30)}),
+        ("Présence sur 30 jours - intervalle",
+         f"SELECT date(timestamp), count(DISTINCT employee_id) FROM {TABLE} "
+         f"WHERE timestamp >= :start GROUP BY 1",
+         {"start": month_start}),
+    ]
+
+
+def explain(conn, title: str):
+    print(f"\n{'=' * 80}\n{title}\n{'=' * 80}")
+    for label, sql, params in queries(utc_today()):
+        plan = [row[0] for row in conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params)]
+        print(f"\n▶ {label}")
+        for line in plan:
+            print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des filtres de date sur les pointages")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Nombre de pointages générés")
+    parser.add_argument("--days", type=int, default=365, help="Période couverte (jours)")
+    parser.add_argument("--employees", type=int, default=2000, help="Nombre d'employés")
+    parser.add_argument("--devices", type=int, default=100, help="Nombre de terminaux")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        # Les journées sont découpées en UTC, comme dans l'application
+        conn.execute(text("SET TIME ZONE 'UTC'"))
+        seed(conn, args.rows, args.days, args.employees, args.devices)
+
+        explain(conn, "AVANT : sans index sur timestamp")
+
+        print("\n🔧 Création des index composites...")
+        for statement in INDEXES:
+            conn.execute(text(statement))
+        conn.execute(text(f"ANALYZE {TABLE}"))
+
+        explain(conn, "APRÈS : index (timestamp, id), (employee_id, timestamp, id), (device_id, timestamp)")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+
+# Paramètres obligatoires (sans valeur par défaut) pour importer l'application
+for name, value in {
+    "PROJECT_NAME": "KUILINGA",
+    "VERSION": "test",
+    "API_V1_PREFIX": "/api/v1",
+    "API_V1_STR": "/api/v1",
+    "DEBUG": "false",
+    "MQTT_BROKER_HOST": "localhost",
+    "MQTT_BROKER_PORT": "1883",
+    "MQTT_USERNAME": "",
+    "MQTT_PASSWORD": "",
+    "MQTT_TLS_ENABLED": "false",
+}.items():
+    os.environ.setdefault(name, value)
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models.base import BaseModel  # noqa: E402
+import app.models  # noqa: E402,F401  (enregistre tous les modèles et les compteurs)
+
+
+@pytest.fixture
+def db():
+    """Session sur une base SQLite en mémoire contenant tout le schéma."""
+    engine = create_engine("sqlite://")
+    BaseModel.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def count_queries(db):
+    """
+    Compte les requêtes SQL émises dans un bloc :
+
+        with count_queries() as queries:
+            ...
+        assert len(queries) == 1
+    """
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
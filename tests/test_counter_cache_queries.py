@@ -0,0 +1,70 @@
+"""
+Compteurs dénormalisés (counter cache) des organisations, sites et
+départements : les pages lisent les compteurs sur la ligne du parent, leur
+nombre de requêtes ne dépend donc pas du nombre de lignes de la page.
+"""
+import pytest
+
+from app import crud, models
+from app.api.v1.endpoints.departments import enrich_departments_response
+from app.api.v1.endpoints.organizations import enrich_organizations_response
+from app.api.v1.endpoints.sites import enrich_sites_response
+
+
+def seed(db, count: int):
+    """Crée `count` organisations, chacune avec son site, son département et son manager."""
+    for index in range(count):
+        organization = models.Organization(name=f"Organisation {index}", timezone="UTC")
+        site = models.Site(name=f"Site {index}", organization=organization)
+        department = models.Department(name=f"Département {index}", site=site)
+        manager = models.Employee(
+            first_name="Manager",
+            last_name=str(index),
+            email=f"manager{index}@example.com",
+            organization=organization,
+            site=site,
+            department=department,
+        )
+        db.add_all([organization, site, department, manager])
+        db.flush()
+        department.manager_id = manager.id
+    db.commit()
+    db.expunge_all()
+
+
+PAGES = [
+    (crud.organization, enrich_organizations_response),
+    (crud.site, enrich_sites_response),
+    (crud.department, enrich_departments_response),
+]
+
+
+def page_queries(db, count_queries, crud_obj, enrich, limit: int) -> int:
+    db.expunge_all()
+    with count_queries() as queries:
+        page = crud_obj.get_multi_paginated(db, skip=0, limit=limit, include_total=False)
+        items = enrich(db, page["items"])
+    assert len(items) == limit
+    return len(queries)
+
+
+@pytest.mark.parametrize("crud_obj, enrich", PAGES)
+def test_page_query_count_is_constant(db, count_queries, crud_obj, enrich):
+    seed(db, 5)
+
+    single = page_queries(db, count_queries, crud_obj, enrich, limit=1)
+    full = page_queries(db, count_queries, crud_obj, enrich, limit=5)
+
+    assert full == single
+
+
+@pytest.mark.parametrize("crud_obj, enrich", PAGES)
+def test_enrichment_reads_counter_columns(db, count_queries, crud_obj, enrich):
+    seed(db, 3)
+    page = crud_obj.get_multi_paginated(db, skip=0, limit=3, include_total=False)
+
+    with count_queries() as queries:
+        items = enrich(db, page["items"])
+
+    assert queries == []
+    assert all(item.employees_count == 1 for item in items)
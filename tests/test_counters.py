@@ -0,0 +1,26 @@
+"""
+Compteurs dénormalisés : un changement de parent décrémente l'ancien parent,
+y compris quand la clé étrangère était expirée (modifiée après un commit).
+"""
+from app import models
+
+
+def test_moving_employee_after_commit_updates_both_sites(db):
+    organization = models.Organization(name="Organisation", timezone="UTC")
+    first = models.Site(name="Site 1", organization=organization)
+    second = models.Site(name="Site 2", organization=organization)
+    employee = models.Employee(
+        first_name="Awa", last_name="Traoré", email="awa@example.com",
+        organization=organization, site=first,
+    )
+    db.add_all([organization, first, second, employee])
+    db.commit()
+
+    # Tous les attributs sont expirés : site_id est modifié sans être lu
+    employee.site_id = second.id
+    db.commit()
+
+    db.refresh(first)
+    db.refresh(second)
+    assert first.employees_count == 0
+    assert second.employees_count == 1